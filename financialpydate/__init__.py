@@ -6,6 +6,10 @@ __version__ = "0.0.4"
 from financialpydate.rule import Rule as Rule
 from financialpydate.financial_calendar import FinancialCalendar as FinancialCalendar
 from financialpydate.financial_calendar import join_calendars as join_calendars
+from financialpydate.financial_calendar import CalendarOverlay as CalendarOverlay
 from financialpydate.day_counter import DayCounter as DayCounter
 from financialpydate.convention import Convention as Convention
 from financialpydate import date_handler as date_handler
+from financialpydate.schedule_set import ScheduleSet as ScheduleSet
+from financialpydate.tenor import Tenor as Tenor
+from financialpydate.tenor import TenorArray as TenorArray
@@ -0,0 +1,267 @@
+from typing import Iterable, Iterator
+
+import numpy as np
+import numpy.typing as npt
+
+from financialpydate.day_counter import Business252
+from financialpydate.financial_calendar import FinancialCalendar, OvernightFixings
+from financialpydate.numpy_types import NumpyDateType
+from financialpydate.schedule_set import ScheduleSet
+
+
+def _daily_di_rates(rates: npt.ArrayLike, percentage: float, decimals: int | None) -> npt.NDArray[np.double]:
+    daily_rates = np.expm1(np.log1p(np.asarray(rates, dtype=np.float64)) / 252)
+    if decimals is not None:
+        daily_rates = np.round(daily_rates, decimals)
+    return percentage * daily_rates
+
+
+def daily_di_factors(
+    rates: npt.ArrayLike, percentage: float = 1.0, decimals: int | None = None
+) -> npt.NDArray[np.double]:
+    """
+    Returns the one business day factor of each DI rate, `1 + percentage * ((1 + rate) ** (1 / 252) - 1)`.
+
+    Parameters
+    ----------
+    rates: npt.ArrayLike
+        annual DI rates as decimals, 0.1365 for 13.65%.
+    percentage: float
+        percentage of the DI rate accrued, 1.1 for 110% of the CDI.
+    decimals: int | None
+        number of decimals of the daily rate, B3 rounds it to 8 decimals. Not rounded if None.
+
+    Returns
+    -------
+    npt.NDArray[np.double]
+        the daily factors.
+
+    """
+    return 1.0 + _daily_di_rates(rates, percentage, decimals)
+
+
+def di_factor(
+    rate: npt.ArrayLike,
+    start_date: npt.NDArray[NumpyDateType] | NumpyDateType,
+    end_date: npt.NDArray[NumpyDateType] | NumpyDateType,
+    calendar: FinancialCalendar,
+) -> npt.NDArray[np.double] | float:
+    """
+    Returns the factor `(1 + rate) ** (business_days / 252)` of a fixed rate over the business days of
+    `[start_date, end_date)`.
+    """
+    return np.power(1.0 + np.asarray(rate, dtype=np.float64), Business252()(start_date, end_date, calendar))
+
+
+class DICompounding:
+    """
+    Compounding of a DI rate series. A rate fixed on a business day accrues until the next business day and the factor
+    of a period is the product of the daily factors of the business days in `[start_date, end_date)`. Products are
+    differences of a cumulative sum of log factors, so each period costs two lookups whatever its length.
+    """
+
+    __slots__ = ('_calendar', '_fixing_dates', '_cumulative_log_factors')
+
+    def __init__(
+        self,
+        calendar: FinancialCalendar,
+        fixing_dates: npt.NDArray[NumpyDateType],
+        rates: npt.ArrayLike,
+        percentage: float = 1.0,
+        decimals: int | None = None,
+    ):
+        """
+        Parameters
+        ----------
+        calendar: FinancialCalendar
+            calendar of the DI rate, Brazil['Settlement'] for the CDI.
+        fixing_dates: npt.NDArray[NumpyDateType]
+            increasing business days on which the rates are fixed.
+        rates: npt.ArrayLike
+            annual rate fixed on each date, as decimals.
+        percentage: float
+            percentage of the DI rate accrued, 1.1 for 110% of the CDI.
+        decimals: int | None
+            number of decimals of the daily rate, B3 rounds it to 8 decimals. Not rounded if None.
+
+        """
+        fixing_dates = np.asarray(fixing_dates, dtype='datetime64[D]')
+        rates = np.asarray(rates, dtype=np.float64)
+        if fixing_dates.ndim != 1 or fixing_dates.shape != rates.shape:
+            raise ValueError('fixing_dates and rates must be one dimensional arrays of the same size')
+        if np.any(fixing_dates[1:] <= fixing_dates[:-1]):
+            raise ValueError('fixing_dates must be increasing')
+        if not np.all(np.is_busday(fixing_dates, busdaycal=calendar.numpy_calendar)):
+            raise ValueError('fixing_dates must be business days of the calendar')
+        self._calendar: FinancialCalendar = calendar
+        self._fixing_dates: npt.NDArray[NumpyDateType] = fixing_dates
+        self._cumulative_log_factors: npt.NDArray[np.double] = np.zeros(fixing_dates.shape[0] + 1)
+        np.cumsum(np.log1p(_daily_di_rates(rates, percentage, decimals)), out=self._cumulative_log_factors[1:])
+
+    @property
+    def calendar(self) -> FinancialCalendar:
+        return self._calendar
+
+    @property
+    def fixing_dates(self) -> npt.NDArray[NumpyDateType]:
+        return self._fixing_dates
+
+    def business_day_count(
+        self,
+        start_date: npt.NDArray[NumpyDateType] | NumpyDateType,
+        end_date: npt.NDArray[NumpyDateType] | NumpyDateType,
+    ) -> npt.NDArray[np.int64] | np.int64:
+        return self._calendar.business_day_count(start_date, end_date)
+
+    def factor(
+        self,
+        start_date: npt.NDArray[NumpyDateType] | NumpyDateType,
+        end_date: npt.NDArray[NumpyDateType] | NumpyDateType,
+    ) -> npt.NDArray[np.double] | float:
+        """
+        Returns the compounded factor of each period `[start_date, end_date)`.
+
+        Parameters
+        ----------
+        start_date: npt.NDArray[NumpyDateType] | NumpyDateType
+            start date or array of start dates.
+        end_date: npt.NDArray[NumpyDateType] | NumpyDateType
+            end date or array of end dates, not before the start dates.
+
+        Returns
+        -------
+        npt.NDArray[np.double] | float
+            the compounded factor of each period.
+
+        Raises
+        ------
+        ValueError
+            if a period ends before it starts or a business day of a period has no fixing.
+
+        """
+        start_index = np.searchsorted(self._fixing_dates, start_date)
+        end_index = np.searchsorted(self._fixing_dates, end_date)
+        fixings = end_index - start_index
+        if np.any(fixings < 0):
+            raise ValueError('end_date must not be before start_date')
+        if np.any(fixings != self._calendar.business_day_count(start_date, end_date)):
+            raise ValueError('missing DI fixings in the accrual periods')
+        return np.exp(self._cumulative_log_factors[end_index] - self._cumulative_log_factors[start_index])
+
+    def schedule_factors(self, schedules: ScheduleSet) -> npt.NDArray[np.double]:
+        """
+        Returns the factor of the period ending on each date of the schedules, aligned with `schedules.dates`. The first
+        date of each schedule has no period and a factor of 1.
+        """
+        dates = schedules.dates
+        start_dates = np.empty_like(dates)
+        start_dates[1:] = dates[:-1]
+        start_dates[schedules.offsets[:-1]] = dates[schedules.offsets[:-1]]
+        return self.factor(start_dates, dates)
+
+
+class OvernightCompounding:
+    """
+    Compounding of an overnight rate series (SOFR, €STR, SONIA) over the periods returned by
+    `FinancialCalendar.overnight_fixings`. The factor of a period is the product of `1 + rate * weight / basis` over its
+    fixings.
+    """
+
+    __slots__ = ('_fixing_dates', '_rates', '_basis')
+
+    def __init__(self, fixing_dates: npt.NDArray[NumpyDateType], rates: npt.ArrayLike, basis: int = 360):
+        """
+        Parameters
+        ----------
+        fixing_dates: npt.NDArray[NumpyDateType]
+            increasing dates on which the rates are fixed.
+        rates: npt.ArrayLike
+            rate fixed on each date, as decimals.
+        basis: int
+            number of days of the year, 360 for SOFR and €STR, 365 for SONIA.
+
+        """
+        fixing_dates = np.asarray(fixing_dates, dtype='datetime64[D]')
+        rates = np.asarray(rates, dtype=np.float64)
+        if fixing_dates.ndim != 1 or fixing_dates.shape != rates.shape:
+            raise ValueError('fixing_dates and rates must be one dimensional arrays of the same size')
+        if np.any(fixing_dates[1:] <= fixing_dates[:-1]):
+            raise ValueError('fixing_dates must be increasing')
+        self._fixing_dates: npt.NDArray[NumpyDateType] = fixing_dates
+        self._rates: npt.NDArray[np.double] = rates
+        self._basis: int = basis
+
+    def rates(self, fixing_dates: npt.NDArray[NumpyDateType]) -> npt.NDArray[np.double]:
+        """Returns the rate fixed on each of the given dates, raising a ValueError if one of them has no fixing."""
+        index = np.searchsorted(self._fixing_dates, fixing_dates)
+        found = index < self._fixing_dates.shape[0]
+        found[found] = self._fixing_dates[index[found]] == fixing_dates[found]
+        if not np.all(found):
+            raise ValueError(f'missing fixings, first on {fixing_dates[~found][0]}')
+        return self._rates[index]
+
+    def factor(self, fixings: OvernightFixings) -> npt.NDArray[np.double]:
+        """
+        Returns the compounded factor of each period.
+
+        Parameters
+        ----------
+        fixings: OvernightFixings
+            fixing dates and weights of the periods.
+
+        Returns
+        -------
+        npt.NDArray[np.double]
+            the compounded factor of each period, 1 for periods without business days.
+
+        """
+        fixing_dates = fixings.fixing_dates
+        log_factors = np.log1p(self.rates(fixing_dates.dates) * fixings.weights / self._basis)
+        lengths = fixing_dates.lengths
+        if log_factors.shape[0] == 0:
+            return np.ones(lengths.shape[0])
+        # reduceat sums up to the next offset, but returns the element at the offset for empty periods.
+        sums = np.add.reduceat(log_factors, np.minimum(fixing_dates.offsets[:-1], log_factors.shape[0] - 1))
+        return np.exp(np.where(lengths > 0, sums, 0.0))
+
+    def rate(self, fixings: OvernightFixings) -> npt.NDArray[np.double]:
+        """Returns the compounded rate of each period, annualised over the sum of the weights of its fixings."""
+        cumulative_weights = np.zeros(fixings.weights.shape[0] + 1, dtype=np.int64)
+        np.cumsum(fixings.weights, out=cumulative_weights[1:])
+        offsets = fixings.fixing_dates.offsets
+        days = cumulative_weights[offsets[1:]] - cumulative_weights[offsets[:-1]]
+        return (self.factor(fixings) - 1.0) * self._basis / days
+
+
+def iter_accrual_factors(
+    blocks: Iterable[tuple[npt.NDArray[NumpyDateType], npt.ArrayLike]],
+    percentage: float = 1.0,
+    decimals: int | None = None,
+) -> Iterator[tuple[npt.NDArray[NumpyDateType], npt.NDArray[np.double]]]:
+    """
+    Streams the accrued factor of a DI rate history. The history is read as blocks of fixing dates and rates and, for
+    each block, its fixing dates and the factor accrued from the first fixing of the history to the business day after
+    each fixing are yielded. Only one block is held in memory at a time.
+
+    Parameters
+    ----------
+    blocks: Iterable[tuple[npt.NDArray[NumpyDateType], npt.ArrayLike]]
+        consecutive blocks of increasing fixing dates and their annual rates, as decimals.
+    percentage: float
+        percentage of the DI rate accrued, 1.1 for 110% of the CDI.
+    decimals: int | None
+        number of decimals of the daily rate, B3 rounds it to 8 decimals. Not rounded if None.
+
+    Yields
+    ------
+    tuple[npt.NDArray[NumpyDateType], npt.NDArray[np.double]]
+        the fixing dates of the block and the accrued factor after each of them.
+
+    """
+    accrued_log_factor = 0.0
+    for fixing_dates, rates in blocks:
+        log_factors = np.cumsum(np.log1p(_daily_di_rates(rates, percentage, decimals)))
+        log_factors += accrued_log_factor
+        if log_factors.shape[0] > 0:
+            accrued_log_factor = log_factors[-1]
+        yield fixing_dates, np.exp(log_factors)
@@ -0,0 +1,108 @@
+from typing import NamedTuple
+
+import numpy as np
+import numpy.typing as npt
+
+from financialpydate.convention import Convention
+from financialpydate.day_counter import ActualActualICMA, DayCounter
+from financialpydate.financial_calendar import FinancialCalendar
+from financialpydate.numpy_types import NumpyDateType
+from financialpydate.schedule_set import ScheduleSet
+
+
+class CouponPeriods(NamedTuple):
+    """
+    Coupon period of each pair of schedule and settlement date. Settlement dates outside of their schedule have NaT
+    coupon dates and no accrued interest.
+    """
+
+    previous_coupon_dates: npt.NDArray[NumpyDateType]
+    next_coupon_dates: npt.NDArray[NumpyDateType]
+    accrued_days: npt.NDArray[np.int64]
+    accrued_fractions: npt.NDArray[np.double]
+    ex_coupon: npt.NDArray[np.bool_]
+
+
+def coupon_periods(
+    schedules: ScheduleSet,
+    settlement_dates: npt.NDArray[NumpyDateType] | NumpyDateType,
+    day_counter: DayCounter,
+    schedule_ids: npt.ArrayLike | None = None,
+    calendar: FinancialCalendar | None = None,
+    ex_coupon_days: int | npt.NDArray[np.int_] = 0,
+    ex_coupon_calendar: FinancialCalendar | None = None,
+) -> CouponPeriods:
+    """
+    Locates the coupon period of the settlement date of each bond, with a single search over all schedules. A
+    settlement date on a coupon date starts the period of that coupon. In the ex-coupon period, from `ex_coupon_days`
+    before the next coupon date, the accrued days and fractions are negative and count the days to the next coupon, as
+    in QuantLib.
+
+    Parameters
+    ----------
+    schedules: ScheduleSet
+        coupon schedules, with increasing dates.
+    settlement_dates: npt.NDArray[NumpyDateType] | NumpyDateType
+        settlement date or array of settlement dates.
+    day_counter: DayCounter
+        day counter of the accrued fractions. An `ActualActualICMA` must be built on `schedules`.
+    schedule_ids: npt.ArrayLike | None
+        index of the schedule of each settlement date, broadcastable with `settlement_dates`. If None, the settlement
+        dates are those of each schedule.
+    calendar: FinancialCalendar | None
+        calendar of the day counter, for business day counters.
+    ex_coupon_days: int | npt.NDArray[np.int_]
+        number of days before the next coupon date the bond goes ex-coupon, 0 for no ex-coupon period.
+    ex_coupon_calendar: FinancialCalendar | None
+        if given, `ex_coupon_days` are business days of this calendar instead of calendar days.
+
+    Returns
+    -------
+    CouponPeriods
+        the previous and next coupon dates, accrued days, accrued fractions and ex-coupon flags.
+
+    """
+    dates, offsets = schedules.dates, schedules.offsets
+    if schedule_ids is None:
+        schedule_ids = np.arange(len(schedules))
+    schedule_ids, settlement_dates, ex_coupon_days = np.broadcast_arrays(
+        np.asarray(schedule_ids, dtype=np.int64),
+        np.asarray(settlement_dates, dtype='datetime64[D]'),
+        np.asarray(ex_coupon_days, dtype=np.int64),
+    )
+    next_position = schedules.searchsorted(schedule_ids, settlement_dates, 'right')
+    inside = (next_position > offsets[schedule_ids]) & (next_position < offsets[schedule_ids + 1])
+
+    schedule_ids = schedule_ids[inside]
+    settlement = settlement_dates[inside]
+    previous_coupon = dates[next_position[inside] - 1]
+    next_coupon = dates[next_position[inside]]
+    ex_coupon_days = ex_coupon_days[inside]
+    if ex_coupon_calendar is None:
+        ex_coupon_dates = next_coupon - ex_coupon_days.astype('timedelta64[D]')
+    else:
+        ex_coupon_dates = ex_coupon_calendar.working_days_offset(next_coupon, -ex_coupon_days, Convention.preceding)
+    # nothing is accrued on the first day of a period, even in an ex-coupon period shorter than the ex-coupon days.
+    ex_coupon = (ex_coupon_days > 0) & (settlement >= ex_coupon_dates) & (settlement > previous_coupon)
+
+    start = np.where(ex_coupon, settlement, previous_coupon)
+    end = np.where(ex_coupon, next_coupon, settlement)
+    if isinstance(day_counter, ActualActualICMA):
+        fractions = day_counter(start, end, schedule_ids=schedule_ids)
+    else:
+        fractions = day_counter(start, end, calendar)
+    sign = np.where(ex_coupon, -1, 1)
+
+    result = CouponPeriods(
+        np.full(settlement_dates.shape, np.datetime64('NaT', 'D')),
+        np.full(settlement_dates.shape, np.datetime64('NaT', 'D')),
+        np.zeros(settlement_dates.shape, dtype=np.int64),
+        np.zeros(settlement_dates.shape, dtype=np.float64),
+        np.zeros(settlement_dates.shape, dtype=np.bool_),
+    )
+    result.previous_coupon_dates[inside] = previous_coupon
+    result.next_coupon_dates[inside] = next_coupon
+    result.accrued_days[inside] = sign * (end - start).astype(np.int64)
+    result.accrued_fractions[inside] = sign * fractions
+    result.ex_coupon[inside] = ex_coupon
+    return result
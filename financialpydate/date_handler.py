@@ -1,4 +1,4 @@
-from typing import overload
+from typing import Iterator, overload
 
 import numba
 import numpy as np
@@ -28,7 +28,7 @@ def isleap(year: int) -> np.bool_: ...
 def isleap(year: IntArrayType) -> npt.NDArray[np.bool_]: ...
 
 
-@numba.njit(fastmath=True, cache=True)
+@numba.njit(fastmath=True, cache=True, nogil=True)
 def isleap(year):
     """Return True for leap years, False for non-leap years."""
     return (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
@@ -106,7 +106,7 @@ def add_month_day(dates: DateArrayType, day: int | np.uint64) -> DateArrayType:
     return dates + days.astype('timedelta64[D]')
 
 
-@numba.njit(cache=True)
+@numba.njit(cache=True, nogil=True)
 def nb_add_month_day(
     months: IntArrayType, is_leap_year: npt.NDArray[np.bool_], day: npt.NDArray[np.uint64]
 ) -> npt.NDArray[np.uint64]:
@@ -124,3 +124,76 @@ def nb_add_month_day(
             else:
                 days[i] = max_days[2]
     return days
+
+
+def unique_sorted(dates: DateArrayType) -> DateArrayType:
+    """
+    Remove duplicated dates from an array that is expected to be already ordered. Adjacent duplicates are removed in
+    place with a single linear scan, avoiding the sort made by `np.unique`. If the scan finds the dates out of order,
+    the result falls back to `np.unique`, so the output is always the same as `np.unique(dates)`.
+
+    Parameters
+    ----------
+    dates: DateArrayType
+        one dimensional array of dates, ordered except for adjacent duplicates. The array is modified in place.
+
+    Returns
+    -------
+    DateArrayType
+        sorted array of unique dates.
+
+    """
+    if dates.shape[0] < 2:
+        return dates
+    size = nb_unique_sorted(dates.view(np.int64))
+    if size < 0:
+        return np.unique(dates)
+    return dates[:size]
+
+
+def group_rows(ids: npt.NDArray[np.integer]) -> Iterator[npt.NDArray[np.intp]]:
+    """Yields the rows of each distinct id of a one dimensional array, found with a single stable sort."""
+    order = np.argsort(ids, kind='stable')
+    boundaries = np.flatnonzero(np.diff(ids[order])) + 1
+    for rows in np.split(order, boundaries):
+        if rows.shape[0] > 0:
+            yield rows
+
+
+@numba.njit(cache=True, nogil=True)
+def nb_unique_sorted(values: npt.NDArray[np.int64]) -> int:
+    size = 1
+    for i in range(1, values.shape[0]):
+        value = values[i]
+        previous = values[size - 1]
+        if value < previous:
+            return -1
+        if value != previous:
+            values[size] = value
+            size += 1
+    return size
+
+
+@numba.njit(cache=True, nogil=True)
+def nb_days_from_civil(year: int, month: int, day: int) -> int:
+    """Return the number of days since 1970-01-01 of the given year, month and day."""
+    year -= month <= 2
+    era = (year if year >= 0 else year - 399) // 400
+    year_of_era = year - era * 400
+    day_of_year = (153 * (month + (-3 if month > 2 else 9)) + 2) // 5 + day - 1
+    day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+    return era * 146097 + day_of_era - 719468
+
+
+@numba.njit(cache=True, nogil=True)
+def nb_civil_from_days(days: int) -> tuple[int, int, int]:
+    """Return the year, month and day of the given number of days since 1970-01-01."""
+    days += 719468
+    era = (days if days >= 0 else days - 146096) // 146097
+    day_of_era = days - era * 146097
+    year_of_era = (day_of_era - day_of_era // 1460 + day_of_era // 36524 - day_of_era // 146096) // 365
+    day_of_year = day_of_era - (365 * year_of_era + year_of_era // 4 - year_of_era // 100)
+    month_index = (5 * day_of_year + 2) // 153
+    day = day_of_year - (153 * month_index + 2) // 5 + 1
+    month = month_index + (3 if month_index < 10 else -9)
+    return year_of_era + era * 400 + (month <= 2), month, day
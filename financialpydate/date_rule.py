@@ -0,0 +1,163 @@
+import re
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
+import numpy.typing as npt
+
+from financialpydate.convention import Convention
+from financialpydate.financial_calendar import FinancialCalendar
+from financialpydate.numpy_types import NumpyDateType
+from financialpydate.tenor import Tenor, TenorUnit
+
+_ROLLS = {
+    'F': Convention.following,
+    'MF': Convention.modifiedfollowing,
+    'P': Convention.preceding,
+    'MP': Convention.modifiedpreceding,
+    'U': Convention.unadjusted,
+}
+_STEP_PATTERN = re.compile(r'(?P<tenor>[+-]\d+(?:BD|D|W|M|Y))?(?P<modifiers>(?::[A-Z]+)*)')
+_TIMEDELTA_UNITS = {TenorUnit.days: 'D', TenorUnit.weeks: 'W', TenorUnit.months: 'M', TenorUnit.years: 'Y'}
+
+
+class DateRuleStep(NamedTuple):
+    """Offset of a date by a tenor, adjusted with `roll`, with the end of month rule for month and year tenors."""
+
+    tenor: Tenor
+    roll: Convention
+    end_of_month: bool
+
+
+class DateRule:
+    """
+    Date rule compiled from an expression, see `compile_date_rule`, applied to arrays of dates by calling it.
+    Consecutive steps that give the same dates as a single step are fused when the rule is compiled.
+    """
+
+    __slots__ = ('_expression', '_calendar', '_steps')
+
+    def __init__(self, expression: str, calendar: FinancialCalendar, steps: tuple[DateRuleStep, ...]):
+        self._expression: str = expression
+        self._calendar: FinancialCalendar = calendar
+        self._steps: tuple[DateRuleStep, ...] = steps
+
+    @property
+    def expression(self) -> str:
+        return self._expression
+
+    @property
+    def calendar(self) -> FinancialCalendar:
+        return self._calendar
+
+    @property
+    def steps(self) -> tuple[DateRuleStep, ...]:
+        return self._steps
+
+    def __repr__(self) -> str:
+        return f'DateRule({self._expression!r})'
+
+    def __call__(self, dates: npt.NDArray[NumpyDateType] | NumpyDateType) -> npt.NDArray[NumpyDateType] | NumpyDateType:
+        dates = np.asarray(dates, dtype='datetime64[D]')
+        for step in self._steps:
+            if step.tenor.unit == TenorUnit.business_days:
+                dates = self._business_day_offset(dates, step.tenor.count, step.roll)
+            else:
+                delta = np.timedelta64(step.tenor.count, _TIMEDELTA_UNITS[step.tenor.unit])
+                dates = np.asarray(self._calendar.offset(dates, delta, step.roll, step.end_of_month))
+        return dates if dates.ndim else dates[()]
+
+    def _business_day_offset(
+        self, dates: npt.NDArray[NumpyDateType], count: int, roll: Convention
+    ) -> npt.NDArray[NumpyDateType]:
+        ordinals = self._calendar._business_day_ordinals(dates, roll)
+        if ordinals is not None:
+            _, business_days = self._calendar._business_day_tables()
+            ordinals = ordinals + count
+            if ordinals.size == 0 or (ordinals.min() >= 0 and ordinals.max() < business_days.shape[0]):
+                return business_days[ordinals]
+        return np.asarray(self._calendar.working_days_offset(dates, count, roll))
+
+
+def compile_date_rule(expression: str, calendar: FinancialCalendar) -> DateRule:
+    """
+    Compiles a date rule expression on a calendar. Compiled rules are cached by expression and calendar.
+
+    An expression is a chain of steps separated by '|', applied from left to right to the dates, the first step can
+    start with 'T' for the dates themselves. A step is a signed tenor, such as '+2BD', '-1W' or '+3M', followed by
+    optional modifiers: a roll 'F', 'MF', 'P', 'MP' or 'U' (following, modified following, preceding, modified
+    preceding or unadjusted) and 'EOM' for the end of month rule of month and year tenors. Business day steps roll
+    the dates to a business day first, following by default, other steps are unadjusted by default. A step without
+    tenor only adjusts the dates, such as 'T:MF'.
+
+    For instance 'T+2BD|+3M:MF:EOM' is the maturity of a 3 months deposit traded on the dates, with a spot lag of two
+    business days, and '-2BD:P' the fixing dates of accrual start dates.
+
+    Parameters
+    ----------
+    expression: str
+        date rule expression, case insensitive.
+    calendar: FinancialCalendar
+        calendar of the business day steps and adjustments, joined calendars for several currencies.
+
+    Returns
+    -------
+    DateRule
+        the compiled rule.
+
+    Raises
+    ------
+    ValueError
+        if the expression is invalid.
+
+    """
+    return _compile_date_rule(expression, calendar)
+
+
+@lru_cache(maxsize=1024)
+def _compile_date_rule(expression: str, calendar: FinancialCalendar) -> DateRule:
+    steps: list[DateRuleStep] = []
+    for position, text in enumerate(re.sub(r'\s+', '', expression).upper().split('|')):
+        if position == 0 and text.startswith('T'):
+            text = text[1:]
+            if not text:
+                continue
+        match = _STEP_PATTERN.fullmatch(text)
+        if match is None or (match['tenor'] is None and not match['modifiers']):
+            raise ValueError(f'invalid date rule step {text!r} in {expression!r}')
+        tenor = Tenor.parse(match['tenor']) if match['tenor'] else Tenor(0, TenorUnit.days)
+        modifiers = match['modifiers'].split(':')[1:]
+        rolls = [_ROLLS[modifier] for modifier in modifiers if modifier in _ROLLS]
+        if len(rolls) > 1 or any(modifier not in _ROLLS and modifier != 'EOM' for modifier in modifiers):
+            raise ValueError(f'invalid date rule modifiers {match["modifiers"]!r} in {expression!r}')
+        if rolls:
+            roll = rolls[0]
+        else:
+            roll = Convention.following if tenor.unit == TenorUnit.business_days else Convention.unadjusted
+        steps.append(DateRuleStep(tenor, roll, 'EOM' in modifiers))
+    return DateRule(expression, calendar, _fuse(steps))
+
+
+def _fuse(steps: list[DateRuleStep]) -> tuple[DateRuleStep, ...]:
+    # business day steps start from a business day after a business day step, whatever their roll: the offsets add
+    # up. Unadjusted day and week steps add up as well.
+    fused: list[DateRuleStep] = []
+    for step in steps:
+        if fused:
+            previous = fused[-1]
+            units = (previous.tenor.unit, step.tenor.unit)
+            if units == (TenorUnit.business_days, TenorUnit.business_days):
+                fused[-1] = previous._replace(tenor=Tenor(previous.tenor.count + step.tenor.count, previous.tenor.unit))
+                continue
+            if (
+                previous.roll == Convention.unadjusted
+                and set(units) <= {TenorUnit.days, TenorUnit.weeks}
+                and not previous.end_of_month
+            ):
+                days = sum(
+                    tenor.count * (7 if tenor.unit == TenorUnit.weeks else 1) for tenor in (previous.tenor, step.tenor)
+                )
+                fused[-1] = step._replace(tenor=Tenor(days, TenorUnit.days))
+                continue
+        fused.append(step)
+    return tuple(fused)
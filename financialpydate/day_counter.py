@@ -1,11 +1,24 @@
 from abc import ABC, abstractmethod
-from typing import overload
+from functools import cache
+from typing import Callable, Sequence, overload
 
+import numba
 import numpy as np
 import numpy.typing as npt
 
-from financialpydate.date_handler import _is_last_day_of_feb, day, isleap, month, year
+from financialpydate.date_handler import (
+    _is_last_day_of_feb,
+    day,
+    group_rows,
+    isleap,
+    month,
+    nb_civil_from_days,
+    nb_days_from_civil,
+    year,
+)
 from financialpydate import FinancialCalendar
+from financialpydate.convention import Convention
+from financialpydate.schedule_set import ScheduleSet
 
 from financialpydate.numpy_types import NumpyDateType
 
@@ -40,8 +53,10 @@ def equalize_variable_types(
     """
     Convert the `start_date` and `end_date` variables to the same type.
     If single type is given the single type will be returns if array and a single type is given then two arrays with
-    the shape of the first array will be return.
-    If both parameters are arrays then they must have the same shape. Otherwise, an error will be raised.
+    the shape of the array will be return.
+    If both parameters are arrays then they must have broadcastable shapes, e.g. start dates as a column and end dates
+    as a row. Otherwise, an error will be raised.
+    The returned arrays are read-only broadcast views of the inputs, no dates are copied.
 
     The scenarios are:
         - start_date: NumpyDateType and end_date: NumpyDateType. The return will be (NumpyDateType, NumpyDateType)
@@ -49,8 +64,8 @@ def equalize_variable_types(
         (npt.NDArray[NumpyDateType], npt.NDArray[NumpyDateType])
         - start_date: NumpyDateType and end_date: npt.NDArray[NumpyDateType]. The return will be
         (npt.NDArray[NumpyDateType], npt.NDArray[NumpyDateType])
-        - start_date: npt.NDArray[NumpyDateType] and end_date: npt.NDArray[NumpyDateType] with same shape.
-        The return will be (npt.NDArray[NumpyDateType], npt.NDArray[NumpyDateType])
+        - start_date: npt.NDArray[NumpyDateType] and end_date: npt.NDArray[NumpyDateType] with broadcastable shapes.
+        The return will be (npt.NDArray[NumpyDateType], npt.NDArray[NumpyDateType]) with the broadcast shape.
 
     Parameters
     ----------
@@ -61,25 +76,331 @@ def equalize_variable_types(
 
     Returns
     -------
-
+    tuple
+        the start dates and end dates with the same shape.
 
     """
     # following numpy recomendation. np.isscalar returns true for array with 0 dimension. For example
     # x = np.array(0), np.isscalar(x) will be True instead of False
+    if np.ndim(start_date) == 0 and np.ndim(end_date) == 0:
+        return start_date, end_date
+
+    # np.broadcast_arrays raises a ValueError if the shapes are not broadcastable.
+    start_view, end_view = np.broadcast_arrays(start_date, end_date)
+    return start_view, end_view
+
+
+# Calendar of the business day counters when none is given: weekends are the only holidays, as in np.busday_count.
+_WEEKDAYS = FinancialCalendar(np.array([], dtype='datetime64[D]'), '1111100')
+
+_DAYS_BEFORE_MONTH = (0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334)
+
+
+@numba.njit(cache=True, nogil=True)
+def _nb_is_last_day_of_feb(year: int, month: int, day: int) -> bool:
+    return month == 2 and day == 28 + isleap(year)
+
+
+@numba.njit(cache=True, nogil=True)
+def _nb_actual_360(start, start_year, start_month, start_day, end, end_year, end_month, end_day):
+    return (end - start) / 360
+
+
+@numba.njit(cache=True, nogil=True)
+def _nb_actual_365(start, start_year, start_month, start_day, end, end_year, end_month, end_day):
+    return (end - start) / 365.0
+
+
+@numba.njit(cache=True, nogil=True)
+def _nb_nl_365(start, start_year, start_month, start_day, end, end_year, end_month, end_day):
+    # same as `Nl365.day_count`, where the sum of the two boolean arrays is a logical or.
+    return (end - start - (isleap(start_year) or isleap(end_year))) / 365.0
+
+
+@numba.njit(cache=True, nogil=True)
+def _nb_actual_actual(start, start_year, start_month, start_day, end, end_year, end_month, end_day):
+    if start == end:
+        return 0.0
+    start_leap = isleap(start_year)
+    end_leap = isleap(end_year)
+    year_1_diff = 366 if start_leap else 365
+    year_2_diff = 366 if end_leap else 365
+    start_day_of_year = _DAYS_BEFORE_MONTH[start_month - 1] + start_day + (start_leap and start_month > 2)
+    end_day_of_year = _DAYS_BEFORE_MONTH[end_month - 1] + end_day + (end_leap and end_month > 2)
+    return (
+        (year_1_diff - start_day_of_year + 1) / year_1_diff
+        + (end_day_of_year - 1) / year_2_diff
+        + (end_year - start_year - 1)
+    )
+
+
+@numba.njit(cache=True, nogil=True)
+def _nb_actual_actual_afb(start, start_year, start_month, start_day, end, end_year, end_month, end_day):
+    if start == end:
+        return 0.0
+    if end < start:
+        return -_nb_actual_actual_afb(end, end_year, end_month, end_day, start, start_year, start_month, start_day)
+    # whole years are counted back from the end date, a year before the 28th of February being the 29th in leap years.
+    years = 0
+    while True:
+        previous_day = end_day
+        if end_month == 2 and end_day == 29 and not isleap(end_year - 1):
+            previous_day = 28
+        elif end_month == 2 and end_day == 28 and isleap(end_year - 1):
+            previous_day = 29
+        previous = nb_days_from_civil(end_year - 1, end_month, previous_day)
+        if previous < start:
+            break
+        years += 1
+        end, end_year, end_day = previous, end_year - 1, previous_day
+    basis = 365.0
+    if isleap(end_year):
+        if start <= nb_days_from_civil(end_year, 2, 29) < end:
+            basis = 366.0
+    elif isleap(start_year) and start <= nb_days_from_civil(start_year, 2, 29) < end:
+        basis = 366.0
+    return years + (end - start) / basis
+
+
+@numba.njit(cache=True, nogil=True)
+def _nb_thirty_days(start_year, start_month, d1, end_year, end_month, d2):
+    return 360 * (end_year - start_year) + 30 * (end_month - start_month) + d2 - d1
 
-    is_start_scalar = np.ndim(start_date) == 0
-    is_end_scalar = np.ndim(end_date) == 0
-    if not is_start_scalar and is_end_scalar:
-        return start_date, np.full(fill_value=end_date, shape=start_date.shape, dtype=start_date.dtype)
-    elif is_start_scalar and not is_end_scalar:
-        return (np.full(fill_value=start_date, shape=end_date.shape, dtype=start_date.dtype), end_date)
-    elif not (is_start_scalar and is_end_scalar):
-        assert start_date.shape == end_date.shape, 'start dates and end dates must have equal shape.'
 
-    return start_date, end_date
+@numba.njit(cache=True, nogil=True)
+def _nb_thirty_360_days(start_year, start_month, start_day, end_year, end_month, end_day):
+    d1 = min(start_day, 30)
+    d2 = min(end_day, 30) if d1 == 30 else end_day
+    return _nb_thirty_days(start_year, start_month, d1, end_year, end_month, d2)
+
+
+@numba.njit(cache=True, nogil=True)
+def _nb_thirty_360(start, start_year, start_month, start_day, end, end_year, end_month, end_day):
+    return _nb_thirty_360_days(start_year, start_month, start_day, end_year, end_month, end_day) / 360
+
+
+@numba.njit(cache=True, nogil=True)
+def _nb_thirty_365(start, start_year, start_month, start_day, end, end_year, end_month, end_day):
+    return _nb_thirty_360_days(start_year, start_month, start_day, end_year, end_month, end_day) / 365
+
+
+@numba.njit(cache=True, nogil=True)
+def _nb_thirty_e_360(start, start_year, start_month, start_day, end, end_year, end_month, end_day):
+    return _nb_thirty_days(start_year, start_month, min(start_day, 30), end_year, end_month, min(end_day, 30)) / 360
+
+
+@numba.njit(cache=True, nogil=True)
+def _nb_thirty_e_360_isda_days(start_year, start_month, start_day, end_year, end_month, end_day, is_termination):
+    d1 = 30 if start_day == 31 or _nb_is_last_day_of_feb(start_year, start_month, start_day) else start_day
+    end_of_feb = _nb_is_last_day_of_feb(end_year, end_month, end_day) and not is_termination
+    d2 = 30 if end_day == 31 or end_of_feb else end_day
+    return _nb_thirty_days(start_year, start_month, d1, end_year, end_month, d2)
+
+
+@numba.njit(cache=True, nogil=True)
+def _nb_thirty_e_360_isda(start, start_year, start_month, start_day, end, end_year, end_month, end_day):
+    return _nb_thirty_e_360_isda_days(start_year, start_month, start_day, end_year, end_month, end_day, False) / 360
+
+
+@numba.njit(cache=True, nogil=True)
+def _nb_thirty_e_360_isda_termination(start, start_year, start_month, start_day, end, end_year, end_month, end_day):
+    return _nb_thirty_e_360_isda_days(start_year, start_month, start_day, end_year, end_month, end_day, True) / 360
+
+
+@numba.njit(cache=True, nogil=True)
+def _nb_thirty_u_360(start, start_year, start_month, start_day, end, end_year, end_month, end_day):
+    start_end_of_feb = _nb_is_last_day_of_feb(start_year, start_month, start_day)
+    d1_or_end_feb = start_day >= 30 or start_end_of_feb
+    d1 = 30 if d1_or_end_feb else start_day
+    end_of_feb = start_end_of_feb and _nb_is_last_day_of_feb(end_year, end_month, end_day)
+    d2 = 30 if (end_day == 31 and d1_or_end_feb) or end_of_feb else end_day
+    return _nb_thirty_days(start_year, start_month, d1, end_year, end_month, d2) / 360
+
+
+@numba.njit(cache=True, nogil=True)
+def _nb_one_one(start, start_year, start_month, start_day, end, end_year, end_month, end_day):
+    return 1.0
+
+
+@cache
+def _parallel_kernel(kernel: Callable[..., float]) -> Callable[..., npt.NDArray[np.double]]:
+    """Compile a multi-core loop over arrays of day ordinals calling `kernel` for each pair of dates."""
+
+    @numba.njit(parallel=True, nogil=True)
+    def parallel_kernel(start_dates, end_dates):
+        size = max(start_dates.shape[0], end_dates.shape[0])
+        start_step = 1 if start_dates.shape[0] > 1 else 0
+        end_step = 1 if end_dates.shape[0] > 1 else 0
+        output = np.empty(size, np.float64)
+        for i in numba.prange(size):
+            start = start_dates[i * start_step]
+            end = end_dates[i * end_step]
+            start_year, start_month, start_day = nb_civil_from_days(start)
+            end_year, end_month, end_day = nb_civil_from_days(end)
+            output[i] = kernel(start, start_year, start_month, start_day, end, end_year, end_month, end_day)
+        return output
+
+    return parallel_kernel
+
+
+@cache
+def _matrix_kernel(kernel: Callable[..., float]) -> Callable[..., npt.NDArray[np.double]]:
+    """
+    Compile a multi-core loop computing `kernel` for every pair of start and end dates. Each date is decomposed in
+    year, month and day once, instead of once per pair.
+    """
+
+    @numba.njit(parallel=True, nogil=True)
+    def matrix_kernel(start_dates, end_dates, only_after_start):
+        start_years = np.empty(start_dates.shape[0], np.int64)
+        start_months = np.empty(start_dates.shape[0], np.int64)
+        start_days = np.empty(start_dates.shape[0], np.int64)
+        for i in numba.prange(start_dates.shape[0]):
+            start_years[i], start_months[i], start_days[i] = nb_civil_from_days(start_dates[i])
+        end_years = np.empty(end_dates.shape[0], np.int64)
+        end_months = np.empty(end_dates.shape[0], np.int64)
+        end_days = np.empty(end_dates.shape[0], np.int64)
+        for j in numba.prange(end_dates.shape[0]):
+            end_years[j], end_months[j], end_days[j] = nb_civil_from_days(end_dates[j])
+
+        output = np.empty((start_dates.shape[0], end_dates.shape[0]), np.float64)
+        for i in numba.prange(start_dates.shape[0]):
+            start = start_dates[i]
+            for j in range(end_dates.shape[0]):
+                end = end_dates[j]
+                if only_after_start and end <= start:
+                    output[i, j] = 0.0
+                else:
+                    output[i, j] = kernel(
+                        start,
+                        start_years[i],
+                        start_months[i],
+                        start_days[i],
+                        end,
+                        end_years[j],
+                        end_months[j],
+                        end_days[j],
+                    )
+        return output
+
+    return matrix_kernel
+
+
+@cache
+def _ufunc(kernel: Callable[..., float]) -> np.ufunc:
+    """Compile a numpy ufunc over day ordinals calling `kernel` for each pair of dates."""
+
+    def year_fraction(start, end):
+        start_year, start_month, start_day = nb_civil_from_days(start)
+        end_year, end_month, end_day = nb_civil_from_days(end)
+        return kernel(start, start_year, start_month, start_day, end, end_year, end_month, end_day)
+
+    return numba.vectorize(['float64(int64, int64)'], nopython=True)(year_fraction)
+
+
+def _day_ordinals(date) -> npt.NDArray[np.int64]:
+    """Number of days since 1970-01-01 of a date or array of dates, without copy for `datetime64[D]` arrays."""
+    return np.asarray(date, dtype='datetime64[D]').view(np.int64)
+
+
+def _ufunc_year_fraction(
+    ufunc: np.ufunc,
+    start_date,
+    end_date,
+    out: npt.NDArray[np.floating] | None,
+    where: bool | npt.NDArray[np.bool_],
+    dtype: npt.DTypeLike,
+) -> npt.NDArray[np.floating]:
+    start_days = _day_ordinals(start_date)
+    end_days = _day_ordinals(end_date)
+    shape = np.broadcast_shapes(start_days.shape, end_days.shape)
+    if out is None and dtype is not None:
+        # the ufunc computes in float64, other types are obtained by casting on the output.
+        out = np.empty(shape, dtype=dtype)
+    if where is True:
+        return ufunc(start_days, end_days, out=out)
+
+    # numba ufuncs fail on masked iteration, the masked dates are selected before calling the ufunc instead.
+    mask = np.broadcast_to(where, shape)
+    values = ufunc(np.broadcast_to(start_days, shape)[mask], np.broadcast_to(end_days, shape)[mask])
+    if out is None:
+        out = np.empty(shape, dtype=values.dtype)
+    out[mask] = values
+    return out
+
+
+def _copy_year_fraction(
+    values: npt.ArrayLike,
+    out: npt.NDArray[np.floating] | None,
+    where: bool | npt.NDArray[np.bool_],
+    dtype: npt.DTypeLike,
+) -> npt.NDArray[np.floating]:
+    """Applies the `out`, `where` and `dtype` arguments of a ufunc to year fractions computed without ufunc."""
+    values = np.asarray(values)
+    if out is None and where is True:
+        return values if dtype is None else values.astype(dtype)
+    if out is None:
+        out = np.empty(values.shape, dtype=values.dtype if dtype is None else dtype)
+    np.copyto(out, values, casting='same_kind', where=where)
+    return out
+
+
+def _unique_date_pairs(
+    start_date, end_date
+) -> tuple[npt.NDArray[NumpyDateType], npt.NDArray[NumpyDateType], npt.NDArray[np.intp], tuple[int, ...]]:
+    """
+    Reduce the broadcast pairs of start and end dates to the distinct pairs. Returns the distinct start and end dates,
+    the index of the distinct pair of each input pair and the broadcast shape.
+    """
+    start_days = _day_ordinals(start_date)
+    end_days = _day_ordinals(end_date)
+    shape = np.broadcast_shapes(start_days.shape, end_days.shape)
+    start_days = np.broadcast_to(start_days, shape).reshape(-1)
+    end_days = np.broadcast_to(end_days, shape).reshape(-1)
+    if start_days.shape[0] == 0:
+        empty_dates = np.empty(0, dtype='datetime64[D]')
+        return empty_dates, empty_dates, np.empty(0, dtype=np.intp), shape
+
+    # each pair is packed in a single int64 key, so the pairs are sorted once by np.unique.
+    start_min = start_days.min()
+    end_min = end_days.min()
+    start_span = int(start_days.max() - start_min) + 1
+    end_span = int(end_days.max() - end_min) + 1
+    if start_span * end_span < np.iinfo(np.int64).max:
+        keys = (start_days - start_min) * end_span + (end_days - end_min)
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        unique_start_days = unique_keys // end_span + start_min
+        unique_end_days = unique_keys % end_span + end_min
+    else:
+        unique_pairs, inverse = np.unique(np.stack((start_days, end_days)), axis=1, return_inverse=True)
+        unique_start_days, unique_end_days = unique_pairs
+
+    return (
+        unique_start_days.astype('datetime64[D]'),
+        unique_end_days.astype('datetime64[D]'),
+        inverse.reshape(-1),
+        shape,
+    )
+
+
+def _parallel_year_fraction(kernel: Callable[..., float], start_date, end_date) -> npt.NDArray[np.double]:
+    start_date = np.asarray(start_date, dtype='datetime64[D]')
+    end_date = np.asarray(end_date, dtype='datetime64[D]')
+    shape = np.broadcast_shapes(start_date.shape, end_date.shape)
+    start_days, end_days = (
+        date.reshape(1).view(np.int64) if date.size == 1 else np.broadcast_to(date, shape).ravel().view(np.int64)
+        for date in (start_date, end_date)
+    )
+    return _parallel_kernel(kernel)(start_days, end_days).reshape(shape)
 
 
 class DayCounter(ABC):
+    # Arrays with at least this number of elements are computed by a multi-core numba kernel instead of numpy. Waking
+    # the thread pool costs tens of microseconds, which dominates small arrays. The default is a rough crossover, it
+    # depends on the number of cores and the machine: measure it with the TestParallelCrossover benchmarks of
+    # test/test_day_count.py and set `DayCounter.parallel_threshold` accordingly.
+    parallel_threshold: int = 100_000
+
     @property
     @abstractmethod
     def code(self) -> str: ...
@@ -148,8 +469,18 @@ class DayCounter(ABC):
         self, start_date: NumpyDateType, end_date: NumpyDateType, calendar: FinancialCalendar | None = None
     ) -> float: ...
 
-    @abstractmethod
-    def __call__(self, start_date, end_date, calendar=None) -> npt.NDArray[np.double] | float:
+    def __call__(
+        self,
+        start_date,
+        end_date,
+        calendar=None,
+        *,
+        out: npt.NDArray[np.floating] | None = None,
+        where: bool | npt.NDArray[np.bool_] = True,
+        dtype: npt.DTypeLike = None,
+        dedupe: bool = False,
+        calendar_ids: npt.NDArray[np.integer] | None = None,
+    ) -> npt.NDArray[np.double] | float:
         """
         Returns the year fraction for the given start date and end date.
         Parameters
@@ -158,14 +489,103 @@ class DayCounter(ABC):
             start date or array of start dates
         end_date: NumpyDateType | npt.NDArray[NumpyDateType]
             start date or array of start dates
+        out: npt.NDArray[np.floating] | None
+            array where the year fractions are written, as in numpy ufuncs.
+        where: bool | npt.NDArray[np.bool_]
+            mask of the year fractions to be computed, as in numpy ufuncs.
+        dtype: npt.DTypeLike
+            type of the year fractions, float64 or float32.
+        dedupe: bool
+            if True, the year fraction of each distinct pair of start and end dates is computed once and scattered
+            back. Useful for cashflow tables where the same accrual periods are repeated for many trades.
+        calendar_ids: npt.NDArray[np.integer] | None
+            index of the calendar of each row when `calendar` is a sequence of calendars, for business day counters.
         Returns
         -------
         npt.NDArray[np.double] | float
             the year fraction base on the given start date and end date.
 
         """
+        if calendar_ids is not None:
+            if dedupe:
+                raise ValueError(
+                    'dedupe cannot be combined with calendar_ids, the pairs of dates depend on the calendar'
+                )
+            values = self._year_fraction(start_date, end_date, calendar, calendar_ids=calendar_ids)
+            return _copy_year_fraction(values, out, where, dtype)
+        if dedupe and (np.ndim(start_date) > 0 or np.ndim(end_date) > 0):
+            unique_start_dates, unique_end_dates, inverse, shape = _unique_date_pairs(start_date, end_date)
+            values = self(unique_start_dates, unique_end_dates, calendar, dtype=dtype)[inverse].reshape(shape)
+            return _copy_year_fraction(values, out, where, None)
+        kernel = self._kernel
+        if out is not None or dtype is not None or where is not True:
+            if kernel is None:
+                return _copy_year_fraction(self._year_fraction(start_date, end_date, calendar), out, where, dtype)
+            return _ufunc_year_fraction(_ufunc(kernel), start_date, end_date, out, where, dtype)
+        if kernel is not None and max(np.size(start_date), np.size(end_date)) >= self.parallel_threshold:
+            return _parallel_year_fraction(kernel, start_date, end_date)
+        return self._year_fraction(start_date, end_date, calendar)
+
+    @abstractmethod
+    def _year_fraction(self, start_date, end_date, calendar=None) -> npt.NDArray[np.double] | float:
+        """Numpy implementation of `__call__`."""
         ...
 
+    @property
+    def _kernel(self) -> Callable[..., float] | None:
+        """
+        Numba function returning the year fraction of a single pair of dates, given as
+        `(start, start_year, start_month, start_day, end, end_year, end_month, end_day)` where `start` and `end` are the
+        number of days since 1970-01-01. None if the day counter has no compiled implementation.
+        """
+        return None
+
+    def matrix(
+        self,
+        start_dates: npt.NDArray[NumpyDateType],
+        end_dates: npt.NDArray[NumpyDateType],
+        calendar: FinancialCalendar | None = None,
+        mask: bool = False,
+    ) -> npt.NDArray[np.double] | np.ma.MaskedArray:
+        """
+        Returns the year fraction from every start date to every end date, e.g. from each simulation date to each
+        cashflow date.
+        Parameters
+        ----------
+        start_dates: npt.NDArray[NumpyDateType]
+            one dimensional array of start dates, the rows of the matrix.
+        end_dates: npt.NDArray[NumpyDateType]
+            one dimensional array of end dates, the columns of the matrix.
+        mask: bool
+            if True, the pairs where the end date is not after the start date are not computed and are masked.
+        Returns
+        -------
+        npt.NDArray[np.double] | np.ma.MaskedArray
+            matrix of year fractions with shape (len(start_dates), len(end_dates)).
+
+        """
+        start_dates = np.asarray(start_dates, dtype='datetime64[D]').reshape(-1)
+        end_dates = np.asarray(end_dates, dtype='datetime64[D]').reshape(-1)
+        kernel = self._kernel
+        if kernel is None:
+            output = np.asarray(self(start_dates[:, None], end_dates[None, :], calendar), dtype=np.float64)
+        else:
+            output = _matrix_kernel(kernel)(start_dates.view(np.int64), end_dates.view(np.int64), mask)
+        if mask:
+            return np.ma.masked_array(output, mask=end_dates[None, :] <= start_dates[:, None])
+        return output
+
+    @property
+    def ufunc(self) -> np.ufunc | None:
+        """
+        Numpy ufunc of the year fraction, taking the number of days since 1970-01-01 of the start and end dates, e.g.
+        `dates.view(np.int64)` for arrays of `datetime64[D]`. It supports broadcasting and `out`, including float32
+        outputs. None if the day counter has no compiled implementation, `out`, `where` and `dtype` of `__call__` are
+        then applied to its numpy result.
+        """
+        kernel = self._kernel
+        return None if kernel is None else _ufunc(kernel)
+
     @property
     def is_additive(self) -> bool:
         return False
@@ -185,7 +605,11 @@ class Actual360(ActualDayCounter):
     def code(self):
         return 'ACT/360'
 
-    def __call__(self, start_date, end_date, *args, **kwargs):
+    @property
+    def _kernel(self):
+        return _nb_actual_360
+
+    def _year_fraction(self, start_date, end_date, *args, **kwargs):
         return self.day_count(start_date, end_date) / 360
 
 
@@ -194,7 +618,11 @@ class Actual365(ActualDayCounter):
     def code(self):
         return 'ACT/365'
 
-    def __call__(self, start_date, end_date, *args, **kwargs):
+    @property
+    def _kernel(self):
+        return _nb_actual_365
+
+    def _year_fraction(self, start_date, end_date, *args, **kwargs):
         return self.day_count(start_date, end_date) / 365.0
 
 
@@ -203,12 +631,16 @@ class Nl365(DayCounter):
     def code(self):
         return 'NL/365'
 
+    @property
+    def _kernel(self):
+        return _nb_nl_365
+
     def day_count(self, start_date, end_date, *args, **kwargs):
         return (end_date - start_date).astype('timedelta64[D]').astype(int) + (
             isleap(year(start_date)) + isleap(year(end_date))
         ) * -1.0
 
-    def __call__(self, start_date, end_date, *args, **kwargs):
+    def _year_fraction(self, start_date, end_date, *args, **kwargs):
         return (self.day_count(start_date, end_date)) / 365.0
 
 
@@ -217,13 +649,26 @@ class Business252(DayCounter):
     def code(self):
         return '252'
 
-    def day_count(self, start_date, end_date, calendar=None):
-        if FinancialCalendar is None:
-            return np.busday_count(start_date, end_date)
-        return np.busday_count(start_date, end_date, busdaycal=calendar.numpy_calendar)
-
-    def __call__(self, start_date, end_date, calendar=None):
-        return self.day_count(start_date, end_date, calendar) / 252
+    def day_count(self, start_date, end_date, calendar=None, calendar_ids=None):
+        """
+        Counts the business days in `[start_date, end_date)` from the cumulative business day table of the calendar.
+        Without calendar, weekends are the only non-business days, as in `np.busday_count`. With `calendar_ids`,
+        `calendar` is a sequence of calendars and `calendar_ids` the index of the calendar of each row.
+        """
+        if calendar_ids is None:
+            return (_WEEKDAYS if calendar is None else calendar).business_day_count(start_date, end_date)
+        ids = np.asarray(calendar_ids)
+        shape = np.broadcast_shapes(ids.shape, np.shape(start_date), np.shape(end_date))
+        ids = np.broadcast_to(ids, shape).reshape(-1)
+        start_dates = np.broadcast_to(start_date, shape).reshape(-1)
+        end_dates = np.broadcast_to(end_date, shape).reshape(-1)
+        result = np.empty(ids.shape[0], dtype=np.int64)
+        for rows in group_rows(ids):
+            result[rows] = calendar[ids[rows[0]]].business_day_count(start_dates[rows], end_dates[rows])
+        return result.reshape(shape)
+
+    def _year_fraction(self, start_date, end_date, calendar=None, calendar_ids=None):
+        return self.day_count(start_date, end_date, calendar, calendar_ids) / 252
 
 
 class ActualActual(ActualDayCounter):
@@ -231,7 +676,11 @@ class ActualActual(ActualDayCounter):
     def code(self):
         return 'ACT/ACT'
 
-    def __call__(self, start_date, end_date, *args, **kwargs):
+    @property
+    def _kernel(self):
+        return _nb_actual_actual
+
+    def _year_fraction(self, start_date, end_date, *args, **kwargs):
         if np.isscalar(start_date) and np.isscalar(end_date):
             if start_date == end_date:
                 return 0.0
@@ -251,7 +700,7 @@ class ActualActual(ActualDayCounter):
             )
 
         if np.all(start_date == end_date):
-            return np.zeros_like(start_date, dtype=float)
+            return np.zeros(np.broadcast_shapes(np.shape(start_date), np.shape(end_date)), dtype=float)
 
         start_year = year(start_date)
         end_year = year(end_date)
@@ -271,11 +720,178 @@ class ActualActual(ActualDayCounter):
         return np.where(start_date == end_date, 0.0, total_sum)
 
 
+class ActualActualICMA(ActualDayCounter):
+    """
+    Actual/Actual ICMA day counter, where each coupon period of the schedules is `1 / frequency` years long. The first
+    and last periods are measured against notional periods, counted back from the first coupon and forward from the
+    last one, so that short and long stubs accrue at the regular rate, as in QuantLib. Year fractions of dates of any
+    number of schedules are computed with a single search in the reference dates of all schedules.
+    """
+
+    __slots__ = ('_reference_dates', '_frequency')
+
+    def __init__(
+        self,
+        schedules: ScheduleSet | npt.NDArray[NumpyDateType],
+        frequency: int,
+        calendar: FinancialCalendar | None = None,
+        convention: Convention = Convention.unadjusted,
+    ):
+        """
+        Parameters
+        ----------
+        schedules: ScheduleSet | npt.NDArray[NumpyDateType]
+            coupon schedules with at least two dates each, or a single schedule as returned by `make_schedule`.
+        frequency: int
+            number of coupons per year, a divisor of 12.
+        calendar: FinancialCalendar | None
+            calendar adjusting the notional coupon dates with `convention`.
+        convention: Convention
+            business day convention of the notional coupon dates.
+
+        """
+        if 12 % frequency != 0:
+            raise ValueError(f'frequency must divide 12, got {frequency}')
+        if not isinstance(schedules, ScheduleSet):
+            schedules = ScheduleSet.from_schedules([schedules])
+        if np.any(schedules.lengths < 2):
+            raise ValueError('schedules must have at least two dates')
+        self._frequency: int = frequency
+        self._reference_dates: ScheduleSet = self._notional_schedules(
+            schedules, np.timedelta64(12 // frequency, 'M'), _WEEKDAYS if calendar is None else calendar, convention
+        )
+
+    @staticmethod
+    def _notional_schedules(
+        schedules: ScheduleSet, period: np.timedelta64, calendar: FinancialCalendar, convention: Convention
+    ) -> ScheduleSet:
+        dates, offsets = schedules.dates, schedules.offsets
+        ids = np.arange(len(schedules))
+        notional_first = calendar.offset(dates[offsets[:-1] + 1], -period, convention)
+        prior = calendar.offset(notional_first, -period, convention)
+        has_prior = notional_first > dates[offsets[:-1]]
+        notional_last = calendar.offset(dates[offsets[1:] - 2], period, convention)
+        following = calendar.offset(notional_last, period, convention)
+        has_following = notional_last < dates[offsets[1:] - 1]
+        interior = np.ones(dates.shape[0], dtype=np.bool_)
+        interior[offsets[:-1]] = False
+        interior[offsets[1:] - 1] = False
+
+        reference_ids = np.concatenate((ids[has_prior], ids, schedules.schedule_ids[interior], ids, ids[has_following]))
+        reference_dates = np.concatenate(
+            (prior[has_prior], notional_first, dates[interior], notional_last, following[has_following])
+        )
+        order = np.lexsort((reference_dates, reference_ids))
+        lengths = np.bincount(reference_ids, minlength=len(schedules))
+        return ScheduleSet(reference_dates[order], np.r_[0, np.cumsum(lengths)])
+
+    @property
+    def code(self):
+        return 'ACT/ACT ICMA'
+
+    @property
+    def frequency(self) -> int:
+        return self._frequency
+
+    @property
+    def reference_dates(self) -> ScheduleSet:
+        """Coupon dates of each schedule with the notional coupon dates replacing its first and last dates."""
+        return self._reference_dates
+
+    def __call__(
+        self,
+        start_date,
+        end_date,
+        calendar=None,
+        *,
+        schedule_ids=None,
+        out: npt.NDArray[np.floating] | None = None,
+        where: bool | npt.NDArray[np.bool_] = True,
+        dtype: npt.DTypeLike = None,
+        dedupe: bool = False,
+    ):
+        """
+        Returns the year fraction for the given start date and end date.
+        Parameters
+        ----------
+        start_date: NumpyDateType | npt.NDArray[NumpyDateType]
+            start date or array of start dates
+        end_date: NumpyDateType | npt.NDArray[NumpyDateType]
+            end date or array of end dates
+        schedule_ids: npt.ArrayLike | None
+            index of the schedule of each pair of dates, optional with a single schedule.
+        out: npt.NDArray[np.floating] | None
+            array where the year fractions are written, as in numpy ufuncs.
+        where: bool | npt.NDArray[np.bool_]
+            mask of the year fractions to be computed, as in numpy ufuncs.
+        dtype: npt.DTypeLike
+            type of the year fractions, float64 or float32.
+        dedupe: bool
+            not supported, the year fraction of a pair of dates depends on its schedule.
+        Returns
+        -------
+        npt.NDArray[np.double] | float
+            the year fraction base on the given start date and end date.
+
+        """
+        if dedupe:
+            raise ValueError('dedupe is not supported by ACT/ACT ICMA, the pairs of dates depend on the schedule')
+        year_fraction = self._year_fraction(start_date, end_date, schedule_ids=schedule_ids)
+        if out is None and where is True and dtype is None:
+            return year_fraction
+        return _copy_year_fraction(year_fraction, out, where, dtype)
+
+    def _year_fraction(self, start_date, end_date, *args, schedule_ids=None, **kwargs):
+        if schedule_ids is None:
+            if len(self._reference_dates) != 1:
+                raise ValueError('schedule_ids are required with more than one schedule')
+            schedule_ids = 0
+        return self._periods(schedule_ids, end_date) - self._periods(schedule_ids, start_date)
+
+    def _periods(self, schedule_ids, dates) -> npt.NDArray[np.double]:
+        """Number of coupon periods between the first reference date of the schedule and each date."""
+        reference_dates, offsets = self._reference_dates.dates, self._reference_dates.offsets
+        schedule_ids = np.asarray(schedule_ids)
+        dates = np.asarray(dates, dtype='datetime64[D]')
+        first = offsets[schedule_ids]
+        last = offsets[schedule_ids + 1] - 1
+        position = self._reference_dates.searchsorted(schedule_ids, dates, 'right') - 1
+        if np.any(position < first) or np.any(dates > reference_dates[last]):
+            raise ValueError('dates out of the range of the schedules')
+        position = np.minimum(position, last - 1)
+        period_start = reference_dates[position]
+        period_days = reference_dates[position + 1] - period_start
+        return ((position - first) + (dates - period_start) / period_days) / self._frequency
+
+
+class ActualActualAFB(ActualDayCounter):
+    @property
+    def code(self):
+        return 'ACT/ACT AFB'
+
+    @property
+    def _kernel(self):
+        return _nb_actual_actual_afb
+
+    def _year_fraction(self, start_date, end_date, *args, **kwargs):
+        # there is no numpy implementation, small arrays are computed by the serial ufunc of the kernel.
+        if max(np.size(start_date), np.size(end_date)) >= self.parallel_threshold:
+            year_fraction = _parallel_year_fraction(_nb_actual_actual_afb, start_date, end_date)
+        else:
+            year_fraction = _ufunc(_nb_actual_actual_afb)(_day_ordinals(start_date), _day_ordinals(end_date))
+        year_fraction = np.asarray(year_fraction)
+        return year_fraction if year_fraction.ndim else year_fraction[()]
+
+
 class Thirty360(DayCounter):
     @property
     def code(self):
         return '30/360'
 
+    @property
+    def _kernel(self):
+        return _nb_thirty_360
+
     def day_count(self, start_date, end_date, *args, **kwargs):
         """Returns number of days between start_date and end_date, using Thirty/360 convention"""
         if np.isscalar(start_date) and np.isscalar(end_date):
@@ -295,7 +911,7 @@ class Thirty360(DayCounter):
 
         return 360 * (year(end_date) - year(start_date)) + 30 * (month(end_date) - month(start_date)) + d2 - d1
 
-    def __call__(self, start_date, end_date, *args, **kwargs):
+    def _year_fraction(self, start_date, end_date, *args, **kwargs):
         """Returns fraction in years between start_date and end_date, using Thirty/360 convention"""
         return self.day_count(start_date, end_date) / 360
 
@@ -305,6 +921,10 @@ class Thirty365(DayCounter):
     def code(self):
         return '30/365'
 
+    @property
+    def _kernel(self):
+        return _nb_thirty_365
+
     def day_count(self, start_date, end_date, *args, **kwargs):
         """Returns number of days between start_date and end_date, using Thirty/365 convention"""
         if np.isscalar(start_date) and np.isscalar(end_date):
@@ -324,7 +944,7 @@ class Thirty365(DayCounter):
 
         return 360 * (year(end_date) - year(start_date)) + 30 * (month(end_date) - month(start_date)) + d2 - d1
 
-    def __call__(self, start_date, end_date, *args, **kwargs):
+    def _year_fraction(self, start_date, end_date, *args, **kwargs):
         """Returns fraction in years between start_date and end_date, using Thirty/360 convention"""
         return self.day_count(start_date, end_date) / 365
 
@@ -334,6 +954,10 @@ class ThirtyE360(DayCounter):
     def code(self):
         return '30E/360'
 
+    @property
+    def _kernel(self):
+        return _nb_thirty_e_360
+
     def day_count(self, start_date, end_date, *args, **kwargs):
         """Returns number of days between start_date and end_date, using Thirty/360 convention"""
         start_date, end_date = equalize_variable_types(start_date, end_date)
@@ -342,7 +966,7 @@ class ThirtyE360(DayCounter):
 
         return 360 * (year(end_date) - year(start_date)) + 30 * (month(end_date) - month(start_date)) + d2 - d1
 
-    def __call__(self, start_date, end_date, *args, **kwargs):
+    def _year_fraction(self, start_date, end_date, *args, **kwargs):
         """Returns fraction in years between start_date and end_date, using Thirty/360 convention"""
         return self.day_count(start_date, end_date) / 360
 
@@ -357,6 +981,12 @@ class ThirtyE360ISDA(DayCounter):
     def code(self):
         return '30E/360ISDA'
 
+    @property
+    def _kernel(self):
+        if self.is_end_date_on_termination:
+            return _nb_thirty_e_360_isda_termination
+        return _nb_thirty_e_360_isda
+
     def day_count(self, start_date, end_date, *args, **kwargs):
         """
         Returns number of days between start_date and end_date, using ThirtyE/360 ISDA convention.
@@ -371,7 +1001,7 @@ class ThirtyE360ISDA(DayCounter):
 
         return 360 * (year(v_end_date) - year(v_start_date)) + 30 * (month(v_end_date) - month(v_start_date)) + d2 - d1
 
-    def __call__(self, start_date, end_date, *args, **kwargs):
+    def _year_fraction(self, start_date, end_date, *args, **kwargs):
         """Returns fraction in years between start_date and end_date, using Thirty/360 convention"""
         return self.day_count(start_date, end_date) / 360
 
@@ -381,6 +1011,10 @@ class ThirtyU360(DayCounter):
     def code(self):
         return '30U/360'
 
+    @property
+    def _kernel(self):
+        return _nb_thirty_u_360
+
     def day_count(self, start_date, end_date, *args, **kwargs):
         """
         Returns number of days between start_date and end_date, using ThirtyE/360 ISDA convention.
@@ -398,7 +1032,7 @@ class ThirtyU360(DayCounter):
 
         return 360 * (year(v_end_date) - year(v_start_date)) + 30 * (month(v_end_date) - month(v_start_date)) + d2 - d1
 
-    def __call__(self, start_date, end_date, *args, **kwargs):
+    def _year_fraction(self, start_date, end_date, *args, **kwargs):
         """Returns fraction in years between start_date and end_date, using Thirty/360 convention"""
         return self.day_count(start_date, end_date) / 360
 
@@ -408,5 +1042,115 @@ class OneOne(ActualDayCounter):
     def code(self):
         return '1/1'
 
-    def __call__(self, start_date, end_date, *args, **kwargs):
+    @property
+    def _kernel(self):
+        return _nb_one_one
+
+    def _year_fraction(self, start_date, end_date, *args, **kwargs):
         return np.ones_like(self.day_count(start_date, end_date), dtype=np.float64)
+
+
+all_day_counters: dict[str, DayCounter] = {
+    day_counter.code: day_counter
+    for day_counter in (
+        Actual360(),
+        Actual365(),
+        Nl365(),
+        Business252(),
+        ActualActual(),
+        ActualActualAFB(),
+        Thirty360(),
+        Thirty365(),
+        ThirtyE360(),
+        ThirtyE360ISDA(),
+        ThirtyU360(),
+        OneOne(),
+    )
+}
+
+
+def register_day_counter(day_counter: DayCounter) -> None:
+    """Add a day counter to `all_day_counters`, replacing any day counter with the same code."""
+    all_day_counters[day_counter.code] = day_counter
+
+
+def get_day_counter(code: str) -> DayCounter:
+    """Returns the registered day counter with the given code, e.g. 'ACT/360' or '30E/360ISDA'."""
+    try:
+        return all_day_counters[code]
+    except KeyError:
+        raise ValueError(f'Unknown day counter code {code}.') from None
+
+
+def day_counter_ids(codes: npt.ArrayLike) -> npt.NDArray[np.intp]:
+    """
+    Convert day counter codes to ids, the position of the day counter in `all_day_counters`. Ids can be computed once
+    for a cashflow table and given to `year_fraction` instead of the codes.
+    """
+    registered_codes = list(all_day_counters)
+    unique_codes, inverse = np.unique(np.asarray(codes, dtype=str), return_inverse=True)
+    unique_ids = np.array([registered_codes.index(get_day_counter(code).code) for code in unique_codes], dtype=np.intp)
+    return unique_ids[inverse].reshape(np.shape(codes))
+
+
+def year_fraction(
+    codes_or_ids: npt.ArrayLike,
+    start_date: npt.NDArray[NumpyDateType] | NumpyDateType,
+    end_date: npt.NDArray[NumpyDateType] | NumpyDateType,
+    calendar: FinancialCalendar | Sequence[FinancialCalendar] | None = None,
+    out: npt.NDArray[np.double] | None = None,
+    calendar_ids: npt.NDArray[np.integer] | None = None,
+) -> npt.NDArray[np.double]:
+    """
+    Returns the year fraction of each row of a table with mixed day count conventions.
+    Rows are grouped by day counter with a single sort and each day counter is called once for its rows.
+
+    Parameters
+    ----------
+    codes_or_ids: npt.ArrayLike
+        day counter code of each row, or the ids returned by `day_counter_ids`.
+    start_date: npt.NDArray[NumpyDateType] | NumpyDateType
+        start date or array of start dates, broadcastable with `codes_or_ids`.
+    end_date: npt.NDArray[NumpyDateType] | NumpyDateType
+        end date or array of end dates, broadcastable with `codes_or_ids`.
+    calendar: FinancialCalendar | Sequence[FinancialCalendar] | None
+        calendar of the business day counters, or the sequence of calendars indexed by `calendar_ids`.
+    out: npt.NDArray[np.double] | None
+        array where the year fractions are written.
+    calendar_ids: npt.NDArray[np.integer] | None
+        index in `calendar` of the calendar of each row, broadcastable with `codes_or_ids`.
+
+    Returns
+    -------
+    npt.NDArray[np.double]
+        the year fraction of each row.
+
+    """
+    ids = np.asarray(codes_or_ids)
+    if not np.issubdtype(ids.dtype, np.integer):
+        ids = day_counter_ids(ids)
+    elif ids.size and (ids.min() < 0 or ids.max() >= len(all_day_counters)):
+        bad_id = ids.min() if ids.min() < 0 else ids.max()
+        raise ValueError(f'invalid day counter id {bad_id}, ids must be in [0, {len(all_day_counters)})')
+    shape = np.broadcast_shapes(ids.shape, np.shape(start_date), np.shape(end_date))
+    ids = np.broadcast_to(ids, shape).reshape(-1)
+    start_dates = np.broadcast_to(start_date, shape).reshape(-1)
+    end_dates = np.broadcast_to(end_date, shape).reshape(-1)
+    if out is None:
+        out = np.empty(shape, dtype=np.float64)
+    flat_out = out.reshape(-1)
+
+    if calendar_ids is not None:
+        calendar_ids = np.broadcast_to(calendar_ids, shape).reshape(-1)
+
+    registered = list(all_day_counters.values())
+    for rows in group_rows(ids):
+        day_counter = registered[ids[rows[0]]]
+        if calendar_ids is None:
+            flat_out[rows] = day_counter(start_dates[rows], end_dates[rows], calendar)
+        else:
+            flat_out[rows] = day_counter(start_dates[rows], end_dates[rows], calendar, calendar_ids=calendar_ids[rows])
+
+    if not np.shares_memory(flat_out, out):
+        out[...] = flat_out.reshape(shape)
+    return out
@@ -0,0 +1,133 @@
+from enum import StrEnum
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
+import numpy.typing as npt
+
+from financialpydate.convention import Convention
+from financialpydate.financial_calendar import FinancialCalendar, MONTH_TABLE_SIZE, TABLE_START_MONTH
+from financialpydate.numpy_types import NumpyDateType
+
+
+class ExpiryRule(StrEnum):
+    """
+    nth_weekday: the n-th `day` weekday of the month, 0 being Monday, counted from the end of the month for negative n.
+    nth_business_day: the n-th business day of the month, counted from the end of the month for negative n.
+    day_of_month: the calendar day `day` of the month, the last day of shorter months.
+    """
+
+    nth_weekday = 'nth_weekday'
+    nth_business_day = 'nth_business_day'
+    day_of_month = 'day_of_month'
+
+
+class ExpirySpec(NamedTuple):
+    """
+    Expiry rule of a listed contract. The rule date of the contract month shifted by `month_offset` months is adjusted
+    with `roll` if it is not a business day, then moved by `lag` business days, negative lags being before the rule
+    date.
+    """
+
+    rule: ExpiryRule
+    n: int = 1
+    day: int = 1
+    roll: Convention = Convention.preceding
+    lag: int = 0
+    month_offset: int = 0
+
+
+THIRD_FRIDAY = ExpirySpec(ExpiryRule.nth_weekday, 3, 4)
+SECOND_FRIDAY = ExpirySpec(ExpiryRule.nth_weekday, 2, 4)
+THIRD_WEDNESDAY = ExpirySpec(ExpiryRule.nth_weekday, 3, 2)
+LAST_BUSINESS_DAY = ExpirySpec(ExpiryRule.nth_business_day, -1)
+BUSINESS_DAY_BEFORE_FIFTEENTH = ExpirySpec(ExpiryRule.day_of_month, day=15, roll=Convention.following, lag=-1)
+
+
+def expiry_dates(
+    calendar: FinancialCalendar,
+    contract_months: npt.NDArray[np.datetime64] | np.datetime64,
+    spec: ExpirySpec,
+) -> NumpyDateType | npt.NDArray[NumpyDateType]:
+    """
+    Returns the expiry dates of a chain of contracts. The expiries of every month of the calendar table range are
+    computed once per calendar and rule and cached, later calls are a single lookup. Months without the n-th weekday
+    or n-th business day of the rule have no expiry, requesting one of them raises a ValueError.
+
+    Parameters
+    ----------
+    calendar: FinancialCalendar
+        exchange calendar, such as `all_calendars["Germany['Eurex']"]`.
+    contract_months: npt.NDArray[np.datetime64] | np.datetime64
+        contract months, as datetime64[M] or as any date of the month.
+    spec: ExpirySpec
+        expiry rule, such as `THIRD_FRIDAY` or `ExpirySpec(ExpiryRule.nth_business_day, -3)` for the third to last
+        business day of the month.
+
+    Returns
+    -------
+    NumpyDateType | npt.NDArray[NumpyDateType]
+        the expiry date of each contract month.
+
+    Raises
+    ------
+    ValueError
+        if the rule is invalid or a contract month has no n-th weekday or n-th business day of the rule.
+
+    """
+    months = np.asarray(contract_months).astype('datetime64[M]')
+    index = months.view(np.int64) - TABLE_START_MONTH.astype(np.int64)
+    if index.size and (index.min() < 0 or index.max() >= MONTH_TABLE_SIZE):
+        dates = _expiry_dates(calendar, months, spec)
+    else:
+        dates = _expiry_table(calendar, spec)[index]
+    if np.any(np.isnat(dates)):
+        raise ValueError(f'contract months have no expiry for the rule {spec}')
+    return dates
+
+
+@lru_cache(maxsize=1024)
+def _expiry_table(calendar: FinancialCalendar, spec: ExpirySpec) -> npt.NDArray[NumpyDateType]:
+    table = _expiry_dates(calendar, TABLE_START_MONTH + np.arange(MONTH_TABLE_SIZE).astype('timedelta64[M]'), spec)
+    table.flags.writeable = False
+    return table
+
+
+def _expiry_dates(
+    calendar: FinancialCalendar, months: npt.NDArray[np.datetime64], spec: ExpirySpec
+) -> npt.NDArray[NumpyDateType]:
+    months = months + np.timedelta64(spec.month_offset, 'M')
+    first_days = months.astype('datetime64[D]')
+    month_ends = (months + np.timedelta64(1, 'M')).astype('datetime64[D]') - np.timedelta64(1, 'D')
+    match spec.rule:
+        case ExpiryRule.nth_weekday:
+            if spec.n == 0 or not 0 <= spec.day <= 6:
+                raise ValueError('nth_weekday expiries need a non zero n and a weekday from 0 to 6')
+            # 1970-01-01 is a Thursday, the weekday of a date is its day number plus 3 modulo 7.
+            if spec.n > 0:
+                weekdays = (first_days.view(np.int64) + 3) % 7
+                dates = first_days + ((spec.day - weekdays) % 7 + 7 * (spec.n - 1)).astype('timedelta64[D]')
+            else:
+                weekdays = (month_ends.view(np.int64) + 3) % 7
+                dates = month_ends - ((weekdays - spec.day) % 7 + 7 * (-spec.n - 1)).astype('timedelta64[D]')
+            # months without the n-th weekday have no expiry, NaT is carried through the adjustments.
+            dates = np.where(dates.astype('datetime64[M]') == months, dates, np.datetime64('NaT', 'D'))
+            dates = calendar.offset(dates, 0, spec.roll)
+        case ExpiryRule.nth_business_day:
+            if spec.n == 0:
+                raise ValueError('nth_business_day expiries need a non zero n')
+            # months with fewer business days than |n| have no expiry, as months without the n-th weekday.
+            long_enough = calendar.business_days_in_month(months) >= abs(spec.n)
+            dates = np.full(months.shape, np.datetime64('NaT', 'D'))
+            dates[long_enough] = calendar.nth_business_day(months[long_enough], spec.n)
+        case ExpiryRule.day_of_month:
+            if spec.day < 1:
+                raise ValueError('day_of_month expiries need a day of month from 1')
+            dates = np.minimum(first_days + np.timedelta64(spec.day - 1, 'D'), month_ends)
+            dates = calendar.offset(dates, 0, spec.roll)
+        case _:
+            raise NotImplementedError(f'Expiry rule {spec.rule} is not implemented.')
+
+    if spec.lag != 0:
+        dates = calendar.working_days_offset(dates, spec.lag, Convention.following)
+    return np.asarray(dates, dtype='datetime64[D]')
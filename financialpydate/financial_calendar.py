@@ -1,13 +1,51 @@
 from functools import reduce
-from typing import overload, Sequence, cast
+from typing import Iterator, NamedTuple, overload, Sequence, cast
 
 import numpy as np
 import numpy.typing as npt
 
-from financialpydate.date_handler import day, add_month_day, month
+from financialpydate.date_handler import day, add_month_day, month, unique_sorted
 from financialpydate.rule import Rule
 from financialpydate.convention import Convention
 from financialpydate.numpy_types import NumpyDateType
+from financialpydate.schedule_set import ScheduleSet
+from financialpydate.tenor import Tenor, TenorArray, TenorUnit
+
+# The business day tables of a calendar cover the range of the holiday files, dates outside of it fall back to numpy.
+TABLE_START = np.datetime64('1901-01-01', 'D')
+TABLE_END = np.datetime64('2200-01-01', 'D')
+TABLE_SIZE = int((TABLE_END - TABLE_START).astype(np.int64)) + 1
+TABLE_START_MONTH = TABLE_START.astype('datetime64[M]')
+MONTH_TABLE_SIZE = int((TABLE_END.astype('datetime64[M]') - TABLE_START_MONTH).astype(np.int64))
+
+
+def _table_index(date: NumpyDateType | npt.NDArray[NumpyDateType]) -> npt.NDArray[np.int64]:
+    return np.asarray(date, dtype='datetime64[D]').view(np.int64) - TABLE_START.astype(np.int64)
+
+
+class OvernightFixings(NamedTuple):
+    """
+    Fixings of compounded overnight rate accrual periods. The fixings of period `i` are `fixing_dates[i]` and their
+    weights, in calendar days, `weights[fixing_dates.offsets[i] : fixing_dates.offsets[i + 1]]`.
+    """
+
+    fixing_dates: ScheduleSet
+    weights: npt.NDArray[np.int64]
+
+
+def _inside_table(index: npt.NDArray[np.int64]) -> bool:
+    return index.size == 0 or bool(index.min() >= 0 and index.max() < TABLE_SIZE)
+
+
+def _month_table_index(
+    dates: NumpyDateType | npt.NDArray[NumpyDateType],
+) -> tuple[npt.NDArray[np.datetime64], npt.NDArray[np.int64]]:
+    months = np.asarray(dates).astype('datetime64[M]')
+    return months, months.view(np.int64) - TABLE_START_MONTH.astype(np.int64)
+
+
+def _inside_month_table(index: npt.NDArray[np.int64]) -> bool:
+    return index.size == 0 or bool(index.min() >= 0 and index.max() < MONTH_TABLE_SIZE)
 
 
 def previous_twentieth(date: NumpyDateType, rule: Rule) -> NumpyDateType:
@@ -44,6 +82,9 @@ class FinancialCalendar:
         '_calendar',
         '_one_day_time_delta',
         '_nineteen_days_time_delta',
+        '_business_day_counts',
+        '_business_days',
+        '_month_business_day_counts',
     )
 
     def __init__(self, holidays: npt.NDArray[NumpyDateType], weekmask: str | npt.NDArray[np.bool_] | None = None):
@@ -55,6 +96,13 @@ class FinancialCalendar:
             self._calendar = np.busdaycalendar(holidays=holidays, weekmask=weekmask)
         else:
             self._calendar = np.busdaycalendar(holidays=holidays, weekmask=weekmask.astype(np.int_))
+        self._business_day_counts: npt.NDArray[np.int32] | None = None
+        self._business_days: npt.NDArray[NumpyDateType] | None = None
+        self._month_business_day_counts: npt.NDArray[np.int32] | None = None
+
+    def __reduce__(self):
+        # np.busdaycalendar cannot be pickled, the calendar is rebuilt from its holidays and weekmask instead.
+        return FinancialCalendar, (self.holidays, self.weekmask)
 
     @property
     def holidays(self) -> npt.NDArray[NumpyDateType]:
@@ -68,6 +116,296 @@ class FinancialCalendar:
     def numpy_calendar(self) -> np.busdaycalendar:
         return self._calendar
 
+    def overlay(self, added: npt.ArrayLike | None = None, removed: npt.ArrayLike | None = None) -> 'CalendarOverlay':
+        """
+        Returns this calendar with the `added` dates as extra holidays, such as unscheduled market closures, and the
+        `removed` holidays as business days. The calendar itself is not modified, nor are its cached tables.
+        """
+        return CalendarOverlay(self, added, removed)
+
+    def _business_day_tables(self) -> tuple[npt.NDArray[np.int32], npt.NDArray[NumpyDateType]]:
+        """
+        Returns the number of business days before each date of the table range, `counts[i]` being the number of
+        business days in `[1901-01-01, 1901-01-01 + i)`, and the sorted business days of the range. The counts have an
+        extra entry past the range for the counts in `(end_date, start_date]`. Built on first use.
+        """
+        if self._business_day_counts is None:
+            days = np.arange(TABLE_START, TABLE_END + np.timedelta64(1, 'D'))
+            is_business_day = np.is_busday(days, busdaycal=self._calendar)
+            counts = np.zeros(TABLE_SIZE + 1, dtype=np.int32)
+            np.cumsum(is_business_day, out=counts[1:])
+            self._business_days = days[:-1][is_business_day[:-1]]
+            self._business_days.flags.writeable = False
+            self._business_day_counts = counts
+        return self._business_day_counts, cast(npt.NDArray[NumpyDateType], self._business_days)
+
+    def _month_table(self) -> npt.NDArray[np.int32]:
+        """
+        Returns the number of business days of the table range before the first day of each month, `counts[m]` for the
+        month `m` months after January 1901, with an extra entry for the month past the range. Built on first use.
+        """
+        if self._month_business_day_counts is None:
+            counts, _ = self._business_day_tables()
+            months = TABLE_START_MONTH + np.arange(MONTH_TABLE_SIZE + 1).astype('timedelta64[M]')
+            self._month_business_day_counts = counts[_table_index(months.astype('datetime64[D]'))]
+        return self._month_business_day_counts
+
+    def first_business_day_of_month(
+        self, dates: NumpyDateType | npt.NDArray[NumpyDateType]
+    ) -> NumpyDateType | npt.NDArray[NumpyDateType]:
+        """Returns the first business day of the month of each date, dates can also be datetime64[M] months."""
+        months, index = _month_table_index(dates)
+        if not _inside_month_table(index):
+            return np.busday_offset(months.astype('datetime64[D]'), 0, 'forward', busdaycal=self._calendar)
+        _, business_days = self._business_day_tables()
+        return business_days[self._month_table()[index]]
+
+    def last_business_day_of_month(
+        self, dates: NumpyDateType | npt.NDArray[NumpyDateType]
+    ) -> NumpyDateType | npt.NDArray[NumpyDateType]:
+        """Returns the last business day of the month of each date, dates can also be datetime64[M] months."""
+        months, index = _month_table_index(dates)
+        if not _inside_month_table(index):
+            next_months = (months + np.timedelta64(1, 'M')).astype('datetime64[D]')
+            return np.busday_offset(next_months, -1, 'forward', busdaycal=self._calendar)
+        _, business_days = self._business_day_tables()
+        return business_days[self._month_table()[index + 1] - 1]
+
+    def business_days_in_month(
+        self, dates: NumpyDateType | npt.NDArray[NumpyDateType]
+    ) -> np.int64 | npt.NDArray[np.int64]:
+        """Returns the number of business days of the month of each date, dates can also be datetime64[M] months."""
+        months, index = _month_table_index(dates)
+        if not _inside_month_table(index):
+            next_months = months + np.timedelta64(1, 'M')
+            return np.busday_count(
+                months.astype('datetime64[D]'), next_months.astype('datetime64[D]'), busdaycal=self._calendar
+            ).astype(np.int64)
+        month_counts = self._month_table()
+        return np.subtract(month_counts[index + 1], month_counts[index], dtype=np.int64)
+
+    def nth_business_day(
+        self, months: NumpyDateType | npt.NDArray[NumpyDateType], n: int | npt.NDArray[np.int_]
+    ) -> NumpyDateType | npt.NDArray[NumpyDateType]:
+        """
+        Returns the n-th business day of each month, counted from the end of the month for negative `n`: 1 is the
+        first business day and -1 the last.
+
+        Parameters
+        ----------
+        months: NumpyDateType | npt.NDArray[NumpyDateType]
+            months, as datetime64[M] or as any date of the month.
+        n: int | npt.NDArray[np.int_]
+            rank of the business day, broadcastable with `months`.
+
+        Returns
+        -------
+        NumpyDateType | npt.NDArray[NumpyDateType]
+            the n-th business day of each month.
+
+        Raises
+        ------
+        ValueError
+            if `n` is zero or a month has fewer than `abs(n)` business days.
+
+        """
+        months, n = np.broadcast_arrays(np.asarray(months).astype('datetime64[M]'), np.asarray(n, dtype=np.int64))
+        if np.any(n == 0):
+            raise ValueError('business days are counted from 1, or from -1 for the end of the month')
+        if np.any(np.abs(n) > self.business_days_in_month(months)):
+            raise ValueError('months have fewer business days than requested')
+
+        months, index = _month_table_index(months)
+        if not _inside_month_table(index):
+            first_days = months.astype('datetime64[D]')
+            next_first_days = (months + np.timedelta64(1, 'M')).astype('datetime64[D]')
+            return np.where(
+                n > 0,
+                np.busday_offset(first_days, np.maximum(n - 1, 0), 'forward', busdaycal=self._calendar),
+                np.busday_offset(next_first_days, np.minimum(n, 0), 'forward', busdaycal=self._calendar),
+            )
+        _, business_days = self._business_day_tables()
+        month_counts = self._month_table()
+        return business_days[np.where(n > 0, month_counts[index] + n - 1, month_counts[index + 1] + n)]
+
+    @overload
+    def business_day_count(
+        self,
+        start_date: npt.NDArray[NumpyDateType] | NumpyDateType,
+        end_date: npt.NDArray[NumpyDateType],
+    ) -> npt.NDArray[np.int64]: ...
+
+    @overload
+    def business_day_count(
+        self,
+        start_date: npt.NDArray[NumpyDateType],
+        end_date: npt.NDArray[NumpyDateType] | NumpyDateType,
+    ) -> npt.NDArray[np.int64]: ...
+
+    @overload
+    def business_day_count(self, start_date: NumpyDateType, end_date: NumpyDateType) -> np.int64: ...
+
+    def business_day_count(self, start_date, end_date):
+        """
+        Counts the business days in `[start_date, end_date)`, or minus the business days in `(end_date, start_date]`
+        if `end_date` is before `start_date`, as `np.busday_count` does. Each count is two lookups in a cumulative table
+        of business days.
+
+        Parameters
+        ----------
+        start_date: npt.NDArray[NumpyDateType] | NumpyDateType
+            start date or array of start dates.
+        end_date: npt.NDArray[NumpyDateType] | NumpyDateType
+            end date or array of end dates.
+
+        Returns
+        -------
+        npt.NDArray[np.int64] | np.int64
+            the number of business days between the given dates.
+
+        """
+        counts, _ = self._business_day_tables()
+        start_index = _table_index(start_date)
+        end_index = _table_index(end_date)
+        if not (_inside_table(start_index) and _inside_table(end_index)):
+            return self._business_day_count_outside_table(start_date, end_date, start_index, end_index)
+        backward = end_index < start_index
+        return np.subtract(counts[end_index + backward], counts[start_index + backward], dtype=np.int64)
+
+    def _business_day_count_outside_table(
+        self,
+        start_date: npt.NDArray[NumpyDateType] | NumpyDateType,
+        end_date: npt.NDArray[NumpyDateType] | NumpyDateType,
+        start_index: npt.NDArray[np.int64],
+        end_index: npt.NDArray[np.int64],
+    ) -> npt.NDArray[np.int64] | np.int64:
+        if start_index.ndim == 0 and end_index.ndim == 0:
+            return np.busday_count(start_date, end_date, busdaycal=self._calendar)
+        counts, _ = self._business_day_tables()
+        start_index, end_index = np.broadcast_arrays(start_index, end_index)
+        outside = (start_index < 0) | (start_index >= TABLE_SIZE) | (end_index < 0) | (end_index >= TABLE_SIZE)
+        start_index = np.where(outside, 0, start_index)
+        end_index = np.where(outside, 0, end_index)
+        backward = end_index < start_index
+        result = np.subtract(counts[end_index + backward], counts[start_index + backward], dtype=np.int64)
+        start_dates, end_dates = np.broadcast_arrays(np.asarray(start_date), np.asarray(end_date))
+        result[outside] = np.busday_count(start_dates[outside], end_dates[outside], busdaycal=self._calendar)
+        return result
+
+    def business_days(self, start_date: NumpyDateType, end_date: NumpyDateType) -> npt.NDArray[NumpyDateType]:
+        """
+        Returns the business days in `[start_date, end_date)`, empty if `end_date` is not after `start_date`. Within
+        the table range the result is a read-only slice of the sorted business days of the calendar, without any copy.
+        """
+        start_index, end_index = _table_index(start_date), _table_index(end_date)
+        if not (_inside_table(start_index) and _inside_table(end_index)):
+            days = np.arange(start_date, max(start_date, end_date), dtype='datetime64[D]')
+            return days[np.is_busday(days, busdaycal=self._calendar)]
+        counts, business_days = self._business_day_tables()
+        return business_days[counts[start_index] : max(counts[start_index], counts[end_index])]
+
+    def business_day_ranges(
+        self, start_dates: npt.NDArray[NumpyDateType], end_dates: npt.NDArray[NumpyDateType]
+    ) -> ScheduleSet:
+        """
+        Returns the business days in `[start_dates[i], end_dates[i])` of each range as the schedule `i` of a
+        `ScheduleSet`, gathered from the sorted business days of the calendar in a single pass.
+
+        Parameters
+        ----------
+        start_dates: npt.NDArray[NumpyDateType]
+            start date of each range.
+        end_dates: npt.NDArray[NumpyDateType]
+            end date of each range, excluded. Ranges whose end date is not after their start date are empty.
+
+        Returns
+        -------
+        ScheduleSet
+            the business days of each range.
+
+        """
+        start_dates, end_dates = np.broadcast_arrays(
+            np.asarray(start_dates, dtype='datetime64[D]').reshape(-1),
+            np.asarray(end_dates, dtype='datetime64[D]').reshape(-1),
+        )
+        start_index, end_index = _table_index(start_dates), _table_index(end_dates)
+        if not (_inside_table(start_index) and _inside_table(end_index)):
+            return ScheduleSet.from_schedules(
+                [self.business_days(start, end) for start, end in zip(start_dates, end_dates)]
+            )
+        counts, business_days = self._business_day_tables()
+        start_ordinals = counts[start_index].astype(np.int64)
+        lengths = np.maximum(counts[end_index] - start_ordinals, 0)
+        offsets = np.zeros(lengths.shape[0] + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        ordinals = np.arange(offsets[-1]) + np.repeat(start_ordinals - offsets[:-1], lengths)
+        return ScheduleSet(business_days[ordinals], offsets)
+
+    def overnight_fixings(
+        self,
+        start_date: npt.NDArray[NumpyDateType] | NumpyDateType,
+        end_date: npt.NDArray[NumpyDateType] | NumpyDateType,
+        lookback: int = 0,
+        lockout: int = 0,
+        observation_shift: bool = False,
+    ) -> OvernightFixings:
+        """
+        Returns the fixing dates and weights of compounded overnight rate (SOFR, €STR, SONIA) accrual periods, with
+        this calendar as the fixing calendar. Each business day of `[start_date, end_date)` accrues the fixing of a
+        business day for its weight, the number of calendar days to the next business day. All periods are computed at
+        once from the business day tables of the calendar.
+
+        Parameters
+        ----------
+        start_date: npt.NDArray[NumpyDateType] | NumpyDateType
+            accrual start date or array of accrual start dates.
+        end_date: npt.NDArray[NumpyDateType] | NumpyDateType
+            accrual end date or array of accrual end dates.
+        lookback: int
+            number of business days the fixings are taken before the accrued days.
+        lockout: int
+            number of business days at the end of each period accruing the fixing of the business day before them.
+        observation_shift: bool
+            if True, the weights are those of the observation period, shifted `lookback` business days before the
+            accrual period, instead of those of the accrued days.
+
+        Returns
+        -------
+        OvernightFixings
+            the fixing dates of each period as a ScheduleSet and the weight of each fixing.
+
+        """
+        counts, business_days = self._business_day_tables()
+        start_index = np.atleast_1d(_table_index(start_date))
+        end_index = np.atleast_1d(_table_index(end_date))
+        if not (_inside_table(start_index) and _inside_table(end_index)):
+            raise ValueError(f'overnight fixings are only available from {TABLE_START} to {TABLE_END}')
+        start_ordinal, end_ordinal = np.broadcast_arrays(counts[start_index].astype(np.int64), counts[end_index])
+        lengths = np.maximum(end_ordinal - start_ordinal, 0)
+        offsets = np.zeros(lengths.shape[0] + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        if offsets[-1] > 0 and np.min(start_ordinal[lengths > 0]) < lookback:
+            raise ValueError(f'overnight fixings are only available from {TABLE_START} to {TABLE_END}')
+
+        # business day ordinal of each accrued day, the ordinal of a date being the number of business days before it
+        ordinal = np.arange(offsets[-1]) + np.repeat(start_ordinal - offsets[:-1], lengths)
+        period_end_ordinal = np.repeat(end_ordinal, lengths)
+        # as in QuantLib, the observation period ends `lookback` business days before the end date, counting a date
+        # that is not a business day as the first of them, and on the end date itself without lookback.
+        if observation_shift and lookback > 0:
+            ordinal -= lookback
+            period_end_ordinal -= lookback
+            period_end = business_days[period_end_ordinal]
+            fixing_ordinal = np.minimum(ordinal, period_end_ordinal - lockout - 1)
+        else:
+            period_end = np.repeat(np.broadcast_to(np.asarray(end_date, dtype='datetime64[D]'), lengths.shape), lengths)
+            fixing_ordinal = np.minimum(ordinal, period_end_ordinal - lockout - 1) - lookback
+        # the business day after the last one of the tables is not before TABLE_END, nor before the period end.
+        next_ordinal = np.minimum(ordinal + 1, business_days.shape[0] - 1)
+        next_business_day = np.where(ordinal + 1 < business_days.shape[0], business_days[next_ordinal], TABLE_END)
+        weights = (np.minimum(next_business_day, period_end) - business_days[ordinal]).astype(np.int64)
+        return OvernightFixings(ScheduleSet(business_days[fixing_ordinal], offsets), weights)
+
     def _get_cds_date_range(
         self, date: NumpyDateType, convention: Convention, initial_date: bool
     ) -> npt.NDArray[NumpyDateType]:
@@ -280,37 +618,54 @@ class FinancialCalendar:
     def offset(
         self,
         dates: NumpyDateType,
-        offset: int | np.timedelta64,
+        offset: int | np.timedelta64 | str | Tenor,
         roll: Convention = Convention.unadjusted,
+        end_of_month: bool = False,
     ) -> NumpyDateType: ...
 
     @overload
     def offset(
         self,
         dates: NumpyDateType,
-        offset: npt.NDArray[np.int_] | npt.NDArray[np.timedelta64],
+        offset: npt.NDArray[np.int_] | npt.NDArray[np.timedelta64] | TenorArray,
         roll: Convention = Convention.unadjusted,
+        end_of_month: bool = False,
     ) -> npt.NDArray[NumpyDateType]: ...
 
     @overload
     def offset(
         self,
         dates: npt.NDArray[NumpyDateType],
-        offset: int | np.timedelta64,
+        offset: int | np.timedelta64 | str | Tenor,
         roll: Convention = Convention.unadjusted,
+        end_of_month: bool = False,
     ) -> npt.NDArray[NumpyDateType]: ...
 
     @overload
     def offset(
         self,
         dates: npt.NDArray[NumpyDateType],
-        offset: npt.NDArray[np.int_] | npt.NDArray[np.timedelta64],
+        offset: npt.NDArray[np.int_] | npt.NDArray[np.timedelta64] | TenorArray,
         roll: Convention = Convention.unadjusted,
+        end_of_month: bool = False,
     ) -> npt.NDArray[NumpyDateType]: ...
 
-    def offset(self, dates, offset, roll: Convention = Convention.unadjusted):
+    def offset(self, dates, offset, roll: Convention = Convention.unadjusted, end_of_month: bool = False):
+        """
+        Offsets the dates by a number of days, weeks, months or years, or by tenors, and adjusts the result with
+        `roll`. Month and year offsets are clipped to the length of the target month. With `end_of_month`, month and
+        year offsets of a date on or after the last business day of its month give the last business day of the target
+        month, or the last day of the target month from the last day of a month if the offset is unadjusted, as in
+        QuantLib.
+        """
+        if isinstance(offset, str):
+            offset = Tenor.parse(offset)
+        if isinstance(offset, Tenor):
+            offset = TenorArray(offset.count, offset.unit)
+        if isinstance(offset, TenorArray):
+            return self._tenor_offset(dates, offset, roll, end_of_month)
         if isinstance(offset, int):
-            rolled_date = dates + offset
+            rolled_date = dates + np.timedelta64(offset, 'D')
         elif offset.dtype in ['<m8[D]', '<m8[W]', 'int']:
             rolled_date = dates + offset
         elif offset.dtype in ['<m8[M]', '<m8[Y]']:
@@ -318,16 +673,67 @@ class FinancialCalendar:
             dt_days = dates - monthly_dates
             offset_date = monthly_dates + offset
             extra_offset = offset_date + np.timedelta64(1, 'M')
-            dt_month = (extra_offset.astype('M8[D]') - offset_date) - 1
+            dt_month = (extra_offset.astype('M8[D]') - offset_date) - np.timedelta64(1, 'D')
             rolled_date = np.where(
                 dt_month >= dt_days, (monthly_dates + offset) + dt_days, (monthly_dates + offset) + dt_month
             )
         else:
             raise NotImplementedError
 
+        if roll != Convention.unadjusted:
+            rolled_date = np.busday_offset(rolled_date, 0, roll.value, busdaycal=self._calendar)
+        if end_of_month and not isinstance(offset, int) and offset.dtype in ['<m8[M]', '<m8[Y]']:
+            rolled_date = self._end_of_month_offset(dates, offset, rolled_date, roll)
+            rolled_date = rolled_date if rolled_date.ndim else rolled_date[()]
+        return rolled_date
+
+    def _end_of_month_offset(
+        self,
+        dates: npt.NDArray[NumpyDateType],
+        months: npt.NDArray[np.timedelta64],
+        rolled_dates: npt.NDArray[NumpyDateType],
+        roll: Convention,
+    ) -> npt.NDArray[NumpyDateType]:
+        monthly_dates = np.asarray(dates, dtype='datetime64[D]').astype('datetime64[M]')
+        target_months = monthly_dates + months
         if roll == Convention.unadjusted:
-            return rolled_date
-        return np.busday_offset(rolled_date, 0, roll.value, busdaycal=self._calendar)
+            one_month, one_day = np.timedelta64(1, 'M'), np.timedelta64(1, 'D')
+            month_ends = (monthly_dates + one_month).astype('datetime64[D]') - one_day
+            target_month_ends = (target_months + one_month).astype('datetime64[D]') - one_day
+            at_month_end = dates == month_ends
+        else:
+            # as QuantLib's isEndOfMonth, dates after the last business day of their month are at the month end too.
+            at_month_end = dates >= self.last_business_day_of_month(monthly_dates)
+            target_month_ends = self.last_business_day_of_month(target_months)
+        return np.where(at_month_end, target_month_ends, rolled_dates)
+
+    def _tenor_offset(
+        self,
+        dates: NumpyDateType | npt.NDArray[NumpyDateType],
+        tenors: TenorArray,
+        roll: Convention,
+        end_of_month: bool = False,
+    ) -> NumpyDateType | npt.NDArray[NumpyDateType]:
+        """
+        Offsets the dates by tenors of mixed units in one pass: every calendar tenor is a number of months followed by a
+        number of days, zero for the units it does not have, and the business day tenors are offset on the calendar.
+        """
+        dates, counts, units = np.broadcast_arrays(
+            np.asarray(dates, dtype='datetime64[D]'), tenors.counts, tenors.units
+        )
+        months = np.where(units == TenorUnit.months, counts, 0) + 12 * np.where(units == TenorUnit.years, counts, 0)
+        days = np.where(units == TenorUnit.days, counts, 0) + 7 * np.where(units == TenorUnit.weeks, counts, 0)
+        rolled_dates = np.asarray(self.offset(dates, months.astype('timedelta64[M]')) + days.astype('timedelta64[D]'))
+        if roll != Convention.unadjusted:
+            rolled_dates = np.asarray(np.busday_offset(rolled_dates, 0, roll.value, busdaycal=self._calendar))
+        if end_of_month:
+            monthly = (units == TenorUnit.months) | (units == TenorUnit.years)
+            end_of_month_dates = self._end_of_month_offset(dates, months.astype('timedelta64[M]'), rolled_dates, roll)
+            rolled_dates = np.where(monthly, end_of_month_dates, rolled_dates)
+        business_days = units == TenorUnit.business_days
+        if np.any(business_days):
+            rolled_dates[business_days] = self.working_days_offset(dates[business_days], counts[business_days], roll)
+        return rolled_dates if rolled_dates.ndim else rolled_dates[()]
 
     @overload
     def working_days_offset(
@@ -359,6 +765,63 @@ class FinancialCalendar:
 
         return np.busday_offset(dates, offset, roll.value, busdaycal=self._calendar)
 
+    def window_start_dates(
+        self,
+        dates: npt.NDArray[NumpyDateType] | NumpyDateType,
+        lengths: npt.ArrayLike,
+        roll: Convention = Convention.following,
+    ) -> npt.NDArray[NumpyDateType]:
+        """
+        Returns the date `lengths[j]` business days before each date, as `working_days_offset(dates, -lengths[j], roll)`
+        with the windows on a last axis. Each date is adjusted and located in the business day table once, every window
+        length is then a single gather.
+
+        Parameters
+        ----------
+        dates: npt.NDArray[NumpyDateType] | NumpyDateType
+            end date or array of end dates of the windows.
+        lengths: npt.ArrayLike
+            one dimensional window lengths in business days, such as [1, 5, 10, 21, 63, 252].
+        roll: Convention
+            adjustment of the dates that are not business days, unadjusted meaning following.
+
+        Returns
+        -------
+        npt.NDArray[NumpyDateType]
+            the window start dates, of shape `dates.shape + (len(lengths),)`.
+
+        """
+        dates = np.asarray(dates, dtype='datetime64[D]')
+        lengths = np.asarray(lengths, dtype=np.int64).reshape(-1)
+        ordinals = self._business_day_ordinals(dates, roll)
+        if ordinals is None:
+            return self.working_days_offset(dates[..., None], -lengths, roll)
+        _, business_days = self._business_day_tables()
+        window_ordinals = ordinals[..., None] - lengths
+        if window_ordinals.size and (window_ordinals.min() < 0 or window_ordinals.max() >= business_days.shape[0]):
+            return self.working_days_offset(dates[..., None], -lengths, roll)
+        return business_days[window_ordinals]
+
+    def _business_day_ordinals(
+        self, dates: npt.NDArray[NumpyDateType], roll: Convention
+    ) -> npt.NDArray[np.int64] | None:
+        """
+        Returns the index in the sorted business days of each date adjusted with `roll`, unadjusted meaning following,
+        or None if a date is outside of the table range. Following and preceding are lookups in the count table.
+        """
+        index = _table_index(dates)
+        if not _inside_table(index):
+            return None
+        counts, _ = self._business_day_tables()
+        match roll:
+            case Convention.following | Convention.unadjusted:
+                return counts[index].astype(np.int64)
+            case Convention.preceding:
+                return counts[index + 1].astype(np.int64) - 1
+            case _:
+                adjusted_dates = np.busday_offset(dates, 0, roll.value, busdaycal=self._calendar)
+                return counts[_table_index(adjusted_dates)].astype(np.int64)
+
     def make_schedule(
         self,
         effective_date: NumpyDateType,
@@ -435,19 +898,164 @@ class FinancialCalendar:
 
         dates[-1] = self.offset(dates[-1], 0, termination_convention)
 
-        return np.unique(dates)
+        return unique_sorted(dates)
+
+    def _daily_progression(
+        self,
+        effective_date: NumpyDateType,
+        termination_date: NumpyDateType,
+        period: np.timedelta64,
+        convention: Convention,
+        rule: Rule,
+        first_date: NumpyDateType | None,
+        next_to_last_date: NumpyDateType | None,
+    ) -> tuple[npt.NDArray[NumpyDateType], NumpyDateType, np.timedelta64, int, npt.NDArray[NumpyDateType]] | None:
+        """
+        Describe the unadjusted dates built by `make_schedule` for a daily or weekly period without materialising them.
+        The dates are `head`, followed by `count` dates starting at `first` spaced by `step`, followed by `tail`.
+        Returns None when the inputs are not ordered, in which case the schedule must be built by `make_schedule`.
+        """
+        start_date = effective_date if first_date is None else first_date
+        if next_to_last_date is not None and start_date < next_to_last_date:
+            end_date = next_to_last_date
+        else:
+            end_date = termination_date
+        if not effective_date <= start_date < end_date <= termination_date:
+            return None
+
+        step = period.astype('timedelta64[D]')
+        count = int(-((start_date - end_date) // step))
+        head = [] if first_date is None else [effective_date]
+        # as in `make_schedule`, the termination date following a stub is adjusted by `convention` before the
+        # termination convention is applied.
+        tail = [] if next_to_last_date is None else [self.offset(termination_date, 0, convention)]
+        if rule == Rule.forward:
+            first = start_date.astype('datetime64[D]')
+            tail = [end_date] + tail
+        else:
+            first = (end_date - (count - 1) * step).astype('datetime64[D]')
+            head = head + [start_date]
+
+        return np.array(head, dtype='datetime64[D]'), first, step, count, np.array(tail, dtype='datetime64[D]')
+
+    def iter_schedule(
+        self,
+        effective_date: NumpyDateType,
+        termination_date: NumpyDateType,
+        period: np.timedelta64,
+        convention: Convention,
+        termination_convention: Convention,
+        end_of_month: bool,
+        rule: Rule = Rule.backward,
+        first_date: NumpyDateType | None = None,
+        next_to_last_date: NumpyDateType | None = None,
+        chunk_size: int = 65536,
+    ) -> Iterator[npt.NDArray[NumpyDateType]]:
+        """
+        Generate the same dates as `make_schedule` in blocks of at most `chunk_size` dates. Daily and weekly schedules
+        with forward or backward rules are generated and adjusted one block at a time, so long schedules never need to
+        be held in memory at once. Other schedules are built by `make_schedule` and then split into blocks.
+
+        Parameters
+        ----------
+        chunk_size: int
+            maximum number of dates in each yielded block.
+
+        Returns
+        -------
+        Iterator[npt.NDArray[NumpyDateType]]
+            blocks of adjusted dates. Their concatenation equals the output of `make_schedule`.
+
+        """
+        if chunk_size < 1:
+            raise ValueError('chunk_size must be positive')
+
+        progression = None
+        if period.dtype in ['m8[D]', 'm8[W]'] and rule in [Rule.forward, Rule.backward]:
+            progression = self._daily_progression(
+                effective_date, termination_date, period, convention, rule, first_date, next_to_last_date
+            )
+
+        if progression is None:
+            dates = self.make_schedule(
+                effective_date,
+                termination_date,
+                period,
+                convention,
+                termination_convention,
+                end_of_month,
+                rule,
+                first_date,
+                next_to_last_date,
+            )
+            for i in range(0, dates.shape[0], chunk_size):
+                yield dates[i : i + chunk_size]
+            return
+
+        head, first, step, count, tail = progression
+        # the last date is the only one adjusted with the termination convention, so it may fall before its
+        # neighbours; it is merged into the stream at its sorted position.
+        if tail.shape[0] > 0:
+            last_date = tail[-1]
+            tail = tail[:-1]
+        else:
+            count -= 1
+            last_date = first + count * step
+        last_date = self.offset(last_date, 0, termination_convention)
+
+        def raw_blocks():
+            yield head
+            for i in range(0, count, chunk_size):
+                yield first + np.arange(i, min(i + chunk_size, count)) * step
+            yield tail
+
+        last_emitted = None
+        is_last_date_merged = False
+        buffered: list[npt.NDArray[NumpyDateType]] = []
+        buffered_size = 0
+        for raw_dates in raw_blocks():
+            if raw_dates.shape[0] == 0:
+                continue
+            dates = self.offset(raw_dates, 0, convention)
+            if not is_last_date_merged:
+                index = np.searchsorted(dates, last_date)
+                if index < dates.shape[0]:
+                    dates = np.r_[dates[:index], last_date, dates[index:]]
+                    is_last_date_merged = True
+            dates = unique_sorted(dates)
+            if last_emitted is not None and dates[0] == last_emitted:
+                dates = dates[1:]
+            if dates.shape[0] == 0:
+                continue
+            last_emitted = dates[-1]
+            buffered.append(dates)
+            buffered_size += dates.shape[0]
+            if buffered_size >= chunk_size:
+                block = np.concatenate(buffered)
+                full_size = block.shape[0] - block.shape[0] % chunk_size
+                for i in range(0, full_size, chunk_size):
+                    yield block[i : i + chunk_size]
+                buffered = [block[full_size:]]
+                buffered_size = block.shape[0] - full_size
+
+        if not is_last_date_merged and last_emitted != last_date:
+            buffered.append(np.array([last_date], dtype='datetime64[D]'))
+        if len(buffered) > 0:
+            block = np.concatenate(buffered)
+            for i in range(0, block.shape[0], chunk_size):
+                yield block[i : i + chunk_size]
 
     def until(self, dates: npt.NDArray[NumpyDateType], until_date: NumpyDateType) -> npt.NDArray[NumpyDateType]:
         if dates.shape[0] == 0:
             raise ValueError('Dates must have at least one date')
 
-        return np.unique(np.r_[dates[dates <= until_date], until_date])
+        return unique_sorted(np.r_[dates[dates <= until_date], until_date])
 
     def after(self, dates: npt.NDArray[NumpyDateType], from_date: NumpyDateType) -> npt.NDArray[NumpyDateType]:
         if dates.shape[0] == 0:
             raise ValueError('Dates must have at least one date')
 
-        return np.unique(np.r_[from_date, dates[dates >= from_date]])
+        return unique_sorted(np.r_[from_date, dates[dates >= from_date]])
 
 
 def join_calendars(calendars: Sequence[FinancialCalendar]) -> FinancialCalendar:
@@ -461,3 +1069,123 @@ def join_calendars(calendars: Sequence[FinancialCalendar]) -> FinancialCalendar:
     unique_dates = np.unique(np.r_[*holidays_dates])
 
     return FinancialCalendar(holidays=unique_dates, weekmask=weekmask)
+
+
+class CalendarOverlay(FinancialCalendar):
+    """
+    Calendar made of a base calendar and a small sorted delta of added and removed holidays, created in microseconds.
+    Business day counts are those of the base calendar corrected by the delta, the business day tables are patched
+    from the tables of the base calendar and the numpy calendar is only built on first use. Overlays of an overlay
+    share its base calendar.
+
+    Parameters
+    ----------
+    base: FinancialCalendar
+        calendar the delta applies to.
+    added: npt.ArrayLike | None
+        dates that are not business days anymore, dates that are not business days of the base calendar are ignored.
+    removed: npt.ArrayLike | None
+        holidays of the base calendar that are business days, removed dates that are business days of the base
+        calendar are ignored.
+
+    """
+
+    __slots__ = ('_base', '_added', '_removed', '_numpy_calendar')
+
+    def __init__(
+        self, base: FinancialCalendar, added: npt.ArrayLike | None = None, removed: npt.ArrayLike | None = None
+    ):
+        added_dates = np.unique(np.asarray([] if added is None else added, dtype='datetime64[D]').reshape(-1))
+        removed_dates = np.unique(np.asarray([] if removed is None else removed, dtype='datetime64[D]').reshape(-1))
+        if np.intersect1d(added_dates, removed_dates).size:
+            raise ValueError('dates cannot be both added and removed')
+        if isinstance(base, CalendarOverlay):
+            added_dates, removed_dates = (
+                np.union1d(np.setdiff1d(base._added, removed_dates), added_dates),
+                np.union1d(np.setdiff1d(base._removed, added_dates), removed_dates),
+            )
+            base = base._base
+
+        removed_dates = removed_dates[~np.is_busday(removed_dates, busdaycal=base.numpy_calendar)]
+        holidays = base.holidays
+        positions = np.minimum(np.searchsorted(holidays, removed_dates), max(holidays.shape[0] - 1, 0))
+        if removed_dates.size and (holidays.size == 0 or np.any(holidays[positions] != removed_dates)):
+            raise ValueError('only holidays can be removed, days excluded by the weekmask cannot')
+        self._base: FinancialCalendar = base
+        self._added: npt.NDArray[NumpyDateType] = added_dates[np.is_busday(added_dates, busdaycal=base.numpy_calendar)]
+        self._removed: npt.NDArray[NumpyDateType] = removed_dates
+        self._numpy_calendar: np.busdaycalendar | None = None
+        self._stub_days_old_cds: np.timedelta64 = np.timedelta64(30, 'D')
+        self._one_day_time_delta: np.timedelta64 = np.timedelta64(1, 'D')
+        self._business_day_counts: npt.NDArray[np.int32] | None = None
+        self._business_days: npt.NDArray[NumpyDateType] | None = None
+        self._month_business_day_counts: npt.NDArray[np.int32] | None = None
+
+    def __reduce__(self):
+        return CalendarOverlay, (self._base, self._added, self._removed)
+
+    @property
+    def _calendar(self) -> np.busdaycalendar:  # type: ignore[override]
+        if self._numpy_calendar is None:
+            self._numpy_calendar = np.busdaycalendar(holidays=self.holidays, weekmask=self._base.weekmask)
+        return self._numpy_calendar
+
+    @property
+    def base(self) -> FinancialCalendar:
+        return self._base
+
+    @property
+    def added(self) -> npt.NDArray[NumpyDateType]:
+        return self._added
+
+    @property
+    def removed(self) -> npt.NDArray[NumpyDateType]:
+        return self._removed
+
+    @property
+    def holidays(self) -> npt.NDArray[NumpyDateType]:
+        return np.union1d(np.setdiff1d(self._base.holidays, self._removed), self._added)
+
+    @property
+    def weekmask(self) -> npt.NDArray[np.bool_]:
+        return self._base.weekmask
+
+    def _business_day_tables(self) -> tuple[npt.NDArray[np.int32], npt.NDArray[NumpyDateType]]:
+        if self._business_day_counts is None:
+            base_counts, base_business_days = self._base._business_day_tables()
+            added_index = _table_index(self._added)
+            added_index = added_index[(added_index >= 0) & (added_index < TABLE_SIZE)]
+            removed_index = _table_index(self._removed)
+            removed_index = removed_index[(removed_index >= 0) & (removed_index < TABLE_SIZE)]
+
+            # each added holiday lowers the counts after it by one and each removed holiday raises them, the changes
+            # are accumulated in a single pass.
+            steps = np.zeros(base_counts.shape[0], dtype=np.int32)
+            np.add.at(steps, added_index + 1, -1)
+            np.add.at(steps, removed_index + 1, 1)
+            counts = base_counts + np.cumsum(steps, dtype=np.int32)
+            # the ordinal of a business day is the count of business days before it. The business days stop before
+            # TABLE_END, which only has a count.
+            added_index = added_index[added_index < TABLE_SIZE - 1]
+            removed_index = removed_index[removed_index < TABLE_SIZE - 1]
+            business_days = np.delete(base_business_days, base_counts[added_index])
+            removed_dates = TABLE_START + removed_index.astype('timedelta64[D]')
+            business_days = np.insert(business_days, np.searchsorted(business_days, removed_dates), removed_dates)
+            business_days.flags.writeable = False
+            self._business_days = business_days
+            self._business_day_counts = counts
+        return self._business_day_counts, cast(npt.NDArray[NumpyDateType], self._business_days)
+
+    def business_day_count(self, start_date, end_date):
+        """Counts the business days of the base calendar, corrected by the added and removed holidays in the range."""
+        counts = self._base.business_day_count(start_date, end_date)
+        if self._added.size == 0 and self._removed.size == 0:
+            return counts
+        start_date = np.asarray(start_date, dtype='datetime64[D]')
+        end_date = np.asarray(end_date, dtype='datetime64[D]')
+        # as in the tables, the range is shifted by one day to count (end_date, start_date] backwards.
+        backward = (end_date < start_date).astype('timedelta64[D]')
+        start_date, end_date = start_date + backward, end_date + backward
+        added = np.searchsorted(self._added, end_date) - np.searchsorted(self._added, start_date)
+        removed = np.searchsorted(self._removed, end_date) - np.searchsorted(self._removed, start_date)
+        return counts + (removed - added)
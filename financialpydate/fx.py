@@ -0,0 +1,175 @@
+from functools import lru_cache
+from typing import Mapping, Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+from financialpydate.convention import Convention
+from financialpydate.date_handler import group_rows
+from financialpydate.financial_calendar import FinancialCalendar, join_calendars
+from financialpydate.numpy_types import NumpyDateType
+from financialpydate.tenor import Tenor, TenorArray
+
+# Pairs settling one business day after the trade date, all others settle two business days after.
+_T_PLUS_ONE_PAIRS = frozenset({'USDCAD', 'USDTRY', 'USDPHP', 'USDRUB', 'CADUSD', 'TRYUSD', 'PHPUSD', 'RUBUSD'})
+
+
+@lru_cache(maxsize=1024)
+def _joint_calendar(calendars: tuple[FinancialCalendar, ...]) -> FinancialCalendar:
+    if len(calendars) == 1:
+        return calendars[0]
+    return join_calendars(calendars)
+
+
+class FXValueDates:
+    """
+    Spot and forward value dates of currency pairs. The spot lag is counted in business days of the non USD currencies
+    of the pair, USD holidays only block the value date: the spot date is then rolled to the next business day of both
+    currencies and USD. Forward value dates are offset from the spot date on that calendar, modified following with the
+    end of month rule. The calendars of each pair are joined once and shared between instances.
+
+    Parameters
+    ----------
+    pairs: Sequence[str]
+        currency pairs, such as ['EURUSD', 'USDJPY', 'EURGBP'], a pair id being its index in `pairs`.
+    calendars: Mapping[str, FinancialCalendar]
+        calendar of each currency of the pairs, with the calendar of USD.
+    spot_lags: Mapping[str, int] | None
+        spot lag of the pairs that do not settle two business days after the trade date, by default one business day
+        for USD against CAD, TRY, PHP and RUB.
+
+    """
+
+    __slots__ = ('_pairs', '_spot_lags', '_lag_calendars', '_value_calendars')
+
+    def __init__(
+        self,
+        pairs: Sequence[str],
+        calendars: Mapping[str, FinancialCalendar],
+        spot_lags: Mapping[str, int] | None = None,
+    ):
+        if 'USD' not in calendars:
+            raise ValueError('calendars must have the calendar of USD')
+        self._pairs: tuple[str, ...] = tuple(pairs)
+        self._spot_lags: npt.NDArray[np.int64] = np.empty(len(self._pairs), dtype=np.int64)
+        self._lag_calendars: list[FinancialCalendar] = []
+        self._value_calendars: list[FinancialCalendar] = []
+        for pair_id, pair in enumerate(self._pairs):
+            currencies = (pair[:3], pair[3:])
+            if len(pair) != 6 or currencies[0] == currencies[1]:
+                raise ValueError(f'invalid currency pair {pair!r}')
+            missing = [currency for currency in currencies if currency not in calendars]
+            if missing:
+                raise ValueError(f'no calendar for {", ".join(missing)}')
+            if spot_lags is not None and pair in spot_lags:
+                self._spot_lags[pair_id] = spot_lags[pair]
+            else:
+                self._spot_lags[pair_id] = 1 if pair in _T_PLUS_ONE_PAIRS else 2
+            lag_currencies = sorted(currency for currency in currencies if currency != 'USD')
+            value_currencies = sorted({*currencies, 'USD'})
+            self._lag_calendars.append(_joint_calendar(tuple(calendars[currency] for currency in lag_currencies)))
+            self._value_calendars.append(_joint_calendar(tuple(calendars[currency] for currency in value_currencies)))
+
+    @property
+    def pairs(self) -> tuple[str, ...]:
+        return self._pairs
+
+    @property
+    def spot_lags(self) -> npt.NDArray[np.int64]:
+        return self._spot_lags
+
+    def pair_ids(self, pairs: npt.ArrayLike) -> npt.NDArray[np.int64]:
+        """Returns the id of each currency pair name, each distinct name being looked up once."""
+        unique_pairs, inverse = np.unique(np.asarray(pairs, dtype=str), return_inverse=True)
+        index = {pair: pair_id for pair_id, pair in enumerate(self._pairs)}
+        missing = [pair for pair in unique_pairs.tolist() if pair not in index]
+        if missing:
+            raise ValueError(f'unknown currency pairs {", ".join(missing)}')
+        return np.array([index[pair] for pair in unique_pairs.tolist()], dtype=np.int64)[inverse].reshape(
+            np.shape(pairs)
+        )
+
+    def value_calendar(self, pair_id: int) -> FinancialCalendar:
+        """Returns the joint calendar of both currencies of the pair and USD, on which value dates are business days."""
+        return self._value_calendars[pair_id]
+
+    def spot_dates(
+        self, pair_ids: npt.ArrayLike, trade_dates: npt.NDArray[NumpyDateType] | NumpyDateType
+    ) -> npt.NDArray[NumpyDateType]:
+        """
+        Returns the spot date of each trade, grouping the trades by pair.
+
+        Parameters
+        ----------
+        pair_ids: npt.ArrayLike
+            pair id of each trade.
+        trade_dates: npt.NDArray[NumpyDateType] | NumpyDateType
+            trade dates, broadcastable with `pair_ids`.
+
+        Returns
+        -------
+        npt.NDArray[NumpyDateType]
+            the spot value date of each trade.
+
+        """
+        pair_ids, trade_dates = np.broadcast_arrays(
+            np.asarray(pair_ids, dtype=np.int64), np.asarray(trade_dates, dtype='datetime64[D]')
+        )
+        spot_dates = np.empty(trade_dates.shape, dtype='datetime64[D]')
+        flat_ids, flat_dates, flat_spot_dates = pair_ids.reshape(-1), trade_dates.reshape(-1), spot_dates.reshape(-1)
+        for rows in group_rows(flat_ids):
+            flat_spot_dates[rows] = self._spot_dates(int(flat_ids[rows[0]]), flat_dates[rows])
+        return spot_dates
+
+    def _spot_dates(self, pair_id: int, trade_dates: npt.NDArray[NumpyDateType]) -> npt.NDArray[NumpyDateType]:
+        lag_dates = self._lag_calendars[pair_id].working_days_offset(
+            trade_dates, self._spot_lags[pair_id], Convention.following
+        )
+        return self._value_calendars[pair_id].offset(lag_dates, 0, Convention.following)
+
+    def forward_dates(
+        self,
+        pair_ids: npt.ArrayLike,
+        trade_dates: npt.NDArray[NumpyDateType] | NumpyDateType,
+        tenors: str | Tenor | TenorArray,
+    ) -> npt.NDArray[NumpyDateType]:
+        """
+        Returns the forward value date of each trade, the tenor being counted from the spot date.
+
+        Parameters
+        ----------
+        pair_ids: npt.ArrayLike
+            pair id of each trade.
+        trade_dates: npt.NDArray[NumpyDateType] | NumpyDateType
+            trade dates, broadcastable with `pair_ids`.
+        tenors: str | Tenor | TenorArray
+            forward tenor, or tenors broadcastable with `pair_ids` and `trade_dates`.
+
+        Returns
+        -------
+        npt.NDArray[NumpyDateType]
+            the forward value date of each trade.
+
+        """
+        if isinstance(tenors, str):
+            tenors = Tenor.parse(tenors)
+        if isinstance(tenors, Tenor):
+            tenors = TenorArray(tenors.count, tenors.unit)
+        pair_ids, trade_dates, counts, units = np.broadcast_arrays(
+            np.asarray(pair_ids, dtype=np.int64),
+            np.asarray(trade_dates, dtype='datetime64[D]'),
+            tenors.counts,
+            tenors.units,
+        )
+        forward_dates = np.empty(trade_dates.shape, dtype='datetime64[D]')
+        flat_ids, flat_forward_dates = pair_ids.reshape(-1), forward_dates.reshape(-1)
+        flat_dates, flat_counts, flat_units = trade_dates.reshape(-1), counts.reshape(-1), units.reshape(-1)
+        for rows in group_rows(flat_ids):
+            pair_id = int(flat_ids[rows[0]])
+            flat_forward_dates[rows] = self._value_calendars[pair_id].offset(
+                self._spot_dates(pair_id, flat_dates[rows]),
+                TenorArray(flat_counts[rows], flat_units[rows]),
+                Convention.modifiedfollowing,
+                end_of_month=True,
+            )
+        return forward_dates
@@ -0,0 +1,127 @@
+from functools import lru_cache
+from typing import NamedTuple, Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+from financialpydate.convention import Convention
+from financialpydate.financial_calendar import FinancialCalendar
+from financialpydate.numpy_types import NumpyDateType
+from financialpydate.tenor import TenorArray
+
+
+class MaturityGrid(NamedTuple):
+    """Spot date of each as-of date and maturity of each pillar, `maturities[i, j]` being the pillar `j` of `i`."""
+
+    spot_dates: npt.NDArray[NumpyDateType]
+    maturities: npt.NDArray[NumpyDateType]
+
+
+def maturity_grid(
+    calendar: FinancialCalendar,
+    as_of_dates: npt.NDArray[NumpyDateType] | NumpyDateType,
+    spot_lag: int,
+    tenors: TenorArray | Sequence[str],
+    roll: Convention = Convention.modifiedfollowing,
+    end_of_month: bool = False,
+) -> MaturityGrid:
+    """
+    Returns the spot date, `spot_lag` business days after each as-of date, and the maturity of every pillar tenor from
+    it. The spot date and maturities of each as-of date are cached per calendar and pillars, a call only computes the
+    as-of dates that no previous call had, each distinct as-of date and spot date once.
+
+    Parameters
+    ----------
+    calendar: FinancialCalendar
+        calendar of the curve, joined calendars for cross currency curves.
+    as_of_dates: npt.NDArray[NumpyDateType] | NumpyDateType
+        as-of date or one dimensional array of as-of dates.
+    spot_lag: int
+        number of business days between the as-of date and the spot date.
+    tenors: TenorArray | Sequence[str]
+        pillar tenors, such as ['1W', '1M', '3M', '1Y', '30Y'].
+    roll: Convention
+        business day convention of the maturities.
+    end_of_month: bool
+        if True, month and year tenors from a spot date on the last business day of its month mature on the last
+        business day of the month.
+
+    Returns
+    -------
+    MaturityGrid
+        the spot dates and the maturity matrix, with one row per as-of date and one column per tenor.
+
+    """
+    if not isinstance(tenors, TenorArray):
+        tenors = TenorArray.parse(tenors)
+    as_of_dates = np.asarray(as_of_dates, dtype='datetime64[D]')
+    rows = _grid_rows(
+        calendar, spot_lag, tuple(tenors.counts.tolist()), tuple(tenors.units.tolist()), roll, end_of_month
+    )
+    unique_as_of_dates, inverse = np.unique(as_of_dates.reshape(-1), return_inverse=True)
+    spot_dates, maturities = rows.lookup(unique_as_of_dates)
+    return MaturityGrid(
+        spot_dates[inverse].reshape(as_of_dates.shape),
+        maturities[inverse].reshape(as_of_dates.shape + (len(tenors),)),
+    )
+
+
+class _GridRows:
+    """Spot date and maturities of the as-of dates computed for a calendar and pillars, sorted by as-of date."""
+
+    __slots__ = ('_calendar', '_spot_lag', '_tenors', '_roll', '_end_of_month', '_tables')
+
+    def __init__(
+        self, calendar: FinancialCalendar, spot_lag: int, tenors: TenorArray, roll: Convention, end_of_month: bool
+    ):
+        self._calendar: FinancialCalendar = calendar
+        self._spot_lag: int = spot_lag
+        self._tenors: TenorArray = tenors
+        self._roll: Convention = roll
+        self._end_of_month: bool = end_of_month
+        # the tables are replaced together, so concurrent calls always read consistent rows.
+        self._tables: tuple[npt.NDArray[NumpyDateType], npt.NDArray[NumpyDateType], npt.NDArray[NumpyDateType]] = (
+            np.empty(0, dtype='datetime64[D]'),
+            np.empty(0, dtype='datetime64[D]'),
+            np.empty((0, len(tenors)), dtype='datetime64[D]'),
+        )
+
+    def lookup(
+        self, as_of_dates: npt.NDArray[NumpyDateType]
+    ) -> tuple[npt.NDArray[NumpyDateType], npt.NDArray[NumpyDateType]]:
+        """Returns the spot dates and maturities of sorted distinct as-of dates, computing the ones not cached yet."""
+        known_dates, spot_dates, maturities = self._tables
+        position = np.searchsorted(known_dates, as_of_dates)
+        if known_dates.size:
+            found = known_dates[np.minimum(position, known_dates.shape[0] - 1)] == as_of_dates
+        else:
+            found = np.zeros(as_of_dates.shape, dtype=np.bool_)
+        if not np.all(found):
+            new_dates = as_of_dates[~found]
+            new_spot_dates = self._calendar.working_days_offset(new_dates, self._spot_lag, Convention.following)
+            # the spot dates of increasing as-of dates are non decreasing, as-of dates on the same spot date share a
+            # row.
+            unique_spot_dates, spot_inverse = np.unique(new_spot_dates, return_inverse=True)
+            new_maturities = self._calendar.offset(
+                unique_spot_dates[:, None], self._tenors, self._roll, self._end_of_month
+            )
+            known_dates = np.concatenate((known_dates, new_dates))
+            order = np.argsort(known_dates, kind='stable')
+            known_dates = known_dates[order]
+            spot_dates = np.concatenate((spot_dates, new_spot_dates))[order]
+            maturities = np.concatenate((maturities, new_maturities[spot_inverse]))[order]
+            self._tables = (known_dates, spot_dates, maturities)
+            position = np.searchsorted(known_dates, as_of_dates)
+        return spot_dates[position], maturities[position]
+
+
+@lru_cache(maxsize=64)
+def _grid_rows(
+    calendar: FinancialCalendar,
+    spot_lag: int,
+    counts: tuple[int, ...],
+    units: tuple[int, ...],
+    roll: Convention,
+    end_of_month: bool,
+) -> _GridRows:
+    return _GridRows(calendar, spot_lag, TenorArray(counts, units), roll, end_of_month)
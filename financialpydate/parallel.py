@@ -0,0 +1,298 @@
+import multiprocessing
+import os
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, NamedTuple, Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+from financialpydate.convention import Convention
+from financialpydate.financial_calendar import FinancialCalendar
+from financialpydate.numpy_types import NumpyDateType
+from financialpydate.rule import Rule
+from financialpydate.schedule_set import ScheduleSet
+
+
+class ScheduleTerms(NamedTuple):
+    """Terms of a single schedule, in the same order as the arguments of `FinancialCalendar.make_schedule`."""
+
+    calendar: FinancialCalendar
+    effective_date: NumpyDateType
+    termination_date: NumpyDateType
+    period: np.timedelta64
+    convention: Convention
+    termination_convention: Convention
+    end_of_month: bool
+    rule: Rule = Rule.backward
+    first_date: NumpyDateType | None = None
+    next_to_last_date: NumpyDateType | None = None
+
+
+# calendars of the current worker process, set once by `_initialize_worker`.
+_worker_calendars: tuple[FinancialCalendar, ...] = ()
+
+_Task = tuple[
+    int,
+    tuple,
+    npt.NDArray[NumpyDateType],
+    npt.NDArray[NumpyDateType],
+    npt.NDArray[NumpyDateType],
+    npt.NDArray[NumpyDateType],
+]
+
+
+def _process_context() -> multiprocessing.context.BaseContext:
+    # forking a process after the numba threading layer is started is not safe, the workers are started by a fork
+    # server, or spawned where it is not available.
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('forkserver')
+    return multiprocessing.get_context('spawn')
+
+
+def _initialize_worker(calendars: tuple[FinancialCalendar, ...]) -> None:
+    global _worker_calendars
+    _worker_calendars = calendars
+
+
+def _optional_date(date: NumpyDateType) -> NumpyDateType | None:
+    return None if np.isnat(date) else date
+
+
+def _build_task(task: _Task) -> tuple[npt.NDArray[NumpyDateType], npt.NDArray[np.int64]]:
+    calendar_index, terms, effective_dates, termination_dates, first_dates, next_to_last_dates = task
+    period, convention, termination_convention, end_of_month, rule = terms
+    calendar = _worker_calendars[calendar_index]
+    schedules = [
+        calendar.make_schedule(
+            effective_dates[i],
+            termination_dates[i],
+            period,
+            convention,
+            termination_convention,
+            end_of_month,
+            rule,
+            _optional_date(first_dates[i]),
+            _optional_date(next_to_last_dates[i]),
+        )
+        for i in range(effective_dates.shape[0])
+    ]
+    lengths = np.fromiter((schedule.shape[0] for schedule in schedules), dtype=np.int64, count=len(schedules))
+    return np.concatenate(schedules).astype('datetime64[D]'), lengths
+
+
+def _build_shared_task(task: _Task) -> tuple[str, int, npt.NDArray[np.int64]]:
+    """Build the schedules of a task and return them through a shared memory block instead of pickling them."""
+    dates, lengths = _build_task(task)
+    shared_memory = SharedMemory(create=True, size=max(dates.nbytes, 1))
+    np.ndarray(dates.shape, dtype=dates.dtype, buffer=shared_memory.buf)[:] = dates
+    name = shared_memory.name
+    shared_memory.close()
+    return name, dates.shape[0], lengths
+
+
+def _read_shared_dates(name: str, size: int) -> npt.NDArray[NumpyDateType]:
+    shared_memory = SharedMemory(name=name)
+    try:
+        return np.ndarray((size,), dtype='datetime64[D]', buffer=shared_memory.buf).copy()
+    finally:
+        shared_memory.close()
+        shared_memory.unlink()
+
+
+def _unlink_shared_dates(future: Future) -> None:
+    """Release the shared memory block of a task whose dates were never read, if the task created one."""
+    if future.cancelled() or future.exception() is not None:
+        return
+    name, _, _ = future.result()
+    try:
+        shared_memory = SharedMemory(name=name)
+    except FileNotFoundError:
+        return
+    shared_memory.close()
+    shared_memory.unlink()
+
+
+def _partition(
+    trades: Sequence[ScheduleTerms], chunk_size: int
+) -> tuple[tuple[FinancialCalendar, ...], list[npt.NDArray[np.int64]], list[_Task]]:
+    """Group the trades by calendar and terms and split every group in tasks of at most `chunk_size` trades."""
+    calendars: dict[int, int] = {}
+    calendar_list: list[FinancialCalendar] = []
+    groups: dict[tuple, list[int]] = {}
+    for i, trade in enumerate(trades):
+        trade = ScheduleTerms(*trade)
+        calendar_index = calendars.get(id(trade.calendar))
+        if calendar_index is None:
+            calendar_index = calendars[id(trade.calendar)] = len(calendar_list)
+            calendar_list.append(trade.calendar)
+        terms = (trade.period, trade.convention, trade.termination_convention, trade.end_of_month, trade.rule)
+        groups.setdefault((calendar_index, terms), []).append(i)
+
+    def column(indices: npt.NDArray[np.int64], field: str) -> npt.NDArray[NumpyDateType]:
+        values = (getattr(ScheduleTerms(*trades[i]), field) for i in indices)
+        return np.array(
+            [np.datetime64('NaT', 'D') if value is None else value for value in values], dtype='datetime64[D]'
+        )
+
+    trade_indices = []
+    tasks: list[_Task] = []
+    for (calendar_index, terms), group in groups.items():
+        for start in range(0, len(group), chunk_size):
+            indices = np.array(group[start : start + chunk_size], dtype=np.int64)
+            trade_indices.append(indices)
+            tasks.append(
+                (
+                    calendar_index,
+                    terms,
+                    column(indices, 'effective_date'),
+                    column(indices, 'termination_date'),
+                    column(indices, 'first_date'),
+                    column(indices, 'next_to_last_date'),
+                )
+            )
+    return tuple(calendar_list), trade_indices, tasks
+
+
+def build_schedules_parallel(
+    trades: Sequence[ScheduleTerms], workers: int | None = None, chunk_size: int = 1024
+) -> ScheduleSet:
+    """
+    Build the schedules of many trades in a pool of processes.
+    Trades are grouped by calendar and schedule terms, and every group is split in tasks of at most `chunk_size`
+    trades. Each worker receives the calendars once, when it starts, and returns its dates through shared memory.
+
+    Parameters
+    ----------
+    trades: Sequence[ScheduleTerms]
+        terms of each trade. Plain tuples with the same layout as `ScheduleTerms` are also accepted.
+    workers: int | None
+        number of worker processes. If None, the number of CPUs is used. If 1, the schedules are built in the current
+        process.
+    chunk_size: int
+        maximum number of trades in each task.
+
+    Returns
+    -------
+    ScheduleSet
+        the schedules, in the same order as `trades`.
+
+    """
+    if chunk_size < 1:
+        raise ValueError('chunk_size must be positive')
+    if workers is not None and workers < 1:
+        raise ValueError('workers must be positive')
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    calendars, trade_indices, tasks = _partition(trades, chunk_size)
+
+    task_dates: list[npt.NDArray[NumpyDateType]] = []
+    task_lengths: list[npt.NDArray[np.int64]] = []
+    if workers == 1 or len(tasks) <= 1:
+        _initialize_worker(calendars)
+        for task in tasks:
+            dates, lengths = _build_task(task)
+            task_dates.append(dates)
+            task_lengths.append(lengths)
+    else:
+        # the shared memory blocks are registered by the workers and released here, so every process must share the
+        # resource tracker of this process.
+        resource_tracker.ensure_running()
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(tasks)),
+            mp_context=_process_context(),
+            initializer=_initialize_worker,
+            initargs=(calendars,),
+        ) as executor:
+            futures = [executor.submit(_build_shared_task, task) for task in tasks]
+            read = 0
+            try:
+                for future in futures:
+                    name, size, lengths = future.result()
+                    read += 1
+                    task_dates.append(_read_shared_dates(name, size))
+                    task_lengths.append(lengths)
+            finally:
+                # the blocks of the tasks after a failed one are released as well, once their tasks are done.
+                for future in futures[read:]:
+                    _unlink_shared_dates(future)
+
+    lengths = np.zeros(len(trades), dtype=np.int64)
+    for indices, task_length in zip(trade_indices, task_lengths):
+        lengths[indices] = task_length
+    offsets = np.r_[0, np.cumsum(lengths)]
+
+    dates = np.empty(offsets[-1], dtype='datetime64[D]')
+    for indices, task_length, task_date in zip(trade_indices, task_lengths, task_dates):
+        task_offsets = np.r_[0, np.cumsum(task_length)[:-1]]
+        destination = np.repeat(offsets[indices] - task_offsets, task_length) + np.arange(task_date.shape[0])
+        dates[destination] = task_date
+
+    return ScheduleSet(dates, offsets)
+
+
+def thread_map(
+    function: Callable[..., npt.NDArray[Any]],
+    *arrays: Any,
+    chunk_size: int = 65536,
+    workers: int | None = None,
+) -> npt.NDArray[Any]:
+    """
+    Apply an element-wise function to large arrays in chunks on a pool of threads.
+    The arrays are broadcast together without copy and the broadcast shape is split in blocks of at most `chunk_size`
+    elements, along its first axes. Every block is computed by one thread from views of the arrays and written in place
+    in the output. Numpy operations and the numba kernels of this library release the GIL, so the blocks run in
+    parallel without the memory cost of a process pool.
+
+    Parameters
+    ----------
+    function: Callable[..., npt.NDArray[Any]]
+        element-wise function, e.g. a `DayCounter`. It must return an array with the shape of its inputs.
+    arrays: Any
+        arguments of `function`. Scalars are passed unchanged to every block.
+    chunk_size: int
+        maximum number of elements computed by each task.
+    workers: int | None
+        number of threads. If None, the number of CPUs is used.
+
+    Returns
+    -------
+    npt.NDArray[Any]
+        the result of `function`, with the broadcast shape of `arrays`.
+
+    """
+    if chunk_size < 1:
+        raise ValueError('chunk_size must be positive')
+    if workers is not None and workers < 1:
+        raise ValueError('workers must be positive')
+    shape = np.broadcast_shapes(*(np.shape(array) for array in arrays))
+    views = [array if np.ndim(array) == 0 else np.broadcast_to(array, shape) for array in arrays]
+
+    def chunk(block: tuple[Any, ...]) -> npt.NDArray[Any]:
+        return np.asarray(function(*(view if np.ndim(view) == 0 else view[block] for view in views)))
+
+    # `inner_sizes[k]` is the number of elements of the axes from k. The blocks are slices of `rows` along the last
+    # axis whose inner elements exceed `chunk_size`, at every index of the axes before it, the axes after it are whole.
+    inner_sizes = np.cumprod((1, *shape[::-1]))[::-1]
+    whole_axes = int(np.argmax(inner_sizes <= chunk_size))
+    if whole_axes == 0:
+        return chunk(()).reshape(shape)
+    axis = whole_axes - 1
+    rows = chunk_size // int(inner_sizes[whole_axes])
+    blocks = [
+        (*index, slice(start, start + rows))
+        for index in np.ndindex(*shape[:axis])
+        for start in range(0, shape[axis], rows)
+    ]
+
+    first = chunk(blocks[0])
+    output = np.empty(shape, dtype=first.dtype)
+    output[blocks[0]] = first
+
+    def write(block: tuple[Any, ...]) -> None:
+        output[block] = chunk(block)
+
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        list(executor.map(write, blocks[1:]))
+
+    return output
@@ -0,0 +1,99 @@
+from typing import Iterator, Literal, Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+from financialpydate.numpy_types import NumpyDateType
+
+
+def _search_keys(schedule_ids: npt.ArrayLike, dates: npt.ArrayLike) -> npt.NDArray[np.int64]:
+    # the schedule index in the high 32 bits and the day ordinal, shifted to be positive, in the low 32 bits. The keys
+    # sort by schedule, then by date.
+    days = np.asarray(dates, dtype='datetime64[D]').view(np.int64)
+    return (np.asarray(schedule_ids, dtype=np.int64) << 32) + (days + 2**31)
+
+
+class ScheduleSet:
+    """
+    Ragged collection of schedules. The dates of all schedules are stored in a single flat array and the schedule `i`
+    is given by `dates[offsets[i]:offsets[i + 1]]`.
+    """
+
+    __slots__ = ('_dates', '_offsets', '_search_keys')
+
+    def __init__(self, dates: npt.NDArray[NumpyDateType], offsets: npt.NDArray[np.int64]):
+        offsets = np.asarray(offsets, dtype=np.int64)
+        if offsets.ndim != 1 or offsets.shape[0] == 0 or offsets[0] != 0 or offsets[-1] != dates.shape[0]:
+            raise ValueError('offsets must start at 0 and end at the number of dates')
+        self._dates: npt.NDArray[NumpyDateType] = dates
+        self._offsets: npt.NDArray[np.int64] = offsets
+        self._search_keys: npt.NDArray[np.int64] | None = None
+
+    @classmethod
+    def from_schedules(cls, schedules: Sequence[npt.NDArray[NumpyDateType]]) -> 'ScheduleSet':
+        lengths = np.fromiter((schedule.shape[0] for schedule in schedules), dtype=np.int64, count=len(schedules))
+        offsets = np.r_[0, np.cumsum(lengths)]
+        if len(schedules) == 0:
+            return cls(np.array((), dtype='datetime64[D]'), offsets)
+        return cls(np.concatenate(schedules).astype('datetime64[D]'), offsets)
+
+    @property
+    def dates(self) -> npt.NDArray[NumpyDateType]:
+        return self._dates
+
+    @property
+    def offsets(self) -> npt.NDArray[np.int64]:
+        return self._offsets
+
+    @property
+    def lengths(self) -> npt.NDArray[np.int64]:
+        return np.diff(self._offsets)
+
+    def __len__(self) -> int:
+        return self._offsets.shape[0] - 1
+
+    def __getitem__(self, index: int) -> npt.NDArray[NumpyDateType]:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('schedule index out of range')
+        return self._dates[self._offsets[index] : self._offsets[index + 1]]
+
+    def __iter__(self) -> Iterator[npt.NDArray[NumpyDateType]]:
+        for index in range(len(self)):
+            yield self[index]
+
+    @property
+    def schedule_ids(self) -> npt.NDArray[np.int64]:
+        """Returns the index of the schedule of each date of `dates`."""
+        return np.repeat(np.arange(len(self), dtype=np.int64), self.lengths)
+
+    def searchsorted(
+        self,
+        schedule_ids: npt.ArrayLike,
+        dates: npt.NDArray[NumpyDateType] | NumpyDateType,
+        side: Literal['left', 'right'] = 'left',
+    ) -> npt.NDArray[np.int64]:
+        """
+        Finds where each date would be inserted in its schedule to keep it sorted, as `np.searchsorted` on each schedule,
+        for schedules with increasing dates. All schedules are searched with a single binary search.
+
+        Parameters
+        ----------
+        schedule_ids: npt.ArrayLike
+            index of the schedule searched for each date.
+        dates: npt.NDArray[NumpyDateType] | NumpyDateType
+            dates to search, broadcastable with `schedule_ids`.
+        side: Literal['left', 'right']
+            as in `np.searchsorted`.
+
+        Returns
+        -------
+        npt.NDArray[np.int64]
+            the insertion points, as indices of the flat `dates` array, between `offsets[schedule_id]` and
+            `offsets[schedule_id + 1]`.
+
+        """
+        if self._search_keys is None:
+            self._search_keys = _search_keys(self.schedule_ids, self._dates)
+        return np.searchsorted(self._search_keys, _search_keys(schedule_ids, dates), side)
@@ -0,0 +1,114 @@
+import re
+from enum import IntEnum
+from functools import lru_cache
+from typing import Iterator, NamedTuple, Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+
+class TenorUnit(IntEnum):
+    """Unit of a tenor, stored as an int8 code in `TenorArray`."""
+
+    days = 0
+    weeks = 1
+    months = 2
+    years = 3
+    business_days = 4
+
+    @property
+    def symbol(self) -> str:
+        return _SYMBOLS[self]
+
+
+_SYMBOLS = {
+    TenorUnit.days: 'D',
+    TenorUnit.weeks: 'W',
+    TenorUnit.months: 'M',
+    TenorUnit.years: 'Y',
+    TenorUnit.business_days: 'BD',
+}
+_UNITS = {symbol: unit for unit, symbol in _SYMBOLS.items()}
+_TENOR_PATTERN = re.compile(r'\s*([+-]?\d+)\s*(BD|D|W|M|Y)\s*', re.IGNORECASE)
+
+
+class Tenor(NamedTuple):
+    count: int
+    unit: TenorUnit
+
+    @staticmethod
+    def parse(text: str) -> 'Tenor':
+        """Parses a tenor such as '1D', '2W', '3M', '10Y' or '2BD', case insensitive. Parsed tenors are cached."""
+        return _parse_tenor(text)
+
+    def __str__(self) -> str:
+        return f'{self.count}{self.unit.symbol}'
+
+
+@lru_cache(maxsize=4096)
+def _parse_tenor(text: str) -> Tenor:
+    match = _TENOR_PATTERN.fullmatch(text)
+    if match is None:
+        raise ValueError(f'invalid tenor {text!r}')
+    return Tenor(int(match.group(1)), _UNITS[match.group(2).upper()])
+
+
+class TenorArray:
+    """
+    Array of tenors of mixed units, stored as an array of counts and an array of `TenorUnit` codes. A curve pillar set
+    such as ['1D', '1W', '1M', '3M', '1Y', '30Y'] is offset from dates in a single call of `FinancialCalendar.offset`.
+    """
+
+    __slots__ = ('_counts', '_units')
+
+    def __init__(self, counts: npt.ArrayLike, units: npt.ArrayLike):
+        counts = np.asarray(counts, dtype=np.int64)
+        units = np.asarray(units, dtype=np.int8)
+        if counts.shape != units.shape:
+            raise ValueError('counts and units must have the same shape')
+        if np.any((units < TenorUnit.days) | (units > TenorUnit.business_days)):
+            raise ValueError('invalid tenor unit')
+        self._counts: npt.NDArray[np.int64] = counts
+        self._units: npt.NDArray[np.int8] = units
+
+    @staticmethod
+    def parse(texts: Sequence[str]) -> 'TenorArray':
+        """Parses a sequence of tenors. Parsed sequences are cached, the arrays of the result are read-only."""
+        return _parse_tenors(tuple(texts))
+
+    @classmethod
+    def from_tenors(cls, tenors: Sequence[Tenor]) -> 'TenorArray':
+        return cls([tenor.count for tenor in tenors], [tenor.unit for tenor in tenors])
+
+    @property
+    def counts(self) -> npt.NDArray[np.int64]:
+        return self._counts
+
+    @property
+    def units(self) -> npt.NDArray[np.int8]:
+        return self._units
+
+    @property
+    def shape(self) -> tuple[int, ...]:
+        return self._counts.shape
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def __getitem__(self, index: int) -> Tenor:
+        return Tenor(int(self._counts[index]), TenorUnit(self._units[index]))
+
+    def __iter__(self) -> Iterator[Tenor]:
+        for count, unit in zip(self._counts.flat, self._units.flat):
+            yield Tenor(int(count), TenorUnit(unit))
+
+    def __repr__(self) -> str:
+        return f'TenorArray({[str(tenor) for tenor in self]})'
+
+
+@lru_cache(maxsize=1024)
+def _parse_tenors(texts: tuple[str, ...]) -> TenorArray:
+    tenors = TenorArray.from_tenors([_parse_tenor(text) for text in texts])
+    tenors.counts.flags.writeable = False
+    tenors.units.flags.writeable = False
+    return tenors
@@ -0,0 +1,150 @@
+import datetime as dt
+
+import numpy as np
+import QuantLib as ql
+import pytest
+
+from financialpydate.compounding import (
+    DICompounding,
+    OvernightCompounding,
+    daily_di_factors,
+    di_factor,
+    iter_accrual_factors,
+)
+from financialpydate.schedule_set import ScheduleSet
+
+from financialpydate.calendars.all_calendar import all_calendars
+
+calendar = all_calendars["Brazil['Settlement']"]
+all_days = np.arange(np.datetime64('2010-01-01'), np.datetime64('2025-01-01'))
+fixing_dates = all_days[np.is_busday(all_days, busdaycal=calendar.numpy_calendar)]
+rates = 0.02 + 0.12 * np.random.default_rng(0).random(fixing_dates.shape[0])
+
+
+def python_loop_factor(start_date, end_date, percentage=1.0, decimals=None):
+    factor = 1.0
+    for fixing_date, rate in zip(fixing_dates, rates):
+        if start_date <= fixing_date < end_date:
+            daily_rate = (1 + rate) ** (1 / 252) - 1
+            if decimals is not None:
+                daily_rate = round(daily_rate, decimals)
+            factor *= 1 + percentage * daily_rate
+    return factor
+
+
+@pytest.mark.parametrize('percentage, decimals', [(1.0, None), (1.1, None), (1.0, 8)])
+def test_di_compounding(percentage: float, decimals: int | None):
+    compounding = DICompounding(calendar, fixing_dates, rates, percentage, decimals)
+    generator = np.random.default_rng(1)
+    start_dates = np.datetime64('2010-01-01') + generator.integers(0, 5000, 50).astype('timedelta64[D]')
+    end_dates = start_dates + generator.integers(0, 400, 50).astype('timedelta64[D]')
+    expected = np.array(
+        [python_loop_factor(start, end, percentage, decimals) for start, end in zip(start_dates, end_dates)]
+    )
+
+    assert np.allclose(compounding.factor(start_dates, end_dates), expected, rtol=1e-12)
+    assert np.isclose(compounding.factor(start_dates[0], end_dates[0]), expected[0], rtol=1e-12)
+
+
+def test_di_compounding_schedules():
+    compounding = DICompounding(calendar, fixing_dates, rates)
+    schedules = ScheduleSet.from_schedules(
+        [
+            np.array(['2015-01-02', '2015-04-01', '2015-07-01'], dtype='datetime64[D]'),
+            np.array(['2020-03-02', '2021-03-01'], dtype='datetime64[D]'),
+        ]
+    )
+    output = compounding.schedule_factors(schedules)
+    assert output.shape == (5,)
+    assert output[0] == 1.0 and output[3] == 1.0
+    assert np.isclose(output[1] * output[2], compounding.factor(schedules.dates[0], schedules.dates[2]), rtol=1e-12)
+    assert np.isclose(output[4], python_loop_factor(schedules.dates[3], schedules.dates[4]), rtol=1e-12)
+
+
+def test_di_compounding_errors():
+    compounding = DICompounding(calendar, fixing_dates, rates)
+    with pytest.raises(ValueError):
+        compounding.factor(np.datetime64('2009-12-01'), np.datetime64('2010-02-01'))
+    with pytest.raises(ValueError):
+        compounding.factor(np.datetime64('2012-02-01'), np.datetime64('2012-01-01'))
+    with pytest.raises(ValueError):
+        DICompounding(calendar, fixing_dates[::-1], rates)
+    with pytest.raises(ValueError):
+        DICompounding(calendar, all_days[:10], rates[:10])
+
+
+def test_iter_accrual_factors():
+    blocks = [
+        (fixing_dates[start : start + 700], rates[start : start + 700]) for start in range(0, rates.shape[0], 700)
+    ]
+    streamed = np.concatenate([factors for _, factors in iter_accrual_factors(blocks)])
+    assert np.allclose(streamed, np.cumprod(daily_di_factors(rates)), rtol=1e-12)
+
+
+def test_di_factor():
+    start_date, end_date = np.datetime64('2023-01-02'), np.datetime64('2024-01-02')
+    business_days = np.busday_count(start_date, end_date, busdaycal=calendar.numpy_calendar)
+    assert np.isclose(di_factor(0.1, start_date, end_date, calendar), 1.1 ** (business_days / 252))
+
+
+def to_ql_date(date: np.datetime64) -> ql.Date:
+    date = date.astype(dt.date)
+    return ql.Date(date.day, date.month, date.year)
+
+
+@pytest.mark.parametrize(
+    'lookback, lockout, observation_shift',
+    [(0, 0, False), (2, 0, False), (0, 0, True), (2, 0, True), (0, 2, False), (2, 2, False), (5, 1, True)],
+)
+def test_overnight_compounding(lookback: int, lockout: int, observation_shift: bool):
+    fixing_calendar = all_calendars["UnitedStates['GovernmentBond']"]
+    days = np.arange(np.datetime64('2019-12-01'), np.datetime64('2025-01-01'))
+    overnight_dates = days[np.is_busday(days, busdaycal=fixing_calendar.numpy_calendar)]
+    overnight_rates = 0.01 + 0.04 * np.random.default_rng(2).random(overnight_dates.shape[0])
+    ql.Settings.instance().evaluationDate = ql.Date(1, 1, 2025)
+    index = ql.OvernightIndex(
+        'TestRate', 0, ql.USDCurrency(), ql.UnitedStates(ql.UnitedStates.GovernmentBond), ql.Actual360()
+    )
+    index.addFixings([to_ql_date(date) for date in overnight_dates], overnight_rates.tolist(), True)
+
+    # periods ending on a Saturday.
+    start_dates = np.array(
+        ['2020-01-02', '2021-06-30', '2023-02-15', '2024-05-31', '2024-05-01', '2022-10-03'], dtype='datetime64[D]'
+    )
+    end_dates = np.array(
+        ['2020-04-02', '2021-07-30', '2023-03-15', '2024-11-29', '2024-06-01', '2022-12-31'], dtype='datetime64[D]'
+    )
+    fixings = fixing_calendar.overnight_fixings(start_dates, end_dates, lookback, lockout, observation_shift)
+    rates = OvernightCompounding(overnight_dates, overnight_rates).rate(fixings)
+    for period, (start_date, end_date) in enumerate(zip(start_dates, end_dates)):
+        coupon = ql.OvernightIndexedCoupon(
+            paymentDate=to_ql_date(end_date),
+            nominal=1.0,
+            startDate=to_ql_date(start_date),
+            endDate=to_ql_date(end_date),
+            overnightIndex=index,
+            lookbackDays=lookback,
+            lockoutDays=lockout,
+            applyObservationShift=observation_shift,
+        )
+        offsets = fixings.fixing_dates.offsets
+        assert [to_ql_date(date) for date in fixings.fixing_dates[period]] == list(coupon.fixingDates())
+        assert np.allclose(fixings.weights[offsets[period] : offsets[period + 1]], np.array(coupon.dt()) * 360)
+        assert np.isclose(rates[period], coupon.rate(), rtol=1e-12)
+
+
+def test_overnight_compounding_errors():
+    fixing_calendar = all_calendars['Target']
+    fixings = fixing_calendar.overnight_fixings(
+        np.array(['2024-01-02', '2024-02-01'], dtype='datetime64[D]'), np.datetime64('2024-02-01')
+    )
+    assert fixings.fixing_dates.lengths.tolist() == [22, 0]
+    compounding = OvernightCompounding(fixings.fixing_dates.dates, np.full(22, 0.03))
+    assert compounding.factor(fixings)[1] == 1.0
+    with pytest.raises(ValueError):
+        OvernightCompounding(fixings.fixing_dates.dates[1:], np.full(21, 0.03)).factor(fixings)
+    # the last business day of the tables accrues up to the end date.
+    table_end_fixings = fixing_calendar.overnight_fixings(np.datetime64('2199-12-02'), np.datetime64('2200-01-01'))
+    assert table_end_fixings.weights.sum() == 30
+    with pytest.raises(ValueError):
+        fixing_calendar.overnight_fixings(np.datetime64('1850-01-01'), np.datetime64('1850-02-01'))
@@ -0,0 +1,121 @@
+import datetime as dt
+
+import numpy as np
+import QuantLib as ql
+import pytest
+
+from financialpydate.convention import Convention
+from financialpydate.coupons import coupon_periods
+from financialpydate.day_counter import ActualActualICMA, Business252, Thirty360
+from financialpydate.schedule_set import ScheduleSet
+
+from financialpydate.calendars.all_calendar import all_calendars
+
+
+def to_ql_date(date: np.datetime64) -> ql.Date:
+    date = date.astype(dt.date)
+    return ql.Date(date.day, date.month, date.year)
+
+
+def random_schedules(size: int, seed: int = 0) -> ScheduleSet:
+    generator = np.random.default_rng(seed)
+    calendar = all_calendars['Target']
+    schedules = []
+    for effective_month, years in zip(generator.integers(0, 120, size), generator.integers(1, 10, size)):
+        effective_date = np.datetime64('2015-01-15') + np.timedelta64(effective_month * 3, 'D')
+        schedules.append(
+            calendar.make_schedule(
+                effective_date,
+                effective_date.astype('datetime64[M]').astype('datetime64[D]') + np.timedelta64(365 * years, 'D'),
+                np.timedelta64(6, 'M'),
+                Convention.following,
+                Convention.following,
+                False,
+            )
+        )
+    return ScheduleSet.from_schedules(schedules)
+
+
+@pytest.mark.parametrize('ex_coupon_days', [0, 7])
+def test_coupon_periods(ex_coupon_days: int):
+    schedules = random_schedules(200)
+    generator = np.random.default_rng(1)
+    schedule_ids = generator.integers(0, 200, 2000)
+    settlement_dates = np.datetime64('2014-06-01') + generator.integers(0, 365 * 12, 2000).astype('timedelta64[D]')
+    settlement_dates[:50] = schedules.dates[schedules.offsets[schedule_ids[:50]] + 1]
+
+    output = coupon_periods(schedules, settlement_dates, Thirty360(), schedule_ids, ex_coupon_days=ex_coupon_days)
+    for i, (schedule_id, settlement_date) in enumerate(zip(schedule_ids, settlement_dates)):
+        schedule = schedules[schedule_id]
+        position = np.searchsorted(schedule, settlement_date, 'right')
+        if position == 0 or position == schedule.shape[0]:
+            assert np.isnat(output.previous_coupon_dates[i]) and np.isnat(output.next_coupon_dates[i])
+            assert output.accrued_days[i] == 0 and output.accrued_fractions[i] == 0.0
+            continue
+        previous_coupon, next_coupon = schedule[position - 1], schedule[position]
+        assert output.previous_coupon_dates[i] == previous_coupon
+        assert output.next_coupon_dates[i] == next_coupon
+        ex_coupon = (
+            ex_coupon_days > 0
+            and settlement_date >= next_coupon - np.timedelta64(ex_coupon_days, 'D')
+            and settlement_date > previous_coupon
+        )
+        assert output.ex_coupon[i] == ex_coupon
+        if ex_coupon:
+            assert output.accrued_days[i] == -(next_coupon - settlement_date).astype(int)
+            assert np.isclose(output.accrued_fractions[i], -Thirty360()(settlement_date, next_coupon))
+        else:
+            assert output.accrued_days[i] == (settlement_date - previous_coupon).astype(int)
+            assert np.isclose(output.accrued_fractions[i], Thirty360()(previous_coupon, settlement_date))
+
+
+def test_coupon_periods_quantlib():
+    calendar = all_calendars['Target']
+    effective_date, termination_date = np.datetime64('2020-03-10'), np.datetime64('2027-09-15')
+    schedule = calendar.make_schedule(
+        effective_date, termination_date, np.timedelta64(6, 'M'), Convention.unadjusted, Convention.unadjusted, False
+    )
+    quantlib_schedule = ql.Schedule(
+        to_ql_date(effective_date),
+        to_ql_date(termination_date),
+        ql.Period(6, ql.Months),
+        ql.TARGET(),
+        ql.Unadjusted,
+        ql.Unadjusted,
+        ql.DateGeneration.Backward,
+        False,
+    )
+    quantlib_day_counter = ql.ActualActual(ql.ActualActual.ISMA, quantlib_schedule)
+    bond = ql.FixedRateBond(
+        0, 100.0, quantlib_schedule, [0.05], quantlib_day_counter, ql.Following, 100.0, ql.Date(), ql.TARGET(),
+        ql.Period(5, ql.Days), ql.TARGET(), ql.Preceding, False,
+    )  # fmt: skip
+    settlement_dates = np.arange(np.datetime64('2020-03-10'), np.datetime64('2027-09-15'), np.timedelta64(5, 'D'))
+    settlement_dates = settlement_dates[np.is_busday(settlement_dates, busdaycal=calendar.numpy_calendar)]
+
+    output = coupon_periods(
+        ScheduleSet.from_schedules([schedule]),
+        settlement_dates,
+        ActualActualICMA(schedule, 2),
+        schedule_ids=0,
+        ex_coupon_days=5,
+        ex_coupon_calendar=calendar,
+    )
+    for i, settlement_date in enumerate(settlement_dates):
+        ql_settlement_date = to_ql_date(settlement_date)
+        # QuantLib only counts the ex-coupon period in the accrued amount
+        if not output.ex_coupon[i]:
+            assert output.accrued_days[i] == ql.BondFunctions.accruedDays(bond, ql_settlement_date)
+        assert np.isclose(output.accrued_fractions[i] * 5, ql.BondFunctions.accruedAmount(bond, ql_settlement_date))
+        assert output.next_coupon_dates[i] == np.datetime64(
+            ql.BondFunctions.accrualEndDate(bond, ql_settlement_date).ISO()
+        )
+
+
+def test_coupon_periods_business_252():
+    calendar = all_calendars["Brazil['Settlement']"]
+    schedules = random_schedules(20)
+    settlement_dates = schedules.dates[schedules.offsets[:-1] + 1] + np.timedelta64(40, 'D')
+    output = coupon_periods(schedules, settlement_dates, Business252(), calendar=calendar)
+    expected = np.busday_count(output.previous_coupon_dates, settlement_dates, busdaycal=calendar.numpy_calendar)
+    assert np.allclose(output.accrued_fractions, expected / 252)
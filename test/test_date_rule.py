@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from financialpydate.convention import Convention
+from financialpydate.date_rule import compile_date_rule
+from financialpydate.financial_calendar import join_calendars
+
+from financialpydate.calendars.all_calendar import all_calendars
+
+calendar = join_calendars([all_calendars['Target'], all_calendars["UnitedStates['Settlement']"]])
+dates = np.arange(np.datetime64('2023-11-01'), np.datetime64('2025-03-01'))
+
+
+@pytest.mark.parametrize(
+    'expression, expected',
+    [
+        ('T', lambda x: x),
+        ('T+2BD', lambda x: calendar.working_days_offset(x, 2, Convention.following)),
+        (
+            'T+2BD|+3M:MF:EOM',
+            lambda x: calendar.offset(
+                calendar.working_days_offset(x, 2), np.timedelta64(3, 'M'), Convention.modifiedfollowing, True
+            ),
+        ),
+        ('-2bd:p', lambda x: calendar.working_days_offset(x, -2, Convention.preceding)),
+        (
+            't + 2BD | -1BD:MF | +1Y:F',
+            lambda x: calendar.offset(calendar.working_days_offset(x, 1), np.timedelta64(1, 'Y'), Convention.following),
+        ),
+        ('T+1W|+2D:MP', lambda x: calendar.offset(x, np.timedelta64(9, 'D'), Convention.modifiedpreceding)),
+        (
+            'T:MF|+1M',
+            lambda x: calendar.offset(calendar.offset(x, 0, Convention.modifiedfollowing), np.timedelta64(1, 'M')),
+        ),
+        (
+            '+6M:U:EOM|+2BD:MF',
+            lambda x: calendar.working_days_offset(
+                calendar.offset(x, np.timedelta64(6, 'M'), end_of_month=True), 2, Convention.modifiedfollowing
+            ),
+        ),
+    ],
+)
+def test_date_rule(expression, expected):
+    rule = compile_date_rule(expression, calendar)
+    assert np.array_equal(rule(dates), expected(dates))
+    assert rule(dates[5]) == expected(dates)[5]
+    assert compile_date_rule(expression, calendar) is rule
+
+
+def test_fused_steps():
+    rule = compile_date_rule('T+2BD|-1BD:MF|+1W|+3D|-2BD', calendar)
+    assert [str(step.tenor) for step in rule.steps] == ['1BD', '10D', '-2BD']
+    far_dates = np.array(['1850-01-01', '2250-06-30'], dtype='datetime64[D]')
+    assert np.array_equal(
+        rule(far_dates),
+        calendar.working_days_offset(calendar.working_days_offset(far_dates, 1) + np.timedelta64(10, 'D'), -2),
+    )
+
+
+@pytest.mark.parametrize('expression', ['', 'T+2X', '+2BD:F:P', '+1M:XX', '+1M|T+2BD', '2BD'])
+def test_invalid_date_rule(expression):
+    with pytest.raises(ValueError):
+        compile_date_rule(expression, calendar)
@@ -5,19 +5,30 @@ import QuantLib as ql
 import pytest
 
 from financialpydate.day_counter import (
+    DayCounter,
+    Nl365,
+    Thirty365,
     Actual360,
     Actual365,
     ActualActual,
+    ActualActualAFB,
+    ActualActualICMA,
     OneOne,
     Thirty360,
     ThirtyE360,
     ThirtyE360ISDA,
     ThirtyU360,
     Business252,
+    all_day_counters,
+    day_counter_ids,
+    equalize_variable_types,
+    get_day_counter,
+    year_fraction,
 )
 
 # from update_files.get_holidays import holiday_list_numpy
 from financialpydate.calendars.all_calendar import all_calendars
+from financialpydate.schedule_set import ScheduleSet
 
 
 class BaseStructure:
@@ -133,3 +144,324 @@ class TestLessThanOneYearDates(BaseStructure):
 class Test20YearsDates(BaseStructure):
     start_date = dt.date(2000, 8, 31)
     end_date = dt.date(2022, 8, 31)
+
+
+def random_date_pairs(size: int, seed: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    generator = np.random.default_rng(seed)
+    start_dates = np.datetime64('1990-01-01') + generator.integers(0, 365 * 40, size).astype('timedelta64[D]')
+    end_dates = start_dates + generator.integers(0, 365 * 5, size).astype('timedelta64[D]')
+    one_month, one_day = np.timedelta64(1, 'M'), np.timedelta64(1, 'D')
+    month_ends = (start_dates.astype('datetime64[M]') + one_month).astype('datetime64[D]') - one_day
+    start_dates[::3] = month_ends[::3]
+    end_dates[::4] = (end_dates[::4].astype('datetime64[M]') + one_month).astype('datetime64[D]') - one_day
+    end_dates[::5] = start_dates[::5]
+    return start_dates, end_dates
+
+
+@pytest.mark.parametrize(
+    'day_counter',
+    [
+        Actual360(),
+        Actual365(),
+        ActualActual(),
+        Nl365(),
+        OneOne(),
+        Thirty360(),
+        Thirty365(),
+        ThirtyE360(),
+        ThirtyE360ISDA(),
+        ThirtyE360ISDA(is_end_date_on_termination=True),
+        ThirtyU360(),
+    ],
+)
+def test_parallel_kernels(day_counter, monkeypatch):
+    start_dates, end_dates = random_date_pairs(5000)
+    expected = day_counter._year_fraction(start_dates, end_dates)
+    monkeypatch.setattr(DayCounter, 'parallel_threshold', 1)
+    assert np.allclose(day_counter(start_dates, end_dates), expected, rtol=0, atol=1e-14)
+    assert np.allclose(day_counter(start_dates[0], end_dates), day_counter._year_fraction(start_dates[0], end_dates))
+    assert np.allclose(day_counter(start_dates, end_dates[0]), day_counter._year_fraction(start_dates, end_dates[0]))
+
+
+@pytest.mark.benchmark()
+class TestParallelCrossover:
+    """
+    Numpy and multi-core numba year fractions of the same date pairs, to measure the crossover between both and set
+    `DayCounter.parallel_threshold` on a given machine.
+    """
+
+    @pytest.mark.parametrize('size', [10_000, 1_000_000])
+    @pytest.mark.parametrize('day_counter', [ActualActual(), Thirty360()], ids=['act_act', 'thirty_360'])
+    def test_numpy_year_fraction(self, day_counter: DayCounter, size: int):
+        start_dates, end_dates = random_date_pairs(size)
+        assert day_counter._year_fraction(start_dates, end_dates).shape == (size,)
+
+    @pytest.mark.parametrize('size', [10_000, 1_000_000])
+    @pytest.mark.parametrize('day_counter', [ActualActual(), Thirty360()], ids=['act_act', 'thirty_360'])
+    def test_parallel_year_fraction(self, day_counter: DayCounter, size: int, monkeypatch):
+        monkeypatch.setattr(DayCounter, 'parallel_threshold', 1)
+        start_dates, end_dates = random_date_pairs(size)
+        assert day_counter(start_dates, end_dates).shape == (size,)
+
+
+@pytest.mark.parametrize('day_counter', [Actual360(), ActualActual(), Thirty360(), ThirtyE360ISDA(), ThirtyU360()])
+def test_ufunc(day_counter):
+    start_dates, end_dates = random_date_pairs(200)
+    expected = day_counter(start_dates, end_dates)
+
+    out = np.full(200, np.nan)
+    assert day_counter(start_dates, end_dates, out=out) is out
+    assert np.allclose(out, expected)
+
+    where = np.arange(200) % 2 == 0
+    out = np.full(200, -1.0)
+    day_counter(start_dates, end_dates, out=out, where=where)
+    assert np.allclose(out[where], expected[where])
+    assert np.all(out[~where] == -1.0)
+
+    single = day_counter(start_dates, end_dates, dtype=np.float32)
+    assert single.dtype == np.float32
+    assert np.allclose(single, expected, atol=1e-5)
+
+    grid = day_counter.ufunc(start_dates[:, None].view(np.int64), end_dates[None, :50].view(np.int64))
+    assert grid.shape == (200, 50)
+    assert np.allclose(grid[:, 7], day_counter(start_dates, end_dates[7]))
+
+
+def test_ufunc_arguments_without_kernel():
+    day_counter = Business252()
+    assert day_counter.ufunc is None
+    start_dates, end_dates = random_date_pairs(200)
+    expected = day_counter(start_dates, end_dates)
+
+    out = np.full(200, -1.0)
+    where = np.arange(200) % 3 == 0
+    assert day_counter(start_dates, end_dates, out=out, where=where) is out
+    assert np.allclose(out[where], expected[where])
+    assert np.all(out[~where] == -1.0)
+
+    single = day_counter(start_dates, end_dates, dtype=np.float32)
+    assert single.dtype == np.float32
+    assert np.allclose(single, expected, atol=1e-5)
+
+    repeated_start_dates, repeated_end_dates = np.tile(start_dates, 3), np.tile(end_dates, 3)
+    deduped = day_counter(repeated_start_dates, repeated_end_dates, dedupe=True, dtype=np.float32)
+    assert deduped.dtype == np.float32
+    assert np.allclose(deduped, np.tile(expected, 3), atol=1e-5)
+
+
+def test_equalize_variable_types():
+    start_dates, end_dates = random_date_pairs(30)
+    start_view, end_view = equalize_variable_types(start_dates[:, None], end_dates[None, :20])
+    assert start_view.shape == end_view.shape == (30, 20)
+    assert np.shares_memory(start_view, start_dates) and np.shares_memory(end_view, end_dates)
+
+    start_view, end_view = equalize_variable_types(start_dates, end_dates[0])
+    assert start_view.shape == end_view.shape == (30,)
+    assert np.all(end_view == end_dates[0])
+
+    with pytest.raises(ValueError):
+        equalize_variable_types(start_dates, end_dates[:20])
+
+
+@pytest.mark.parametrize(
+    'day_counter', [Actual360(), ActualActual(), Thirty360(), Thirty365(), ThirtyE360(), ThirtyE360ISDA(), ThirtyU360()]
+)
+def test_broadcast_year_fraction(day_counter):
+    start_dates, end_dates = random_date_pairs(30)
+    grid = day_counter(start_dates[:, None], end_dates[None, :])
+    assert grid.shape == (30, 30)
+    for i in range(30):
+        assert np.allclose(grid[i], day_counter(start_dates[i], end_dates))
+
+
+@pytest.mark.parametrize('day_counter', [Actual365(), ActualActual(), Thirty360(), ThirtyE360ISDA(), Business252()])
+def test_matrix(day_counter):
+    calendar = all_calendars['Target']
+    start_dates, end_dates = random_date_pairs(40)
+    output = day_counter.matrix(start_dates, end_dates[:25], calendar)
+    assert output.shape == (40, 25)
+    assert np.allclose(output, day_counter(start_dates[:, None], end_dates[None, :25], calendar))
+
+    masked = day_counter.matrix(start_dates, end_dates[:25], calendar, mask=True)
+    assert np.all(masked.mask == (end_dates[None, :25] <= start_dates[:, None]))
+    assert np.allclose(masked.compressed(), output[~masked.mask])
+
+
+@pytest.mark.parametrize('day_counter', [Actual360(), ActualActual(), ThirtyE360ISDA(), Business252()])
+def test_dedupe(day_counter):
+    calendar = all_calendars['Target']
+    start_dates, end_dates = random_date_pairs(20)
+    repeated = np.arange(600) % 20
+    start_dates, end_dates = start_dates[repeated].reshape(30, 20), end_dates[repeated].reshape(30, 20)
+    expected = day_counter(start_dates, end_dates, calendar)
+
+    output = day_counter(start_dates, end_dates, calendar, dedupe=True)
+    assert output.shape == (30, 20)
+    assert np.allclose(output, expected)
+    assert np.allclose(
+        day_counter(start_dates, end_dates[0, 0], calendar, dedupe=True),
+        day_counter(start_dates, end_dates[0, 0], calendar),
+    )
+
+    out = np.zeros((30, 20), dtype=np.float32)
+    day_counter(start_dates, end_dates, calendar, dedupe=True, out=out, where=start_dates != end_dates)
+    assert np.allclose(out, np.where(start_dates != end_dates, expected, 0.0), atol=1e-5)
+
+    empty_dates = np.empty((0, 3), dtype='datetime64[D]')
+    assert day_counter(empty_dates, empty_dates, calendar, dedupe=True).shape == (0, 3)
+
+
+def test_day_counter_registry():
+    assert isinstance(get_day_counter('ACT/360'), Actual360)
+    assert isinstance(get_day_counter('30E/360ISDA'), ThirtyE360ISDA)
+    assert all(code == day_counter.code for code, day_counter in all_day_counters.items())
+    with pytest.raises(ValueError):
+        get_day_counter('ACT/999')
+
+
+def test_mixed_year_fraction():
+    calendar = all_calendars['Target']
+    start_dates, end_dates = random_date_pairs(300)
+    codes = np.array(['ACT/360', '30/360', '252', 'ACT/ACT', '30E/360ISDA'])[np.arange(300) % 5]
+    expected = np.array(
+        [get_day_counter(code)(start, end, calendar) for code, start, end in zip(codes, start_dates, end_dates)]
+    )
+    assert np.allclose(year_fraction(codes, start_dates, end_dates, calendar), expected)
+
+    ids = day_counter_ids(codes)
+    out = np.empty(300)
+    assert year_fraction(ids, start_dates, end_dates, calendar, out=out) is out
+    assert np.allclose(out, expected)
+
+    for bad_id in [-1, len(all_day_counters)]:
+        with pytest.raises(ValueError, match=str(bad_id)):
+            year_fraction(np.where(np.arange(300) == 7, bad_id, ids), start_dates, end_dates, calendar)
+
+
+def test_business_252_calendar_ids():
+    calendars = [all_calendars['Target'], all_calendars['Brazil'], all_calendars['Japan']]
+    start_dates, end_dates = random_date_pairs(300)
+    ids = np.arange(300) % 3
+    expected = np.array(
+        [
+            np.busday_count(start, end, busdaycal=calendars[calendar_id].numpy_calendar)
+            for calendar_id, start, end in zip(ids, start_dates, end_dates)
+        ]
+    )
+    assert np.array_equal(Business252().day_count(start_dates, end_dates, calendars, ids), expected)
+    assert np.allclose(Business252()(start_dates, end_dates, calendars, calendar_ids=ids), expected / 252)
+    assert np.allclose(
+        year_fraction('252', start_dates, end_dates, calendars, calendar_ids=ids),
+        expected / 252,
+    )
+    out = np.full(300, -1.0)
+    where = ids != 1
+    assert Business252()(start_dates, end_dates, calendars, out=out, where=where, calendar_ids=ids) is out
+    assert np.allclose(out[where], expected[where] / 252)
+    assert np.all(out[~where] == -1.0)
+    single = Business252()(start_dates, end_dates, calendars, dtype=np.float32, calendar_ids=ids)
+    assert single.dtype == np.float32
+    with pytest.raises(ValueError):
+        Business252()(start_dates, end_dates, calendars, dedupe=True, calendar_ids=ids)
+
+    assert np.array_equal(Business252().day_count(start_dates, end_dates), np.busday_count(start_dates, end_dates))
+    assert Business252()(np.datetime64('2024-01-05'), np.datetime64('2024-01-08')) == 1 / 252
+
+
+def to_ql_date(date: np.datetime64) -> ql.Date:
+    date = date.astype(dt.date)
+    return ql.Date(date.day, date.month, date.year)
+
+
+icma_schedules = [
+    (
+        np.arange(np.datetime64('2020-02'), np.datetime64('2026-03'), np.timedelta64(6, 'M')).astype('datetime64[D]')
+        + np.timedelta64(14, 'D'),
+        2,
+    ),
+    (np.array(['2020-03-10', '2020-08-15', '2021-02-15', '2021-08-15', '2022-02-15'], dtype='datetime64[D]'), 2),
+    (np.array(['2019-12-01', '2020-08-15', '2021-02-15', '2021-08-15'], dtype='datetime64[D]'), 2),
+    (np.array(['2020-05-31', '2020-08-31', '2020-11-30', '2021-02-28', '2021-07-15'], dtype='datetime64[D]'), 4),
+    (np.array(['2018-06-20', '2019-03-20', '2020-03-20', '2022-01-05'], dtype='datetime64[D]'), 1),
+    (np.array(['2021-01-04', '2021-05-17'], dtype='datetime64[D]'), 2),
+]
+
+
+# QuantLib misplaces the notional last coupon of schedules with a long first stub, the third schedule is only checked
+# against hand computed values.
+@pytest.mark.parametrize('schedule, frequency', icma_schedules[:2] + icma_schedules[3:])
+def test_actual_actual_icma(schedule: np.ndarray, frequency: int):
+    schedule = schedule.astype('datetime64[D]')
+    quantlib_schedule = ql.Schedule(
+        [to_ql_date(date) for date in schedule],
+        ql.NullCalendar(),
+        ql.Unadjusted,
+        ql.Unadjusted,
+        ql.Period(12 // frequency, ql.Months),
+        ql.DateGeneration.Backward,
+        False,
+    )
+    quantlib_day_counter = ql.ActualActual(ql.ActualActual.ISMA, quantlib_schedule)
+    day_counter = ActualActualICMA(schedule, frequency)
+    dates = np.arange(schedule[0], schedule[-1] + np.timedelta64(1, 'D'))
+    size = dates[::11].shape[0]
+    start_dates, end_dates = dates[::7][:size], dates[::-11]
+    expected = [
+        quantlib_day_counter.yearFraction(to_ql_date(start), to_ql_date(end))
+        for start, end in zip(start_dates, end_dates)
+    ]
+    assert np.allclose(day_counter(start_dates, end_dates), expected)
+    assert np.isclose(
+        day_counter(schedule[0], schedule[-1]),
+        quantlib_day_counter.yearFraction(to_ql_date(schedule[0]), to_ql_date(schedule[-1])),
+    )
+
+
+def test_actual_actual_icma_schedule_set():
+    schedules = ScheduleSet.from_schedules([schedule.astype('datetime64[D]') for schedule, _ in icma_schedules[:3]])
+    day_counter = ActualActualICMA(schedules, 2)
+    schedule_ids = np.array([0, 1, 2, 2, 0])
+    start_dates = np.array(
+        ['2020-02-15', '2020-04-01', '2020-01-01', '2021-01-01', '2025-02-15'], dtype='datetime64[D]'
+    )
+    end_dates = np.array(['2021-02-15', '2020-08-15', '2020-12-31', '2021-08-15', '2025-08-15'], dtype='datetime64[D]')
+    expected = [
+        ActualActualICMA(icma_schedules[schedule_id][0], 2)(start, end)
+        for schedule_id, start, end in zip(schedule_ids, start_dates, end_dates)
+    ]
+    assert np.allclose(day_counter(start_dates, end_dates, schedule_ids=schedule_ids), expected)
+    assert np.isclose(day_counter(start_dates[0], end_dates[0], schedule_ids=0), 1.0)
+    # long first stub: 76 days of the 184 days notional period before 2020-02-15, then three regular periods
+    assert np.isclose(
+        day_counter(np.datetime64('2019-12-01'), np.datetime64('2021-08-15'), schedule_ids=2), 76 / 184 / 2 + 1.5
+    )
+    with pytest.raises(ValueError):
+        day_counter(start_dates, end_dates)
+    with pytest.raises(ValueError):
+        day_counter(np.datetime64('2000-01-01'), end_dates[0], schedule_ids=0)
+
+    out = np.zeros(5, dtype=np.float32)
+    where = np.array([True, False, True, True, False])
+    day_counter(start_dates, end_dates, schedule_ids=schedule_ids, out=out, where=where)
+    assert np.allclose(out, np.where(where, expected, 0.0))
+    assert day_counter(start_dates, end_dates, schedule_ids=schedule_ids, dtype=np.float32).dtype == np.float32
+    with pytest.raises(ValueError):
+        day_counter(start_dates, end_dates, schedule_ids=schedule_ids, dedupe=True)
+
+
+def test_actual_actual_afb(monkeypatch):
+    start_dates, end_dates = random_date_pairs(3000)
+    end_dates[::7] = start_dates[::7] - np.arange(end_dates[::7].shape[0]).astype('timedelta64[D]')
+    start_dates[::11] = np.datetime64('2004-02-29')
+    quantlib_day_counter = ql.ActualActual(ql.ActualActual.AFB)
+    expected = [
+        quantlib_day_counter.yearFraction(to_ql_date(start), to_ql_date(end))
+        for start, end in zip(start_dates, end_dates)
+    ]
+    assert np.allclose(ActualActualAFB()(start_dates, end_dates), expected)
+    assert np.isclose(ActualActualAFB()(start_dates[1], end_dates[1]), expected[1])
+    assert isinstance(ActualActualAFB()._year_fraction(start_dates[1], end_dates[1]), float)
+    monkeypatch.setattr(DayCounter, 'parallel_threshold', 1)
+    assert np.allclose(ActualActualAFB()._year_fraction(start_dates, end_dates), expected)
+    assert get_day_counter('ACT/ACT AFB') is all_day_counters['ACT/ACT AFB']
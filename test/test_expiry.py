@@ -0,0 +1,103 @@
+import calendar as python_calendar
+import datetime as dt
+
+import numpy as np
+import pytest
+
+from financialpydate.convention import Convention
+from financialpydate.expiry import (
+    BUSINESS_DAY_BEFORE_FIFTEENTH,
+    LAST_BUSINESS_DAY,
+    SECOND_FRIDAY,
+    THIRD_FRIDAY,
+    THIRD_WEDNESDAY,
+    ExpiryRule,
+    ExpirySpec,
+    expiry_dates,
+)
+
+from financialpydate.calendars.all_calendar import all_calendars
+
+months = np.arange(np.datetime64('2000-01'), np.datetime64('2030-01'))
+
+
+def reference_expiry(calendar, month: np.datetime64, spec: ExpirySpec) -> np.datetime64:
+    numpy_calendar = calendar.numpy_calendar
+    month = month + np.timedelta64(spec.month_offset, 'M')
+    year, month_number = month.astype(dt.date).year, month.astype(dt.date).month
+    days = [dt.date(year, month_number, day) for day in range(1, python_calendar.monthrange(year, month_number)[1] + 1)]
+    if spec.rule == ExpiryRule.nth_weekday:
+        weekdays = [day for day in days if day.weekday() == spec.day]
+        date = np.busday_offset(
+            np.datetime64(weekdays[spec.n - 1 if spec.n > 0 else spec.n], 'D'), 0, 'backward', busdaycal=numpy_calendar
+        )
+    elif spec.rule == ExpiryRule.nth_business_day:
+        business_days = [day for day in days if np.is_busday(np.datetime64(day, 'D'), busdaycal=numpy_calendar)]
+        date = np.datetime64(business_days[spec.n - 1 if spec.n > 0 else spec.n], 'D')
+    else:
+        day = np.datetime64(days[min(spec.day, len(days)) - 1], 'D')
+        date = np.busday_offset(
+            day, 0, 'forward' if spec.roll == Convention.following else 'backward', busdaycal=numpy_calendar
+        )
+    return np.busday_offset(date, spec.lag, 'forward', busdaycal=numpy_calendar)
+
+
+@pytest.mark.parametrize('calendar', ["Germany['Eurex']", "UnitedStates['NYSE']", 'Japan', "HongKong['HKEx']"])
+@pytest.mark.parametrize(
+    'spec',
+    [
+        THIRD_FRIDAY,
+        SECOND_FRIDAY,
+        THIRD_WEDNESDAY,
+        LAST_BUSINESS_DAY,
+        BUSINESS_DAY_BEFORE_FIFTEENTH,
+        ExpirySpec(ExpiryRule.nth_weekday, -1, 3),
+        ExpirySpec(ExpiryRule.nth_business_day, -2),
+        ExpirySpec(ExpiryRule.day_of_month, day=25, roll=Convention.following, lag=-3, month_offset=-1),
+        ExpirySpec(ExpiryRule.nth_weekday, 3, 2, lag=-2),
+    ],
+)
+def test_expiry_dates(calendar: str, spec: ExpirySpec):
+    financial_calendar = all_calendars[calendar]
+    expected = np.array([reference_expiry(financial_calendar, month, spec) for month in months])
+    assert np.array_equal(expiry_dates(financial_calendar, months, spec), expected)
+    assert expiry_dates(financial_calendar, months[7], spec) == expected[7]
+    far_months = np.array(['2250-03', '2250-04'], dtype='datetime64[M]')
+    far_expected = [reference_expiry(financial_calendar, month, spec) for month in far_months]
+    assert np.array_equal(expiry_dates(financial_calendar, far_months, spec), far_expected)
+
+
+def test_exchange_expiries():
+    eurex = all_calendars["Germany['Eurex']"]
+    # Good Friday expiries move to the Thursday before.
+    assert expiry_dates(eurex, np.datetime64('2025-04'), THIRD_FRIDAY) == np.datetime64('2025-04-17')
+    assert expiry_dates(eurex, np.datetime64('2024-03-01'), THIRD_FRIDAY) == np.datetime64('2024-03-15')
+    nyse = all_calendars["UnitedStates['NYSE']"]
+    assert expiry_dates(nyse, np.datetime64('2022-04'), THIRD_FRIDAY) == np.datetime64('2022-04-14')
+    fifth_friday = ExpirySpec(ExpiryRule.nth_weekday, 5, 4)
+    # the fifth Friday of March 2024 is Good Friday.
+    fifth_friday_months = np.array(['2024-03', '2024-05', '2250-03'], dtype='datetime64[M]')
+    assert np.array_equal(
+        expiry_dates(eurex, fifth_friday_months[:2], fifth_friday),
+        np.array(['2024-03-28', '2024-05-31'], dtype='datetime64[D]'),
+    )
+    assert expiry_dates(eurex, fifth_friday_months[2], fifth_friday) == np.datetime64('2250-03-29')
+    with pytest.raises(ValueError):
+        expiry_dates(eurex, months, fifth_friday)
+    with pytest.raises(ValueError):
+        expiry_dates(eurex, np.array(['2250-01', '2250-02'], dtype='datetime64[M]'), fifth_friday)
+
+    target = all_calendars['Target']
+    assert expiry_dates(target, np.datetime64('2024-07'), ExpirySpec(ExpiryRule.nth_business_day, -3)) == np.datetime64(
+        '2024-07-29'
+    )
+    # July 2024 has 23 business days, February 2024 only 21.
+    twenty_third = ExpirySpec(ExpiryRule.nth_business_day, 23)
+    assert expiry_dates(target, np.datetime64('2024-07'), twenty_third) == np.datetime64('2024-07-31')
+    assert expiry_dates(target, np.datetime64('2250-07'), twenty_third) == np.busday_offset(
+        np.datetime64('2250-07-01'), 22, 'forward', busdaycal=target.numpy_calendar
+    )
+    with pytest.raises(ValueError):
+        expiry_dates(target, np.array(['2024-02', '2024-07'], dtype='datetime64[M]'), twenty_third)
+    with pytest.raises(ValueError):
+        expiry_dates(target, np.datetime64('2024-07'), ExpirySpec(ExpiryRule.nth_business_day, 0))
@@ -1,9 +1,10 @@
+import pickle
 from typing import Literal
 
 import numpy as np
 import pytest
 
-from financialpydate.date_handler import month
+from financialpydate.date_handler import month, unique_sorted
 from financialpydate.calendars.all_calendar import all_calendars
 from financialpydate.rule import Rule
 from financialpydate.convention import Convention
@@ -4439,3 +4440,307 @@ def test_all_dates():
         False,
     )
     assert (expected == output).all()
+
+
+@pytest.mark.parametrize(
+    'convention,termination_convention',
+    [
+        (Convention.following, Convention.following),
+        (Convention.following, Convention.preceding),
+        (Convention.preceding, Convention.following),
+        (Convention.modifiedfollowing, Convention.unadjusted),
+    ],
+)
+def test_daily_schedule_is_unique_and_sorted(convention: Convention, termination_convention: Convention):
+    calendar = all_calendars['Target']
+    output = calendar.make_schedule(
+        np.datetime64('2012-12-20'),
+        np.datetime64('2013-01-06'),
+        np.timedelta64(1, 'D'),
+        convention,
+        termination_convention,
+        False,
+        Rule.forward,
+    )
+    dates = np.arange(np.datetime64('2012-12-20'), np.datetime64('2013-01-06'), dtype='datetime64[D]')
+    expected = np.unique(
+        np.r_[
+            calendar.offset(dates, 0, convention),
+            calendar.offset(np.datetime64('2013-01-06'), 0, termination_convention),
+        ]
+    )
+    assert np.all(output == expected)
+
+
+def test_unique_sorted():
+    dates = np.array(['2020-01-01', '2020-01-01', '2020-01-02', '2020-01-05', '2020-01-05'], dtype='datetime64[D]')
+    assert np.all(unique_sorted(dates.copy()) == np.unique(dates))
+
+    unordered = np.array(['2020-01-03', '2020-01-01', '2020-01-02', '2020-01-01'], dtype='datetime64[D]')
+    assert np.all(unique_sorted(unordered.copy()) == np.unique(unordered))
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 64])
+@pytest.mark.parametrize('rule', [Rule.forward, Rule.backward])
+@pytest.mark.parametrize('period', [np.timedelta64(1, 'D'), np.timedelta64(3, 'D'), np.timedelta64(1, 'W')])
+@pytest.mark.parametrize(
+    'convention,termination_convention',
+    [
+        (Convention.unadjusted, Convention.unadjusted),
+        (Convention.following, Convention.preceding),
+        (Convention.modifiedfollowing, Convention.following),
+        (Convention.preceding, Convention.modifiedpreceding),
+    ],
+)
+@pytest.mark.parametrize(
+    'first_date,next_to_last_date',
+    [(None, None), ('2012-01-20', None), (None, '2012-12-21'), ('2012-01-20', '2012-12-21')],
+)
+def test_iter_schedule(
+    chunk_size: int,
+    rule: Rule,
+    period: np.timedelta64,
+    convention: Convention,
+    termination_convention: Convention,
+    first_date: str | None,
+    next_to_last_date: str | None,
+):
+    calendar = all_calendars['Target']
+    arguments = (
+        np.datetime64('2012-01-01'),
+        np.datetime64('2012-12-30'),
+        period,
+        convention,
+        termination_convention,
+        False,
+        rule,
+        None if first_date is None else np.datetime64(first_date),
+        None if next_to_last_date is None else np.datetime64(next_to_last_date),
+    )
+    expected = calendar.make_schedule(*arguments)
+    blocks = list(calendar.iter_schedule(*arguments, chunk_size=chunk_size))
+    assert all(block.shape[0] <= chunk_size for block in blocks)
+    assert np.all(np.concatenate(blocks) == expected)
+
+
+def test_iter_schedule_monthly():
+    calendar = all_calendars['Japan']
+    arguments = (
+        np.datetime64('2009-09-30'),
+        np.datetime64('2012-06-15'),
+        np.timedelta64(6, 'M'),
+        Convention.following,
+        Convention.following,
+        True,
+        Rule.forward,
+    )
+    blocks = list(calendar.iter_schedule(*arguments, chunk_size=2))
+    assert [block.shape[0] for block in blocks] == [2, 2, 2, 1]
+    assert np.all(np.concatenate(blocks) == calendar.make_schedule(*arguments))
+
+
+def test_pickle_calendar():
+    calendar = all_calendars['Target']
+    output = pickle.loads(pickle.dumps(calendar))
+    assert np.all(output.holidays == calendar.holidays)
+    assert np.all(output.weekmask == calendar.weekmask)
+
+
+@pytest.mark.parametrize('calendar', ['Target', "Brazil['Settlement']", "UnitedStates['NYSE']"])
+def test_business_day_count(calendar: str):
+    calendar_obj = all_calendars[calendar]
+    generator = np.random.default_rng(0)
+    start_dates = np.datetime64('1901-01-01') + generator.integers(0, 109_000, 5_000).astype('timedelta64[D]')
+    end_dates = start_dates + generator.integers(-2_000, 2_000, 5_000).astype('timedelta64[D]')
+    end_dates[:10] = np.datetime64('2200-01-01')
+    start_dates[10:20] = np.datetime64('1850-01-01')
+    end_dates[20:30] = np.datetime64('2300-01-01')
+    expected = np.busday_count(start_dates, end_dates, busdaycal=calendar_obj.numpy_calendar)
+
+    assert np.array_equal(calendar_obj.business_day_count(start_dates, end_dates), expected)
+    assert np.array_equal(calendar_obj.business_day_count(start_dates[30:], end_dates[30:]), expected[30:])
+    assert calendar_obj.business_day_count(start_dates[0], end_dates[0]) == expected[0]
+    assert calendar_obj.business_day_count(start_dates[10], end_dates[10]) == expected[10]
+
+
+@pytest.mark.parametrize(
+    'roll', [Convention.unadjusted, Convention.following, Convention.modifiedfollowing, Convention.preceding]
+)
+@pytest.mark.parametrize('period', [np.timedelta64(1, 'M'), np.timedelta64(-3, 'M'), np.timedelta64(2, 'Y')])
+def test_end_of_month_offset(roll: Convention, period: np.timedelta64):
+    calendar = all_calendars['Target']
+    dates = np.arange(np.datetime64('2019-12-15'), np.datetime64('2021-03-15'))
+    one_month, one_day = np.timedelta64(1, 'M'), np.timedelta64(1, 'D')
+    expected = calendar.offset(dates, period, roll)
+    for i, date in enumerate(dates):
+        next_month = (date.astype('datetime64[M]') + one_month).astype('datetime64[D]')
+        target_next_month = (date.astype('datetime64[M]') + period + one_month).astype('datetime64[D]')
+        if roll == Convention.unadjusted:
+            month_end, target_month_end = next_month - one_day, target_next_month - one_day
+        else:
+            month_end = np.busday_offset(next_month, -1, 'forward', busdaycal=calendar.numpy_calendar)
+            target_month_end = np.busday_offset(target_next_month, -1, 'forward', busdaycal=calendar.numpy_calendar)
+        if date == month_end or (roll != Convention.unadjusted and date > month_end):
+            expected[i] = target_month_end
+
+    assert np.array_equal(calendar.offset(dates, period, roll, end_of_month=True), expected)
+
+
+def test_end_of_month_offset_quantlib_dates():
+    calendar = all_calendars['Target']
+    one_month = np.timedelta64(1, 'M')
+    assert calendar.offset(np.datetime64('2023-02-28'), one_month, end_of_month=True) == np.datetime64('2023-03-31')
+    assert calendar.offset(np.datetime64('2021-04-30'), one_month, end_of_month=True) == np.datetime64('2021-05-31')
+    assert calendar.offset(np.datetime64('2022-04-29'), one_month, end_of_month=True) == np.datetime64('2022-05-29')
+    following = Convention.following
+    assert calendar.offset(np.datetime64('2022-04-29'), one_month, following, True) == np.datetime64('2022-05-31')
+    # 2006-09-30 is a Saturday after the last business day of September.
+    assert calendar.offset(np.datetime64('2006-09-30'), one_month, following, True) == np.datetime64('2006-10-31')
+    assert calendar.offset(np.datetime64('2250-04-30'), one_month, following, True) == np.busday_offset(
+        np.datetime64('2250-06-01'), -1, 'forward', busdaycal=calendar.numpy_calendar
+    )
+    # scalar dates give scalars, day offsets ignore the end of month rule.
+    end_of_month_date = calendar.offset(np.datetime64('2023-02-28'), one_month, end_of_month=True)
+    assert isinstance(end_of_month_date, np.datetime64)
+    assert calendar.offset(np.datetime64('2023-02-28'), 1, following, True) == np.datetime64('2023-03-01')
+
+
+@pytest.mark.parametrize('calendar', ['Target', "Brazil['Settlement']", "UnitedStates['NYSE']"])
+def test_month_business_days(calendar: str):
+    financial_calendar = all_calendars[calendar]
+    numpy_calendar = financial_calendar.numpy_calendar
+    for months in [np.arange(np.datetime64('1990-01'), np.datetime64('2030-01')), np.datetime64('2250-02')]:
+        first_days = np.asarray(months).astype('datetime64[D]')
+        next_first_days = (months + np.timedelta64(1, 'M')).astype('datetime64[D]')
+        first_business_days = np.busday_offset(first_days, 0, 'forward', busdaycal=numpy_calendar)
+        last_business_days = np.busday_offset(next_first_days, -1, 'forward', busdaycal=numpy_calendar)
+        counts = np.busday_count(first_days, next_first_days, busdaycal=numpy_calendar)
+
+        dates = first_days + np.timedelta64(17, 'D')
+        assert np.array_equal(financial_calendar.first_business_day_of_month(dates), first_business_days)
+        assert np.array_equal(financial_calendar.last_business_day_of_month(months), last_business_days)
+        assert np.array_equal(financial_calendar.business_days_in_month(dates), counts)
+        assert np.array_equal(financial_calendar.nth_business_day(months, 1), first_business_days)
+        assert np.array_equal(financial_calendar.nth_business_day(dates, -1), last_business_days)
+        assert np.array_equal(
+            financial_calendar.nth_business_day(months, 3),
+            np.busday_offset(first_days, 2, 'forward', busdaycal=numpy_calendar),
+        )
+        assert np.array_equal(
+            financial_calendar.nth_business_day(months, -2),
+            np.busday_offset(next_first_days, -2, 'forward', busdaycal=numpy_calendar),
+        )
+
+    with pytest.raises(ValueError):
+        financial_calendar.nth_business_day(np.datetime64('2024-02'), 0)
+    with pytest.raises(ValueError):
+        financial_calendar.nth_business_day(np.datetime64('2024-02'), 24)
+
+
+@pytest.mark.parametrize('calendar', ['Target', "Brazil['Settlement']", "UnitedStates['NYSE']"])
+def test_business_days(calendar: str):
+    financial_calendar = all_calendars[calendar]
+    rng = np.random.default_rng(3)
+    start_dates = np.datetime64('1990-01-01') + rng.integers(0, 20000, 500).astype('timedelta64[D]')
+    end_dates = start_dates + rng.integers(-30, 400, 500).astype('timedelta64[D]')
+    start_dates[-1], end_dates[-1] = np.datetime64('2199-12-01'), np.datetime64('2200-02-01')
+
+    expected = []
+    for start_date, end_date in zip(start_dates, end_dates):
+        days = np.arange(start_date, max(start_date, end_date))
+        expected.append(days[np.is_busday(days, busdaycal=financial_calendar.numpy_calendar)])
+        assert np.array_equal(financial_calendar.business_days(start_date, end_date), expected[-1])
+
+    ranges = financial_calendar.business_day_ranges(start_dates[:-1], end_dates[:-1])
+    assert len(ranges) == len(start_dates) - 1
+    assert all(np.array_equal(days, expected_days) for days, expected_days in zip(ranges, expected))
+    ranges = financial_calendar.business_day_ranges(start_dates, end_dates)
+    assert all(np.array_equal(days, expected_days) for days, expected_days in zip(ranges, expected))
+    assert not financial_calendar.business_days(start_dates[0], end_dates[0]).flags.writeable
+
+
+@pytest.mark.parametrize(
+    'roll', [Convention.unadjusted, Convention.following, Convention.preceding, Convention.modifiedfollowing]
+)
+@pytest.mark.parametrize('calendar', ['Target', "UnitedStates['NYSE']"])
+def test_window_start_dates(roll: Convention, calendar: str):
+    financial_calendar = all_calendars[calendar]
+    lengths = [0, 1, 5, 10, 21, 63, 252, -3]
+    dates = np.arange(np.datetime64('2015-01-01'), np.datetime64('2019-12-31')).reshape(-1, 5)
+    expected = financial_calendar.working_days_offset(dates[..., None], -np.array(lengths), roll)
+    assert np.array_equal(financial_calendar.window_start_dates(dates, lengths, roll), expected)
+    assert np.array_equal(financial_calendar.window_start_dates(dates[3, 2], lengths, roll), expected[3, 2])
+    far_dates = np.array(['1901-01-02', '2199-12-30'], dtype='datetime64[D]')
+    assert np.array_equal(
+        financial_calendar.window_start_dates(far_dates, lengths, roll),
+        financial_calendar.working_days_offset(far_dates[:, None], -np.array(lengths), roll),
+    )
+
+
+def test_calendar_overlay():
+    nyse = all_calendars["UnitedStates['NYSE']"]
+    # unscheduled closures, one of them on a Saturday, and a holiday turned into a trading day.
+    added = np.array(['2025-03-12', '2019-06-05', '2019-06-06', '2024-12-28'], dtype='datetime64[D]')
+    removed = np.array(['2024-07-04'], dtype='datetime64[D]')
+    overlay = nyse.overlay(added, removed)
+    holidays = np.union1d(np.setdiff1d(nyse.holidays, removed), added)
+    rebuilt = FinancialCalendar(holidays, nyse.weekmask)
+    assert overlay.added.shape[0] == 3
+    assert np.array_equal(overlay.holidays, rebuilt.holidays)
+
+    rng = np.random.default_rng(11)
+    start_dates = np.datetime64('2010-01-01') + rng.integers(0, 6000, 2000).astype('timedelta64[D]')
+    end_dates = start_dates + rng.integers(-400, 400, 2000).astype('timedelta64[D]')
+    assert np.array_equal(
+        overlay.business_day_count(start_dates, end_dates), rebuilt.business_day_count(start_dates, end_dates)
+    )
+    assert overlay.business_day_count(np.datetime64('2025-03-10'), np.datetime64('2025-03-17')) == 4
+    assert overlay._numpy_calendar is None
+
+    for roll in [Convention.following, Convention.preceding]:
+        assert np.array_equal(
+            overlay.window_start_dates(end_dates, [1, 5, 21], roll),
+            rebuilt.window_start_dates(end_dates, [1, 5, 21], roll),
+        )
+        assert np.array_equal(
+            overlay.working_days_offset(end_dates, 3, roll), rebuilt.working_days_offset(end_dates, 3, roll)
+        )
+    assert np.array_equal(
+        overlay.business_days(np.datetime64('2019-06-01'), np.datetime64('2025-04-01')),
+        rebuilt.business_days(np.datetime64('2019-06-01'), np.datetime64('2025-04-01')),
+    )
+    months = np.arange(np.datetime64('2019-01'), np.datetime64('2026-01'))
+    assert np.array_equal(overlay.business_days_in_month(months), rebuilt.business_days_in_month(months))
+    assert nyse.business_day_count(np.datetime64('2025-03-10'), np.datetime64('2025-03-17')) == 5
+
+    stacked = overlay.overlay(['2025-03-13'], ['2025-03-12', '2024-07-04'])
+    assert stacked.base is nyse
+    assert np.array_equal(stacked.added, np.array(['2019-06-05', '2019-06-06', '2025-03-13'], dtype='datetime64[D]'))
+    assert stacked.removed.shape[0] == 1
+    unpickled = pickle.loads(pickle.dumps(stacked))
+    assert np.array_equal(unpickled.holidays, stacked.holidays)
+
+    with pytest.raises(ValueError):
+        FinancialCalendar(np.array([], dtype='datetime64[D]'), '1111100').overlay(removed=['2024-07-06'])
+    with pytest.raises(ValueError):
+        nyse.overlay(['2025-03-12'], ['2025-03-12'])
+
+
+def test_calendar_overlay_table_end():
+    # the last day of the tables has a business day count but is not in the business days.
+    table_end = np.datetime64('2200-01-01')
+    start_date = np.datetime64('2199-12-20')
+    dates = np.arange(start_date, table_end)
+    no_holidays = FinancialCalendar(np.array([], dtype='datetime64[D]'), '1111111')
+    end_holiday = FinancialCalendar(np.array([table_end]), '1111111')
+    for base, added, removed in [(no_holidays, [table_end], []), (end_holiday, [], [table_end])]:
+        overlay = base.overlay(added, removed)
+        rebuilt = FinancialCalendar(overlay.holidays, '1111111')
+        for table, rebuilt_table in zip(overlay._business_day_tables(), rebuilt._business_day_tables()):
+            assert np.array_equal(table, rebuilt_table)
+        assert np.array_equal(
+            overlay.business_days(start_date, table_end), rebuilt.business_days(start_date, table_end)
+        )
+        assert np.array_equal(
+            overlay.business_day_count(dates, table_end), rebuilt.business_day_count(dates, table_end)
+        )
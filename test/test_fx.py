@@ -0,0 +1,109 @@
+import calendar as python_calendar
+import datetime as dt
+from functools import lru_cache
+
+import numpy as np
+import pytest
+
+from financialpydate.financial_calendar import FinancialCalendar, join_calendars
+from financialpydate.fx import FXValueDates
+
+from financialpydate.calendars.all_calendar import all_calendars
+
+calendars = {
+    'EUR': all_calendars['Target'],
+    'USD': all_calendars["UnitedStates['Settlement']"],
+    'GBP': all_calendars["UnitedKingdom['Settlement']"],
+    'JPY': all_calendars['Japan'],
+    'CAD': all_calendars["Canada['Settlement']"],
+}
+pairs = ['EURUSD', 'USDJPY', 'EURGBP', 'USDCAD', 'GBPJPY']
+fx_value_dates = FXValueDates(pairs, calendars)
+
+
+@lru_cache
+def reference_calendars(pair: str) -> tuple[FinancialCalendar, FinancialCalendar]:
+    currencies = [pair[:3], pair[3:]]
+    lag_calendar = join_calendars([calendars[currency] for currency in currencies if currency != 'USD'])
+    value_calendar = join_calendars([calendars[currency] for currency in {*currencies, 'USD'}])
+    return lag_calendar, value_calendar
+
+
+def reference_spot_date(pair: str, trade_date: np.datetime64) -> np.datetime64:
+    lag_calendar, value_calendar = reference_calendars(pair)
+    date = trade_date
+    for _ in range(1 if pair == 'USDCAD' else 2):
+        date = np.busday_offset(date, 1, 'forward', busdaycal=lag_calendar.numpy_calendar)
+    return np.busday_offset(date, 0, 'forward', busdaycal=value_calendar.numpy_calendar)
+
+
+def test_spot_dates():
+    rng = np.random.default_rng(7)
+    trade_dates = np.datetime64('2015-01-01') + rng.integers(0, 3650, 2000).astype('timedelta64[D]')
+    pair_ids = rng.integers(0, len(pairs), 2000)
+    spot_dates = fx_value_dates.spot_dates(pair_ids, trade_dates)
+    expected = [reference_spot_date(pairs[pair_id], date) for pair_id, date in zip(pair_ids, trade_dates)]
+    assert np.array_equal(spot_dates, expected)
+
+    assert np.array_equal(fx_value_dates.pair_ids(np.array(pairs)[pair_ids]), pair_ids)
+    with pytest.raises(ValueError):
+        fx_value_dates.pair_ids(['EURCHF'])
+
+
+def test_usd_holiday_rules():
+    eurusd = fx_value_dates.pair_ids('EURUSD')
+    # Independence day on T+1 does not delay the spot date, on T+2 it moves the spot date to the next day.
+    assert fx_value_dates.spot_dates(eurusd, np.datetime64('2024-07-03')) == np.datetime64('2024-07-05')
+    assert fx_value_dates.spot_dates(eurusd, np.datetime64('2024-07-02')) == np.datetime64('2024-07-05')
+    usdcad = fx_value_dates.pair_ids('USDCAD')
+    assert fx_value_dates.spot_lags[usdcad] == 1
+    assert fx_value_dates.spot_dates(usdcad, np.datetime64('2024-07-03')) == np.datetime64('2024-07-05')
+    assert FXValueDates(['USDCAD'], calendars, {'USDCAD': 2}).spot_lags[0] == 2
+
+
+def reference_forward_date(pair: str, spot_date: np.datetime64, tenor: str) -> np.datetime64:
+    numpy_calendar = reference_calendars(pair)[1].numpy_calendar
+    count, unit = int(tenor[:-1]), tenor[-1]
+    if unit == 'W':
+        return np.busday_offset(
+            spot_date + np.timedelta64(7 * count, 'D'), 0, 'modifiedfollowing', busdaycal=numpy_calendar
+        )
+    spot = spot_date.astype(dt.date)
+    months = spot.year * 12 + spot.month - 1 + (count if unit == 'M' else 12 * count)
+    year, month_number = divmod(months, 12)
+    next_month = np.datetime64(dt.date(year + (month_number == 11), (month_number + 1) % 12 + 1, 1), 'D')
+    spot_next_month = np.datetime64(dt.date(spot.year + (spot.month == 12), spot.month % 12 + 1, 1), 'D')
+    if spot_date == np.busday_offset(spot_next_month, -1, 'forward', busdaycal=numpy_calendar):
+        return np.busday_offset(next_month, -1, 'forward', busdaycal=numpy_calendar)
+    date = np.datetime64(
+        dt.date(year, month_number + 1, min(spot.day, python_calendar.monthrange(year, month_number + 1)[1])), 'D'
+    )
+    return np.busday_offset(date, 0, 'modifiedfollowing', busdaycal=numpy_calendar)
+
+
+def test_forward_dates():
+    trade_dates = np.arange(np.datetime64('2023-12-01'), np.datetime64('2024-04-01'))
+    pair_ids = np.arange(trade_dates.shape[0]) % len(pairs)
+    spot_dates = [reference_spot_date(pairs[pair_id], date) for pair_id, date in zip(pair_ids, trade_dates)]
+    for tenor in ['1W', '1M', '3M', '1Y']:
+        forward_dates = fx_value_dates.forward_dates(pair_ids, trade_dates, tenor)
+        expected = [
+            reference_forward_date(pairs[pair_id], spot_date, tenor) for pair_id, spot_date in zip(pair_ids, spot_dates)
+        ]
+        assert np.array_equal(forward_dates, expected)
+
+    # a spot date on the last business day of February rolls to the last business day of March, Good Friday being a
+    # Target holiday.
+    eurusd = fx_value_dates.pair_ids('EURUSD')
+    assert fx_value_dates.spot_dates(eurusd, np.datetime64('2024-02-27')) == np.datetime64('2024-02-29')
+    assert fx_value_dates.forward_dates(eurusd, np.datetime64('2024-02-27'), '1M') == np.datetime64('2024-03-28')
+    # spot on 2024-04-30, the last business day of April, gives the last day of May.
+    assert fx_value_dates.forward_dates(eurusd, np.datetime64('2024-04-26'), '1M') == np.datetime64('2024-05-31')
+    # the 2024-02-12 substitute holiday of Japan rolls the one month forward of USDJPY to the next day.
+    usdjpy = fx_value_dates.pair_ids('USDJPY')
+    assert fx_value_dates.spot_dates(usdjpy, np.datetime64('2024-01-10')) == np.datetime64('2024-01-12')
+    assert fx_value_dates.forward_dates(usdjpy, np.datetime64('2024-01-10'), '1M') == np.datetime64('2024-02-13')
+    # Christmas and Boxing day delay the EURGBP spot date, the one week forward is a week later.
+    eurgbp = fx_value_dates.pair_ids('EURGBP')
+    assert fx_value_dates.spot_dates(eurgbp, np.datetime64('2023-12-21')) == np.datetime64('2023-12-27')
+    assert fx_value_dates.forward_dates(eurgbp, np.datetime64('2023-12-21'), '1W') == np.datetime64('2024-01-03')
@@ -0,0 +1,69 @@
+import datetime as dt
+
+import numpy as np
+import QuantLib as ql
+import pytest
+
+from financialpydate.convention import Convention
+from financialpydate.financial_calendar import FinancialCalendar
+from financialpydate.maturity_grid import maturity_grid
+from financialpydate.tenor import TenorArray
+
+from financialpydate.calendars.all_calendar import all_calendars
+
+calendar = all_calendars['Target']
+as_of_dates = np.arange(np.datetime64('2019-12-01'), np.datetime64('2021-03-01'))
+as_of_dates = as_of_dates[np.is_busday(as_of_dates, busdaycal=calendar.numpy_calendar)]
+
+
+def to_ql_date(date: np.datetime64) -> ql.Date:
+    date = date.astype(dt.date)
+    return ql.Date(date.day, date.month, date.year)
+
+
+def test_maturity_grid():
+    texts = ['1D', '1W', '1M', '3M', '1Y', '10Y', '3BD']
+    grid = maturity_grid(calendar, as_of_dates[::-1], 2, texts, Convention.modifiedfollowing)
+    assert grid.maturities.shape == (as_of_dates.shape[0], len(texts))
+    for i, as_of_date in enumerate(as_of_dates[::-1]):
+        spot_date = calendar.working_days_offset(as_of_date, 2, Convention.following)
+        assert grid.spot_dates[i] == spot_date
+        for j, tenor in enumerate(TenorArray.parse(texts)):
+            assert grid.maturities[i, j] == calendar.offset(spot_date, tenor, Convention.modifiedfollowing)
+
+    single = maturity_grid(calendar, as_of_dates[-1], 2, texts, Convention.modifiedfollowing)
+    assert np.array_equal(single.maturities, grid.maturities[0])
+
+
+@pytest.mark.parametrize('roll', [Convention.modifiedfollowing, Convention.following])
+def test_maturity_grid_end_of_month(roll: Convention):
+    texts = ['1W', '1M', '2M', '6M', '1Y', '5Y']
+    grid = maturity_grid(calendar, as_of_dates, 2, texts, roll, end_of_month=True)
+    quantlib_calendar = ql.TARGET()
+    quantlib_roll = ql.ModifiedFollowing if roll == Convention.modifiedfollowing else ql.Following
+    for i, spot_date in enumerate(grid.spot_dates):
+        for j, tenor in enumerate(texts):
+            expected = quantlib_calendar.advance(to_ql_date(spot_date), ql.Period(tenor), quantlib_roll, True)
+            assert to_ql_date(grid.maturities[i, j]) == expected
+
+
+def test_maturity_grid_cache(monkeypatch):
+    texts = ['1W', '6M', '2Y']
+    grid = maturity_grid(calendar, as_of_dates[:200], 1, texts)
+    # an overlapping call only computes the as-of dates it adds.
+    computed = []
+    working_days_offset = FinancialCalendar.working_days_offset
+
+    def counting_working_days_offset(self, dates, *args, **kwargs):
+        computed.append(np.size(dates))
+        return working_days_offset(self, dates, *args, **kwargs)
+
+    monkeypatch.setattr(FinancialCalendar, 'working_days_offset', counting_working_days_offset)
+    shifted = maturity_grid(calendar, as_of_dates[100:250], 1, texts)
+    assert computed == [50]
+    assert np.array_equal(shifted.maturities[:100], grid.maturities[100:])
+    assert np.array_equal(shifted.spot_dates[:100], grid.spot_dates[100:])
+    assert np.array_equal(shifted.maturities, maturity_grid(calendar, as_of_dates, 1, texts).maturities[100:250])
+    computed.clear()
+    assert np.array_equal(maturity_grid(calendar, as_of_dates[50:60], 1, texts).maturities, grid.maturities[50:60])
+    assert computed == []
@@ -0,0 +1,81 @@
+import os
+
+import numpy as np
+import pytest
+
+from financialpydate.calendars.all_calendar import all_calendars
+from financialpydate.convention import Convention
+from financialpydate.date_handler import isleap
+from financialpydate.day_counter import Thirty360
+from financialpydate.parallel import ScheduleTerms, build_schedules_parallel, thread_map
+from financialpydate.rule import Rule
+
+
+def make_trades() -> list[ScheduleTerms]:
+    trades = []
+    effective_dates = np.datetime64('2020-01-15') + np.arange(0, 400, 7).astype('timedelta64[D]')
+    for i, effective_date in enumerate(effective_dates):
+        calendar = all_calendars['Target'] if i % 2 == 0 else all_calendars["UnitedStates['NYSE']"]
+        period = np.timedelta64(3, 'M') if i % 3 else np.timedelta64(1, 'W')
+        trades.append(
+            ScheduleTerms(
+                calendar,
+                effective_date,
+                effective_date + np.timedelta64(365 * (1 + i % 5), 'D'),
+                period,
+                Convention.modifiedfollowing,
+                Convention.following,
+                False,
+                Rule.backward if i % 4 else Rule.forward,
+                effective_date + np.timedelta64(40, 'D') if i % 7 == 0 else None,
+            )
+        )
+    return trades
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_build_schedules_parallel(workers: int):
+    trades = make_trades()
+    schedules = build_schedules_parallel(trades, workers=workers, chunk_size=5)
+    assert len(schedules) == len(trades)
+    for schedule, trade in zip(schedules, trades):
+        assert np.all(schedule == trade.calendar.make_schedule(*trade[1:]))
+    with pytest.raises(ValueError):
+        build_schedules_parallel(trades, workers=0)
+
+
+def test_thread_map():
+    start_dates = np.datetime64('2000-01-31') + np.arange(1000).astype('timedelta64[D]')
+    end_date = np.datetime64('2030-02-28')
+    day_counter = Thirty360()
+    output = thread_map(day_counter, start_dates, end_date, chunk_size=64, workers=4)
+    assert np.all(output == day_counter(start_dates, end_date))
+
+    grid = thread_map(isleap, np.arange(1890, 2110).reshape(20, 11), chunk_size=16)
+    assert grid.shape == (20, 11)
+    assert np.all(grid == isleap(np.arange(1890, 2110).reshape(20, 11)))
+
+    # an outer product is computed in blocks of broadcast views, the inputs are not expanded to the output size.
+    block_sizes = []
+
+    def add(left, right):
+        block_sizes.append(np.broadcast(left, right).size)
+        return left + right
+
+    rows, columns = np.arange(300).reshape(300, 1), np.arange(70).reshape(1, 70)
+    assert np.array_equal(thread_map(add, rows, columns, chunk_size=1000, workers=3), rows + columns)
+    assert max(block_sizes) <= 1000 and sum(block_sizes) == 300 * 70
+    assert np.array_equal(thread_map(add, rows, columns, chunk_size=50), rows + columns)
+    with pytest.raises(ValueError):
+        thread_map(add, rows, columns, workers=0)
+
+
+def test_build_schedules_parallel_releases_shared_memory():
+    trades = make_trades()
+    # hourly periods are not implemented, the task of this trade fails while the other tasks return their dates.
+    trades[0] = trades[0]._replace(period=np.timedelta64(1, 'h'))
+    shared_blocks = set(os.listdir('/dev/shm')) if os.path.isdir('/dev/shm') else set()
+    with pytest.raises(NotImplementedError):
+        build_schedules_parallel(trades, workers=2, chunk_size=1)
+    if os.path.isdir('/dev/shm'):
+        assert set(os.listdir('/dev/shm')) <= shared_blocks
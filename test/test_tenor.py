@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from financialpydate.convention import Convention
+from financialpydate.tenor import Tenor, TenorArray, TenorUnit
+
+from financialpydate.calendars.all_calendar import all_calendars
+
+
+def test_parse_tenor():
+    assert Tenor.parse('3M') == Tenor(3, TenorUnit.months)
+    assert Tenor.parse(' 2bd') == Tenor(2, TenorUnit.business_days)
+    assert Tenor.parse('-1Y') == Tenor(-1, TenorUnit.years)
+    assert str(Tenor.parse('10w')) == '10W'
+    with pytest.raises(ValueError):
+        Tenor.parse('3X')
+
+    tenors = TenorArray.parse(['1D', '1W', '3M', '2BD'])
+    assert tenors is TenorArray.parse(('1D', '1W', '3M', '2BD'))
+    assert tenors.counts.tolist() == [1, 1, 3, 2]
+    assert list(tenors) == [Tenor.parse(text) for text in ['1D', '1W', '3M', '2BD']]
+    assert not tenors.counts.flags.writeable
+
+
+@pytest.mark.parametrize(
+    'roll', [Convention.unadjusted, Convention.following, Convention.modifiedfollowing, Convention.preceding]
+)
+def test_tenor_offset(roll: Convention):
+    calendar = all_calendars['Target']
+    texts = ['1D', '1W', '2W', '1M', '3M', '6M', '1Y', '30Y', '2BD', '-1M', '-3BD']
+    tenors = TenorArray.parse(texts)
+    dates = np.arange(np.datetime64('2023-12-20'), np.datetime64('2024-03-05'))
+    expected = np.empty((dates.shape[0], len(texts)), dtype='datetime64[D]')
+    for column, tenor in enumerate(tenors):
+        match tenor.unit:
+            case TenorUnit.business_days:
+                expected[:, column] = calendar.working_days_offset(dates, tenor.count, roll)
+            case TenorUnit.days | TenorUnit.weeks:
+                delta = np.timedelta64(tenor.count, 'D' if tenor.unit == TenorUnit.days else 'W')
+                expected[:, column] = calendar.offset(dates, delta, roll)
+            case _:
+                delta = np.timedelta64(tenor.count, 'M' if tenor.unit == TenorUnit.months else 'Y')
+                expected[:, column] = calendar.offset(dates, delta, roll)
+
+    assert np.array_equal(calendar.offset(dates[:, None], tenors, roll), expected)
+    assert np.array_equal(calendar.offset(dates[10], tenors, roll), expected[10])
+    assert calendar.offset(dates[10], texts[4], roll) == expected[10, 4]
+    assert calendar.offset(dates[10], Tenor.parse(texts[8]), roll) == expected[10, 8]